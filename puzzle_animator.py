@@ -0,0 +1,90 @@
+import argparse
+import sys
+import time
+
+from puzzle_deducer import PuzzleDeducer
+from puzzle_pb2 import Puzzle
+from puzzle_visualizer import get_labels, get_scene_layer
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+CLEAR_SCREEN = '\x1b[H\x1b[2J'
+
+
+def move_cursor(line: int, column: int) -> str:
+    return f'\x1b[{line + 1};{column + 1}H'
+
+
+def iter_deduction_states(
+        puzzle: Puzzle) -> Iterator[Dict[str, Tuple[int, int]]]:
+    deducer = PuzzleDeducer(puzzle)
+    placements = {}
+    yield dict(placements)
+    while True:
+        deduction = deducer.next_placement()
+        if deduction is None:
+            return
+        name = puzzle.people[deduction.person_id - 1].name
+        placements[name] = (deduction.row, deduction.column)
+        yield dict(placements)
+
+
+class PuzzleAnimator:
+
+    def __init__(self, puzzle: Puzzle, w: int = 3) -> None:
+        if not puzzle.HasField('crime_scene'):
+            raise ValueError('Puzzle has no crime scene to animate')
+        self._scene_layer = get_scene_layer(puzzle.crime_scene, w)
+
+    def frames(self,
+               states: Iterable[Dict[str, Tuple[int, int]]],
+               frames_per_second: Optional[float] = None) -> Iterator[str]:
+        interval = 1 / frames_per_second if frames_per_second else 0
+        next_time = time.monotonic()
+        labels = None
+        for placements in states:
+            next_labels = get_labels(placements)
+            if labels is None:
+                frame = CLEAR_SCREEN + self._scene_layer.render(next_labels)
+            else:
+                frame = self._get_diff(labels, next_labels)
+            labels = next_labels
+            if interval:
+                delay = next_time - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_time = max(next_time, time.monotonic()) + interval
+            yield frame
+
+    def _get_diff(self, labels: Dict[Tuple[int, int], str],
+                  next_labels: Dict[Tuple[int, int], str]) -> str:
+        changed = [
+            coordinate for coordinate in labels.keys() | next_labels.keys()
+            if labels.get(coordinate) != next_labels.get(coordinate)
+        ]
+        if not changed:
+            return ''
+        updates = []
+        for row, column in sorted(changed):
+            updates.append(
+                move_cursor(*self._scene_layer.get_space_position(row, column)))
+            updates.append(
+                self._scene_layer.get_space_value(
+                    row, column, next_labels.get((row, column))))
+        updates.append(move_cursor(self._scene_layer.line_count, 0))
+        return ''.join(updates)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Replay the deduction of a puzzle solution.')
+    parser.add_argument('path')
+    parser.add_argument('--fps', type=float, default=4.0)
+    args = parser.parse_args()
+    puzzle = Puzzle()
+    with open(args.path, 'rb') as f:
+        puzzle.ParseFromString(f.read())
+    for frame in PuzzleAnimator(puzzle).frames(iter_deduction_states(puzzle),
+                                               args.fps):
+        sys.stdout.write(frame)
+        sys.stdout.flush()
+    sys.stdout.write('\n')
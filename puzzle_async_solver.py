@@ -0,0 +1,114 @@
+import asyncio
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from puzzle_pb2 import Puzzle
+from puzzle_solver import Placements, PuzzleSolver
+from typing import AsyncIterator, Callable, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class AsyncPuzzleSolver:
+
+    def __init__(self,
+                 max_concurrency: int = 4,
+                 buffer_size: int = 16,
+                 debug: bool = False) -> None:
+        self._max_concurrency = max_concurrency
+        self._buffer_size = buffer_size
+        self._debug = debug
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix='puzzle-solver')
+        self._semaphore = None
+
+    async def solve(self, puzzle: Puzzle) -> Tuple[str, int]:
+        return await self._run(puzzle, PuzzleSolver.solve)
+
+    async def check_uniqueness(self, puzzle: Puzzle) -> Tuple[str, int]:
+        return await self._run(puzzle, PuzzleSolver.check_uniqueness)
+
+    async def solutions(self, puzzle: Puzzle) -> AsyncIterator[Placements]:
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        slots = threading.Semaphore(self._buffer_size)
+        stopped = threading.Event()
+        done = object()
+
+        def on_solution(placements: Placements) -> None:
+            if stopped.is_set():
+                return
+            slots.acquire()
+            if stopped.is_set():
+                return
+            loop.call_soon_threadsafe(queue.put_nowait, placements)
+
+        def search(solver: PuzzleSolver) -> None:
+            try:
+                solver.solve(on_solution)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        async with self._get_semaphore():
+            solver_future = loop.create_future()
+            future = loop.run_in_executor(self._executor, self._search, puzzle,
+                                          search, solver_future)
+            try:
+                while True:
+                    placements = await queue.get()
+                    if placements is done:
+                        break
+                    slots.release()
+                    yield placements
+                await future
+            finally:
+                if not future.done():
+                    stopped.set()
+                    await self._stop(solver_future, future, slots.release)
+
+    async def close(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._executor.shutdown)
+
+    async def __aenter__(self) -> 'AsyncPuzzleSolver':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._semaphore
+
+    def _search(self, puzzle: Puzzle, function: Callable[[PuzzleSolver], T],
+                solver_future: asyncio.Future) -> T:
+        solver = PuzzleSolver(puzzle, self._debug)
+        solver_future.get_loop().call_soon_threadsafe(solver_future.set_result,
+                                                      solver)
+        return function(solver)
+
+    async def _run(self, puzzle: Puzzle, function: Callable[[PuzzleSolver],
+                                                            T]) -> T:
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore():
+            solver_future = loop.create_future()
+            future = loop.run_in_executor(self._executor, self._search, puzzle,
+                                          function, solver_future)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                await self._stop(solver_future, future)
+                raise
+
+    async def _stop(self,
+                    solver_future: asyncio.Future,
+                    future: asyncio.Future,
+                    on_stopped: Optional[Callable[[], None]] = None) -> None:
+        await asyncio.wait([solver_future, future],
+                           return_when=asyncio.FIRST_COMPLETED)
+        if solver_future.done():
+            solver_future.result().stop()
+        if on_stopped is not None:
+            on_stopped()
+        await asyncio.wait([future])
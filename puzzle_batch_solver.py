@@ -0,0 +1,200 @@
+import argparse
+import time
+
+from collections import namedtuple
+from ortools.sat.python.cp_model import CpModel, CpSolver, FEASIBLE, INFEASIBLE, OPTIMAL
+
+from puzzle_board import PuzzleBoard
+from puzzle_clue_analyzer import set_assumptions
+from puzzle_deducer import Contradiction, PuzzleDeducer
+from puzzle_modeler import PuzzleModeler
+from puzzle_pb2 import Puzzle
+from puzzle_solution_counter import SolutionCounter
+from puzzle_solver import PuzzleSolver, UNIQUENESS_LIMIT, get_murder, solve_puzzle
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Placements = Tuple[Tuple[int, int], ...]
+
+BatchResult = namedtuple(
+    'BatchResult',
+    ['status', 'placements', 'victim_id', 'murderer_id', 'murder_room_id'])
+
+
+def get_value_placements(modeler: PuzzleModeler,
+                         values: Sequence[int]) -> Placements:
+    placements = [None] * len(modeler.puzzle.people)
+    for (person_id, row, col), occupancy in modeler.occupancies.items():
+        if values[occupancy.Index()]:
+            placements[person_id - 1] = (row, col)
+    return tuple(placements)
+
+
+def deduce_placements(puzzle: Puzzle,
+                      board: PuzzleBoard) -> Tuple[str, Optional[Placements]]:
+    deducer = PuzzleDeducer(puzzle, board)
+    try:
+        deducer.propagate()
+    except Contradiction:
+        return 'INFEASIBLE', None
+    if not deducer.is_solved():
+        return 'UNKNOWN', None
+    return 'OPTIMAL', tuple(
+        deducer.get_domain(person_id)[0] for person_id in range(1, board.n + 1))
+
+
+class PuzzleBatchSolver:
+
+    def __init__(self, puzzles: Sequence[Puzzle]) -> None:
+        self._puzzles = list(puzzles)
+        self._solver = CpSolver()
+        self._solver.parameters.num_search_workers = 1
+
+    def solve(self) -> List[BatchResult]:
+        self._results = [None] * len(self._puzzles)
+        boards = {}
+        for puzzle_index, puzzle in enumerate(self._puzzles):
+            board = PuzzleBoard(puzzle)
+            status, placements = deduce_placements(puzzle, board)
+            if status == 'UNKNOWN':
+                boards[puzzle_index] = board
+            else:
+                self._set_result(puzzle_index, status, board, placements)
+        self._pack(boards)
+        active = list(boards)
+        while active:
+            status = self._solve_active(active)
+            if status in (OPTIMAL, FEASIBLE):
+                self._record(active)
+                break
+            if status != INFEASIBLE:
+                self._fail(active)
+                break
+            active = self._isolate(active)
+        return self._results
+
+    def check_uniqueness(self) -> List[Tuple[str, int]]:
+        results = []
+        for puzzle in self._puzzles:
+            board = PuzzleBoard(puzzle)
+            status, placements = deduce_placements(puzzle, board)
+            if status != 'UNKNOWN':
+                results.append((status, 0 if placements is None else 1))
+                continue
+            modeler = PuzzleModeler(puzzle, break_symmetries=True, board=board)
+            callback = SolutionCounter(max_solutions=UNIQUENESS_LIMIT)
+            status = self._solver.SearchForAllSolutions(modeler.model, callback)
+            solution_count = (callback.solution_count *
+                              modeler.solution_multiplicity)
+            results.append((self._solver.StatusName(status),
+                            min(solution_count, UNIQUENESS_LIMIT)))
+        return results
+
+    def _pack(self, boards: Dict[int, PuzzleBoard]) -> None:
+        self._model = CpModel()
+        self._modelers = {}
+        self._literals = {}
+        constraints = self._model.Proto().constraints
+        for puzzle_index, board in boards.items():
+            start = len(constraints)
+            self._modelers[puzzle_index] = PuzzleModeler(
+                self._puzzles[puzzle_index],
+                aggregate_counts=False,
+                model=self._model,
+                board=board)
+            literal = self._model.NewBoolVar(f'puzzle {puzzle_index}')
+            for constraint in constraints[start:]:
+                constraint.enforcement_literal.append(literal.Index())
+            self._literals[puzzle_index] = literal.Index()
+
+    def _solve_active(self, active: List[int]) -> int:
+        set_assumptions(
+            self._model,
+            [self._literals[puzzle_index] for puzzle_index in active])
+        return self._solver.Solve(self._model)
+
+    def _isolate(self, active: List[int]) -> List[int]:
+        core = set(self._solver.SufficientAssumptionsForInfeasibility())
+        suspects = [
+            puzzle_index for puzzle_index in active
+            if self._literals[puzzle_index] in core
+        ] or active
+        for puzzle_index in suspects:
+            status = self._solve_active([puzzle_index])
+            if status in (OPTIMAL, FEASIBLE):
+                self._record([puzzle_index])
+            else:
+                self._fail([puzzle_index])
+        return [
+            puzzle_index for puzzle_index in active
+            if puzzle_index not in suspects
+        ]
+
+    def _record(self, puzzle_indexes: List[int]) -> None:
+        status = self._solver.StatusName()
+        values = list(self._solver.ResponseProto().solution)
+        for puzzle_index in puzzle_indexes:
+            modeler = self._modelers[puzzle_index]
+            self._set_result(puzzle_index, status, modeler.board,
+                             get_value_placements(modeler, values))
+
+    def _fail(self, puzzle_indexes: List[int]) -> None:
+        status = self._solver.StatusName()
+        for puzzle_index in puzzle_indexes:
+            self._set_result(puzzle_index, status, None, None)
+
+    def _set_result(self, puzzle_index: int, status: str,
+                    board: Optional[PuzzleBoard],
+                    placements: Optional[Placements]) -> None:
+        victim_id = murderer_id = murder_room_id = None
+        if placements is not None:
+            victim_id, murderer_id, murder_room_id = get_murder(
+                self._puzzles[puzzle_index], board, placements)
+        self._results[puzzle_index] = BatchResult(status=status,
+                                                  placements=placements,
+                                                  victim_id=victim_id,
+                                                  murderer_id=murderer_id,
+                                                  murder_room_id=murder_room_id)
+
+
+def compare_batch(puzzles: List[Puzzle]) -> Dict[str, float]:
+    start = time.perf_counter()
+    for puzzle in puzzles:
+        solve_puzzle(puzzle)
+    solve_time = time.perf_counter() - start
+    start = time.perf_counter()
+    PuzzleBatchSolver(puzzles).solve()
+    batch_solve_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for puzzle in puzzles:
+        PuzzleSolver(puzzle).check_uniqueness()
+    uniqueness_time = time.perf_counter() - start
+    start = time.perf_counter()
+    PuzzleBatchSolver(puzzles).check_uniqueness()
+    batch_uniqueness_time = time.perf_counter() - start
+    return {
+        'solve_time': solve_time,
+        'batch_solve_time': batch_solve_time,
+        'uniqueness_time': uniqueness_time,
+        'batch_uniqueness_time': batch_uniqueness_time,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare batched solving of small puzzles against '
+        'solving them one at a time.')
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--copies', type=int, default=100)
+    args = parser.parse_args()
+    puzzles = []
+    for path in args.paths:
+        puzzle = Puzzle()
+        with open(path, 'rb') as f:
+            puzzle.ParseFromString(f.read())
+        puzzles.extend([puzzle] * args.copies)
+    result = compare_batch(puzzles)
+    for name in ('solve', 'uniqueness'):
+        single = result[f'{name}_time'] / len(puzzles)
+        batched = result[f'batch_{name}_time'] / len(puzzles)
+        print(f'{name}: {1000 * single:.3f}ms per puzzle, '
+              f'batched {1000 * batched:.3f}ms per puzzle')
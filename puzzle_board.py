@@ -0,0 +1,379 @@
+import logging
+
+from dataclasses import dataclass, field
+from itertools import repeat
+
+from puzzle_pb2 import Clue, Coordinate, CrimeSceneFeature, CrimeSceneFeatureType, Gender, PositionSelector, PositionType, Preposition, Puzzle, Role, SubjectSelector
+from typing import Dict, List, Optional, Set, Tuple
+
+
+@dataclass
+class Space:
+
+    room_id: int
+    on: Optional[int] = None
+    beside: Set[int] = field(default_factory=set)
+
+    def __repr__(self) -> str:
+        on = CrimeSceneFeatureType.Name(
+            self.on).capitalize() if self.on is not None else 'None'
+        beside = '[' + ', '.join([
+            CrimeSceneFeatureType.Name(feature).capitalize()
+            for feature in self.beside
+        ]) + ']'
+        return f'{{room_id: {self.room_id}, on: {on}, beside: {beside}}}'
+
+
+def get_feature_mask(features: Set[int]) -> int:
+    mask = 0
+    for feature in features:
+        mask |= 1 << feature
+    return mask
+
+
+def get_feature_set(mask: int) -> Set[int]:
+    return {
+        feature for feature in CrimeSceneFeatureType.values()
+        if mask & (1 << feature)
+    }
+
+
+class PuzzleBoard:
+
+    def __init__(self,
+                 puzzle: Puzzle,
+                 debug: bool = False,
+                 index: Optional[Dict[str, list]] = None) -> None:
+        self._puzzle = puzzle
+        self._debug = debug
+        self._n = len(self._puzzle.people)
+        self._rows = len(self._puzzle.crime_scene.floor_plan)
+        self._columns = len(
+            self._puzzle.crime_scene.floor_plan[0].values) if self._rows else 0
+        if index is None:
+            self._init_board()
+        else:
+            self._load_index(index)
+
+    @property
+    def n(self) -> int:
+        return self._n
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    @property
+    def spaces(self) -> List[List[Space]]:
+        return self._spaces
+
+    @property
+    def blocked_coordinates(self) -> List[Tuple[int, int]]:
+        return self._blocked_coordinates
+
+    @property
+    def index(self) -> Dict[str, list]:
+        blocked_coordinates = set(self._blocked_coordinates)
+        return {
+            'room_ids':
+                [[space.room_id for space in row] for row in self._spaces],
+            'on': [[-1 if space.on is None else space.on
+                    for space in row]
+                   for row in self._spaces],
+            'beside': [[get_feature_mask(space.beside)
+                        for space in row]
+                       for row in self._spaces],
+            'blocked': [[(row, column) in blocked_coordinates
+                         for column in range(self._columns)]
+                        for row in range(self._rows)],
+            'rowwise_features': [
+                get_feature_mask(features)
+                for features in self._rowwise_features
+            ],
+            'columnwise_features': [
+                get_feature_mask(features)
+                for features in self._columwise_features
+            ],
+            'roomwise_features': [
+                get_feature_mask(features)
+                for features in self._roomwise_features
+            ],
+        }
+
+    def get_room_of_coordinate(self, coordinate: Coordinate) -> int:
+        return self._spaces[coordinate.row][coordinate.column].room_id
+
+    def get_coordinates_of_room(self, room_id: int) -> List[Tuple[int, int]]:
+        return self._room_coordinates[room_id]
+
+    def row_indexes(self, row: int) -> List[Tuple[int, int]]:
+        return list(zip(repeat(row, self._columns), range(self._columns)))
+
+    def col_indexes(self, col: int) -> List[Tuple[int, int]]:
+        return list(zip(range(self._rows), repeat(col, self._rows)))
+
+    def get_subject_ids(self, clue: Clue) -> List[int]:
+        subject_ids = set()
+        for subject_selector in clue.subject_selectors:
+            selected_subject_ids = self.get_selected_subject_ids(
+                subject_selector)
+            subject_ids.update(selected_subject_ids)
+        return sorted(list(subject_ids))
+
+    def get_space_indexes(self, clue: Clue) -> List[Tuple[int, int]]:
+        space_indexes = set()
+        for position_selector in clue.position_selectors:
+            if position_selector.preposition == Preposition.IN_SAME_ROW_AS:
+                for row, furnuture in enumerate(self._rowwise_features):
+                    if (position_selector.feature
+                            in furnuture) != position_selector.negate:
+                        space_indexes.update(self.row_indexes(row))
+            elif position_selector.preposition == Preposition.IN_SAME_COLUMN_AS:
+                for column, furnuture in enumerate(self._columwise_features):
+                    if (position_selector.feature
+                            in furnuture) != position_selector.negate:
+                        space_indexes.update(self.col_indexes(column))
+            elif position_selector.preposition == Preposition.IN_SAME_ROOM_AS:
+                for room_id, furnuture in enumerate(self._roomwise_features):
+                    if (position_selector.feature
+                            in furnuture) != position_selector.negate:
+                        space_indexes.update(self._room_coordinates[room_id])
+            else:
+                space_indexes.update(
+                    self._get_person_clue_coordinates(position_selector))
+        return sorted(list(space_indexes))
+
+    def get_selected_subject_ids(
+            self, subject_selector: SubjectSelector) -> List[int]:
+        if subject_selector.person_id == 0:
+            person_id_filter = lambda person: True
+        else:
+            person_id_filter = lambda person: person.id == subject_selector.person_id
+        if subject_selector.role == Role.UNSPECIFIED_ROLE:
+            role_filter = lambda person: True
+        else:
+            role_filter = lambda person: person.role == subject_selector.role or (
+                subject_selector.role == Role.SUSPECT and person.role == Role.
+                MURDERER)
+        if subject_selector.gender == Gender.UNSPECIFIED_GENDER:
+            gender_filter = lambda person: True
+        else:
+            gender_filter = lambda person: person.gender == subject_selector.gender
+        passes_filters = lambda person: person_id_filter(
+            person) and role_filter(person) and gender_filter(person)
+        return [
+            person.id
+            for person in self._puzzle.people
+            if passes_filters(person) != subject_selector.negate
+        ]
+
+    def _init_board(self):
+        self._get_room_coordinates()
+        self._init_spaces()
+        self._add_walls_and_corners()
+        self._add_features()
+        if self._debug:
+            self._log_board_debug()
+
+    def _load_index(self, index: Dict[str, list]) -> None:
+        self._spaces = [[
+            Space(room_id, None if on < 0 else on,
+                  get_feature_set(beside)) for room_id, on, beside in zip(*rows)
+        ] for rows in zip(index['room_ids'], index['on'], index['beside'])]
+        self._room_coordinates = [
+            [] for _ in range(len(index['roomwise_features']))
+        ]
+        for r, row in enumerate(index['room_ids']):
+            for c, room_id in enumerate(row):
+                self._room_coordinates[room_id].append((r, c))
+        self._blocked_coordinates = [(r, c)
+                                     for r, row in enumerate(index['blocked'])
+                                     for c, blocked in enumerate(row)
+                                     if blocked]
+        self._rowwise_features = list(
+            map(get_feature_set, index['rowwise_features']))
+        self._columwise_features = list(
+            map(get_feature_set, index['columnwise_features']))
+        self._roomwise_features = list(
+            map(get_feature_set, index['roomwise_features']))
+
+    def _get_room_coordinates(self) -> None:
+        self._room_coordinates = [
+            [] for _ in range(len(self._puzzle.crime_scene.rooms) + 1)
+        ]
+        for r, row in enumerate(self._puzzle.crime_scene.floor_plan):
+            for c, room_id in enumerate(row.values):
+                self._room_coordinates[room_id].append((r, c))
+
+    def _init_spaces(self) -> None:
+        self._spaces = [[
+            Space(self._get_room_id(row, column))
+            for column in range(self._columns)
+        ]
+                        for row in range(self._rows)]
+        self._roomwise_features = [
+            set() for _ in range(len(self._puzzle.crime_scene.rooms) + 1)
+        ]
+        self._rowwise_features = [set() for _ in range(self._rows)]
+        self._columwise_features = [set() for _ in range(self._columns)]
+
+    def _get_room_id(self, row: int, column: int) -> int:
+        return self._puzzle.crime_scene.floor_plan[row].values[column]
+
+    def _add_walls_and_corners(self) -> None:
+        for r, row in enumerate(self._spaces):
+            for c, space in enumerate(row):
+                is_different_room = lambda room_id: room_id != space.room_id
+                neighbor_room_ids = self._get_neighbor_room_ids(r, c)
+                N, S, W, E = tuple(map(is_different_room, neighbor_room_ids))
+                if N or S or E or W:
+                    space.beside.add(CrimeSceneFeatureType.WALL)
+                    if (N or S) and (E or W):
+                        space.beside.add(CrimeSceneFeatureType.CORNER)
+
+    def _get_neighbor_room_ids(self, r, c):
+        north_room_id = self._spaces[r - 1][c].room_id if r > 0 else -1
+        south_room_id = self._spaces[r +
+                                     1][c].room_id if r < self._rows - 1 else -1
+        west_room_id = self._spaces[r][c - 1].room_id if c > 0 else -1
+        east_room_id = self._spaces[r][
+            c + 1].room_id if c < self._columns - 1 else -1
+        return (north_room_id, south_room_id, west_room_id, east_room_id)
+
+    def _add_features(self) -> None:
+        self._blocked_coordinates = []
+        for feature in self._puzzle.crime_scene.features:
+            if feature.position_type == PositionType.OCCUPIABLE_SPACE:
+                self._add_space_feature(feature)
+            elif feature.position_type == PositionType.BLOCKED_SPACE:
+                self._add_space_feature(feature)
+                self._blocked_coordinates.extend([
+                    (coordinate.row, coordinate.column)
+                    for coordinate in feature.coordinates
+                ])
+            elif feature.position_type == PositionType.VERTICAL_BOUNDARY:
+                self._add_vertical_feature(feature)
+            elif feature.position_type == PositionType.HORIZONTAL_BOUNDARY:
+                self._add_horizontal_feature(feature)
+
+    def _add_space_feature(self, feature: CrimeSceneFeature) -> None:
+        coordinates = [(coordinate.row, coordinate.column)
+                       for coordinate in feature.coordinates]
+        for row, column in coordinates:
+            self._spaces[row][column].on = feature.type
+            self._rowwise_features[row].add(feature.type)
+            self._columwise_features[column].add(feature.type)
+            room_id = self._get_room_id(row, column)
+            self._roomwise_features[room_id].add(feature.type)
+            for n_row, n_col in self._get_neighbor_coordinates(row, column):
+                if (n_row, n_col) not in coordinates:
+                    self._spaces[n_row][n_col].beside.add(feature.type)
+
+    def _get_neighbor_coordinates(self, row: int,
+                                  column: int) -> List[Tuple[int, int]]:
+        room_id = self._get_room_id(row, column)
+        neighbor_coordinates = []
+        if row > 0 and self._get_room_id(row - 1, column) == room_id:
+            neighbor_coordinates.append((row - 1, column))
+        if column > 0 and self._get_room_id(row, column - 1) == room_id:
+            neighbor_coordinates.append((row, column - 1))
+        if row < self._rows - 1 and self._get_room_id(row + 1,
+                                                      column) == room_id:
+            neighbor_coordinates.append((row + 1, column))
+        if column < self._columns - 1 and self._get_room_id(
+                row, column + 1) == room_id:
+            neighbor_coordinates.append((row, column + 1))
+        return neighbor_coordinates
+
+    def _add_vertical_feature(self, feature: CrimeSceneFeature) -> None:
+        for coordinate in feature.coordinates:
+            row = coordinate.row
+            self._rowwise_features[row].add(feature.type)
+            if coordinate.column > 0:
+                column = coordinate.column - 1
+                room_id = self._get_room_id(row, column)
+                self._roomwise_features[room_id].add(feature.type)
+                self._spaces[row][column].beside.add(feature.type)
+            if coordinate.column < self._columns:
+                column = coordinate.column
+                room_id = self._get_room_id(row, column)
+                self._roomwise_features[room_id].add(feature.type)
+                self._spaces[row][column].beside.add(feature.type)
+
+    def _add_horizontal_feature(self, feature: CrimeSceneFeature) -> None:
+        for coordinate in feature.coordinates:
+            column = coordinate.column
+            self._columwise_features[column].add(feature.type)
+            if coordinate.row > 0:
+                row = coordinate.row - 1
+                room_id = self._get_room_id(row, column)
+                self._roomwise_features[room_id].add(feature.type)
+                self._spaces[row][column].beside.add(feature.type)
+            if coordinate.row < self._rows:
+                row = coordinate.row
+                room_id = self._get_room_id(row, column)
+                self._roomwise_features[room_id].add(feature.type)
+                self._spaces[row][column].beside.add(feature.type)
+
+    def _log_board_debug(self) -> None:
+        logging.debug('spaces: {\n' + '\n'.join([
+            '\n'.join([
+                f'\t({r}, {c}): ' + repr(space) + ','
+                for c, space in enumerate(row)
+            ])
+            for r, row in enumerate(self._spaces)
+        ]) + '\n}')
+        logging.debug('Roomwise features: ' + self._feature_sets_repr(
+            self._roomwise_features, ['Unspecified'] +
+            [room.name for room in self._puzzle.crime_scene.rooms]))
+        logging.debug('Rowwise features: ' +
+                      self._feature_sets_repr(self._rowwise_features))
+        logging.debug('Columnwise features: ' +
+                      self._feature_sets_repr(self._columwise_features))
+
+    def _feature_sets_repr(self,
+                           features_sets: List[Set[int]],
+                           labels: Optional[List[str]] = None) -> str:
+        if labels is None:
+            labels = range(len(features_sets))
+        return '{\n' + '\n'.join([
+            f'\t{label}: [' + ', '.join([
+                CrimeSceneFeatureType.Name(feature).capitalize()
+                for feature in features
+            ]) + '],'
+            for label, features in zip(labels, features_sets)
+        ]) + '\n}'
+
+    def _get_person_clue_coordinates(
+            self, position_selector: PositionSelector) -> List[Tuple[int, int]]:
+        if position_selector.preposition == Preposition.IN:
+            if position_selector.negate:
+                coordinates = []
+                for room_id, room_coordinates in enumerate(
+                        self._room_coordinates):
+                    if position_selector.room_id != room_id:
+                        coordinates.extend(room_coordinates)
+                return sorted(coordinates)
+            else:
+                return self.get_coordinates_of_room(position_selector.room_id)
+        else:
+            coordinates = []
+            for row, row_spaces in enumerate(self._spaces):
+                for column, space in enumerate(row_spaces):
+                    if self._evaluate_space_for_clue(space, position_selector):
+                        coordinates.append((row, column))
+            return coordinates
+
+    def _evaluate_space_for_clue(self, space: Space,
+                                 position_selector: PositionSelector) -> bool:
+        if position_selector.preposition == Preposition.BESIDE:
+            return (position_selector.feature
+                    in space.beside) != position_selector.negate
+        elif position_selector.preposition == Preposition.ON:
+            return (position_selector.feature
+                    == space.on) != position_selector.negate
+        raise AttributeError
@@ -0,0 +1,147 @@
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from ortools.sat.python.cp_model import CpModel, CpSolver, FEASIBLE, INFEASIBLE, OPTIMAL
+
+from puzzle_modeler import PuzzleModeler
+from puzzle_shared_state import SharedModelerState, create_shared_state
+from puzzle_pb2 import Puzzle
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_worker_model = None
+
+
+def set_assumptions(model: CpModel, assumptions: Iterable[int]) -> None:
+    model.Proto().ClearField('assumptions')
+    model.Proto().assumptions.extend(assumptions)
+
+
+def solve_with_assumptions(model: CpModel,
+                           assumptions: Iterable[int]) -> Tuple[int, float]:
+    set_assumptions(model, assumptions)
+    solver = CpSolver()
+    solver.parameters.num_search_workers = 1
+    start = time.perf_counter()
+    status = solver.Solve(model)
+    return status, time.perf_counter() - start
+
+
+def _init_worker(state: SharedModelerState) -> None:
+    global _worker_model
+    _worker_model = state.model
+
+
+def _solve_in_worker(assumptions: List[int]) -> Tuple[int, float]:
+    return solve_with_assumptions(_worker_model, assumptions)
+
+
+@dataclass
+class ClueRedundancyReport:
+
+    redundant_clue_indexes: List[int]
+    minimal_clue_indexes: List[int]
+    individually_redundant_clue_indexes: List[int]
+    clue_check_times: Dict[int, float]
+    timings: Dict[str, float]
+
+
+class PuzzleClueAnalyzer:
+
+    def __init__(self,
+                 puzzle: Puzzle,
+                 max_workers: Optional[int] = None) -> None:
+        self._puzzle = puzzle
+        self._max_workers = max_workers
+        self._modeler = PuzzleModeler(puzzle, guard_clues=True)
+        self._clue_literals = {
+            clue_index: literal.Index()
+            for clue_index, literal in enumerate(self._modeler.clue_literals)
+            if literal is not None
+        }
+
+    def analyze(self) -> ClueRedundancyReport:
+        timings = {}
+        start = time.perf_counter()
+        self._exclude_reference_solution()
+        timings['reference_solve'] = time.perf_counter() - start
+        check_start = time.perf_counter()
+        clue_checks = self._check_clues()
+        timings['clue_checks'] = time.perf_counter() - check_start
+        individually_redundant = sorted(
+            clue_index for clue_index, (is_redundant, _) in clue_checks.items()
+            if is_redundant)
+        minimization_start = time.perf_counter()
+        minimal = self._minimize(individually_redundant)
+        timings['minimization'] = time.perf_counter() - minimization_start
+        timings['total'] = time.perf_counter() - start
+        return ClueRedundancyReport(
+            redundant_clue_indexes=[
+                clue_index for clue_index in range(len(self._puzzle.clues))
+                if clue_index not in minimal
+            ],
+            minimal_clue_indexes=minimal,
+            individually_redundant_clue_indexes=individually_redundant,
+            clue_check_times={
+                clue_index: elapsed
+                for clue_index, (_, elapsed) in clue_checks.items()
+            },
+            timings=timings)
+
+    def _exclude_reference_solution(self) -> None:
+        model = self._modeler.model
+        set_assumptions(model, self._clue_literals.values())
+        solver = CpSolver()
+        if solver.Solve(model) not in (OPTIMAL, FEASIBLE):
+            raise ValueError('Puzzle has no solution')
+        occupied = [
+            occupancy for occupancy in self._modeler.occupancies.values()
+            if solver.Value(occupancy) == 1
+        ]
+        self._other_solution = model.NewBoolVar('other solution')
+        model.Add(sum(occupied) <= len(occupied) - 1).OnlyEnforceIf(
+            self._other_solution)
+        if not self._is_unique(self._clue_literals.keys()):
+            raise ValueError('Puzzle does not have a unique solution')
+
+    def _assumptions(self, clue_indexes: Iterable[int]) -> List[int]:
+        return [self._clue_literals[clue_index] for clue_index in clue_indexes
+               ] + [self._other_solution.Index()]
+
+    def _is_unique(self, clue_indexes: Iterable[int]) -> bool:
+        status, _ = solve_with_assumptions(self._modeler.model,
+                                           self._assumptions(clue_indexes))
+        return status == INFEASIBLE
+
+    def _check_clues(self) -> Dict[int, Tuple[bool, float]]:
+        clue_indexes = list(self._clue_literals.keys())
+        assumption_lists = [
+            self._assumptions(
+                [other
+                 for other in clue_indexes
+                 if other != clue_index])
+            for clue_index in clue_indexes
+        ]
+        if self._max_workers == 1:
+            results = [
+                solve_with_assumptions(self._modeler.model, assumptions)
+                for assumptions in assumption_lists
+            ]
+        else:
+            with create_shared_state(self._modeler) as state:
+                with ProcessPoolExecutor(max_workers=self._max_workers,
+                                         initializer=_init_worker,
+                                         initargs=(state,)) as executor:
+                    results = list(
+                        executor.map(_solve_in_worker, assumption_lists))
+        return {
+            clue_index: (status == INFEASIBLE, elapsed)
+            for clue_index, (status, elapsed) in zip(clue_indexes, results)
+        }
+
+    def _minimize(self, candidate_clue_indexes: List[int]) -> List[int]:
+        active = set(self._clue_literals.keys())
+        for clue_index in candidate_clue_indexes:
+            if self._is_unique(active - {clue_index}):
+                active.remove(clue_index)
+        return sorted(active)
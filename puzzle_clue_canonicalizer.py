@@ -0,0 +1,149 @@
+from collections import namedtuple
+
+from puzzle_board import PuzzleBoard
+from puzzle_deducer import iter_cells
+from puzzle_pb2 import Puzzle
+from typing import List, Optional, Tuple
+
+EMPTY = 'empty'
+TRIVIAL = 'trivial'
+DUPLICATE = 'duplicate'
+SUBSUMED = 'subsumed'
+MERGED = 'merged'
+
+CanonicalClue = namedtuple(
+    'CanonicalClue', ['subjects', 'cells', 'count', 'exact', 'clue_indexes'])
+
+Removal = namedtuple('Removal', ['clue_index', 'reason', 'kept_index'])
+
+
+def get_subject_count(subjects: int) -> int:
+    return bin(subjects).count('1')
+
+
+class PuzzleClueCanonicalizer:
+
+    def __init__(self,
+                 puzzle: Puzzle,
+                 board: Optional[PuzzleBoard] = None) -> None:
+        self._puzzle = puzzle
+        self._board = PuzzleBoard(puzzle) if board is None else board
+        self._columns = self._board.columns
+        self._removals = []
+        self._canonicalize()
+
+    @property
+    def clues(self) -> List[CanonicalClue]:
+        return self._clues
+
+    @property
+    def removals(self) -> List[Removal]:
+        return self._removals
+
+    def get_people_ids(self, clue: CanonicalClue) -> List[int]:
+        return [person_index + 1 for person_index in iter_cells(clue.subjects)]
+
+    def get_space_indexes(self, clue: CanonicalClue) -> List[Tuple[int, int]]:
+        return [divmod(cell, self._columns) for cell in iter_cells(clue.cells)]
+
+    def report(self) -> List[str]:
+        lines = []
+        for removal in self._removals:
+            text = self._puzzle.clues[removal.clue_index].text
+            line = f'Clue {removal.clue_index} ({text}): {removal.reason}'
+            if removal.kept_index is not None:
+                line += f' into clue {removal.kept_index}'
+            lines.append(line)
+        return lines
+
+    def _canonicalize(self) -> None:
+        unary = {}
+        grouped = {}
+        for clue_index, clue in enumerate(self._puzzle.clues):
+            canonical_clue = self._get_canonical_clue(clue_index, clue)
+            if canonical_clue is None:
+                continue
+            if get_subject_count(canonical_clue.subjects) == 1:
+                unary.setdefault(canonical_clue.subjects,
+                                 []).append(canonical_clue)
+            else:
+                key = (canonical_clue.subjects, canonical_clue.cells)
+                grouped.setdefault(key, []).append(canonical_clue)
+        clues = []
+        for subject_clues in unary.values():
+            clues.extend(self._fold_unary(subject_clues))
+        for same_clues in grouped.values():
+            clues.extend(self._merge(same_clues))
+        self._clues = sorted(clues, key=lambda clue: clue.clue_indexes[0])
+        self._removals.sort()
+
+    def _get_canonical_clue(self, clue_index: int,
+                            clue) -> Optional[CanonicalClue]:
+        people_ids = self._board.get_subject_ids(clue)
+        space_indexes = self._board.get_space_indexes(clue)
+        if not (people_ids and space_indexes):
+            self._removals.append(Removal(clue_index, EMPTY, None))
+            return None
+        subjects = 0
+        for person_id in people_ids:
+            subjects |= 1 << (person_id - 1)
+        cells = 0
+        for row, column in space_indexes:
+            cells |= 1 << (row * self._columns + column)
+        exact = clue.HasField('exact_count')
+        count = clue.exact_count if exact else clue.min_count
+        if not exact and count == 0:
+            self._removals.append(Removal(clue_index, TRIVIAL, None))
+            return None
+        if not exact and count == len(people_ids):
+            exact = True
+        return CanonicalClue(subjects, cells, count, exact, (clue_index,))
+
+    def _fold_unary(self,
+                    subject_clues: List[CanonicalClue]) -> List[CanonicalClue]:
+        if any(clue.count > 1 for clue in subject_clues):
+            return subject_clues
+        inside = [clue for clue in subject_clues if clue.count == 1]
+        outside = [clue for clue in subject_clues if clue.count == 0]
+        excluded = 0
+        for clue in outside:
+            excluded |= clue.cells
+        if inside:
+            cells = inside[0].cells
+            for clue in inside[1:]:
+                cells &= clue.cells
+            folded = CanonicalClue(
+                subject_clues[0].subjects, cells & ~excluded, 1, True,
+                tuple(clue.clue_indexes[0] for clue in inside + outside))
+        else:
+            folded = CanonicalClue(
+                subject_clues[0].subjects, excluded, 0, True,
+                tuple(clue.clue_indexes[0] for clue in outside))
+        return [self._keep(folded)]
+
+    def _merge(self, same_clues: List[CanonicalClue]) -> List[CanonicalClue]:
+        exact_counts = {clue.count for clue in same_clues if clue.exact}
+        highest_count = max(clue.count for clue in same_clues)
+        if len(exact_counts) > 1 or (exact_counts and
+                                     highest_count > min(exact_counts)):
+            return same_clues
+        strongest = next(
+            clue for clue in same_clues
+            if clue.exact or not exact_counts and clue.count == highest_count)
+        for clue in same_clues:
+            if clue is not strongest:
+                reason = DUPLICATE if (clue.exact, clue.count) == (
+                    strongest.exact, strongest.count) else SUBSUMED
+                self._removals.append(
+                    Removal(clue.clue_indexes[0], reason,
+                            strongest.clue_indexes[0]))
+        return [
+            strongest._replace(clue_indexes=tuple(
+                sorted(clue.clue_indexes[0] for clue in same_clues)))
+        ]
+
+    def _keep(self, clue: CanonicalClue) -> CanonicalClue:
+        clue_indexes = sorted(clue.clue_indexes)
+        for clue_index in clue_indexes[1:]:
+            self._removals.append(Removal(clue_index, MERGED, clue_indexes[0]))
+        return clue._replace(clue_indexes=tuple(clue_indexes))
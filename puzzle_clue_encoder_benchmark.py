@@ -0,0 +1,130 @@
+import argparse
+import random
+import statistics
+import time
+
+from itertools import product
+from puzzle_clue_encoder import PuzzleClueEncoder
+from puzzle_clue_regex_encoder import PuzzleClueRegexEncoder
+from puzzle_clue_trie_encoder import PuzzleClueTrieEncoder
+from typing import Dict, List, Tuple
+
+ENCODERS = {
+    'regex': PuzzleClueRegexEncoder,
+    'trie': PuzzleClueTrieEncoder,
+}
+
+FIRST_NAMES = ('Ada', 'Bea', 'Cal', 'Dot', 'Eli', 'Fay', 'Gus', 'Hal', 'Ivy',
+               'Jo', 'Kit', 'Lou', 'Max', 'Ned', 'Oz', 'Pam')
+LAST_NAMES = ('Ashby', 'Brook', 'Crane', 'Drake', 'Eaton', 'Frost', 'Grey',
+              'Hale', 'Irving', 'Jory', 'Keane', 'Lowe', 'Moss', 'Nash')
+ROOM_WINGS = ('North', 'South', 'East', 'West', 'Upper', 'Lower')
+ROOM_NAMES = ('Guest Bedroom', 'Living Room', 'Dining Room', 'Study',
+              'Billiard Room', 'Music Room', 'Wine Cellar', 'Conservatory')
+
+CLUE_TEMPLATES = (
+    '{person} was in the {room}.',
+    '{person} was alone in the {room}.',
+    '{person} was in the {room} with {number} other suspects.',
+    '{person} was the only person in the house that was on a {furniture}.',
+    '{person} was the only person in the house sitting on a {furniture}.',
+    '{person} was beside a window.',
+    '{person} was in the corner of the room.',
+    '{person} was in the same row as a {feature}.',
+    '{person} was in the same room as a {feature} with a woman.',
+    '{person} was on a {furniture} with another man.',
+)
+
+FURNITURE = ('chair', 'bed', 'carpet')
+FEATURES = ('plant', 'tv', 'table', 'window')
+
+
+def get_roster(size: int) -> Tuple[Dict[str, int], Dict[str, int]]:
+    people = [
+        f'{first} {last}' for last, first in product(LAST_NAMES, FIRST_NAMES)
+    ][:size]
+    rooms = [
+        f'{wing} {name}' for name, wing in product(ROOM_NAMES, ROOM_WINGS)
+    ][:max(2, size // 2)]
+    room_ids = {name.lower(): room_id for room_id, name in enumerate(rooms, 1)}
+    people_ids = {
+        name.lower(): person_id for person_id, name in enumerate(people, 1)
+    }
+    return room_ids, people_ids
+
+
+def get_clues(room_ids: Dict[str, int],
+              people_ids: Dict[str, int],
+              count: int,
+              seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    people = list(people_ids.keys())
+    rooms = list(room_ids.keys())
+    return [
+        rng.choice(CLUE_TEMPLATES).format(person=rng.choice(people).title(),
+                                          room=rng.choice(rooms).title(),
+                                          number=rng.choice(
+                                              ('one', 'two', '3', 'zero')),
+                                          furniture=rng.choice(FURNITURE),
+                                          feature=rng.choice(FEATURES))
+        for _ in range(count)
+    ]
+
+
+def encode_clues(encoder: PuzzleClueEncoder, clues: List[str],
+                 room_ids: Dict[str, int],
+                 people_ids: Dict[str, int]) -> List[List[bytes]]:
+    return [[
+        clue.SerializeToString()
+        for clue in encoder.encode_clue(raw_clue, room_ids, people_ids)
+    ]
+            for raw_clue in clues]
+
+
+def time_encoder(encoder: PuzzleClueEncoder, clues: List[str],
+                 room_ids: Dict[str, int], people_ids: Dict[str, int]) -> float:
+    start = time.perf_counter()
+    for raw_clue in clues:
+        encoder.encode_clue(raw_clue, room_ids, people_ids)
+    return time.perf_counter() - start
+
+
+def benchmark_encoders(sizes: List[int],
+                       clue_count: int = 1000,
+                       repeat: int = 3) -> Dict[int, Dict[str, float]]:
+    results = {}
+    for size in sizes:
+        room_ids, people_ids = get_roster(size)
+        clues = get_clues(room_ids, people_ids, clue_count)
+        results[size] = {}
+        outputs = []
+        for name, encoder_class in ENCODERS.items():
+            encoder = encoder_class()
+            outputs.append(encode_clues(encoder, clues, room_ids, people_ids))
+            times = [
+                time_encoder(encoder, clues, room_ids, people_ids)
+                for _ in range(repeat)
+            ]
+            results[size][name] = clue_count / statistics.median(times)
+        results[size]['identical'] = all(
+            output == outputs[0] for output in outputs)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare clue encoder throughput across roster sizes.')
+    parser.add_argument('--sizes',
+                        nargs='+',
+                        type=int,
+                        default=[5, 10, 25, 50, 100, 200])
+    parser.add_argument('--clues', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print(f'{"people":>6} {"regex/s":>10} {"trie/s":>10} {"speedup":>8} '
+          'identical')
+    for size, result in benchmark_encoders(args.sizes, args.clues,
+                                           args.repeat).items():
+        print(f'{size:>6} {result["regex"]:>10.0f} {result["trie"]:>10.0f} '
+              f'{result["trie"] / result["regex"]:>7.1f}x '
+              f'{result["identical"]}')
@@ -1,11 +1,10 @@
 from collections import namedtuple
 import re
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 
 from puzzle_clue_encoder import PuzzleClueEncoder
 from puzzle_utils import GENDER_DICT, ROLE_DICT, FEATURE_DATA_DICT, NUMBERS_NAMES, get_number_value
 from puzzle_pb2 import Clue, Preposition, SubjectSelector
-from google.protobuf.pyext._message import RepeatedCompositeContainer
 
 
 def update_subject_selector(selector: SubjectSelector, key: str) -> None:
@@ -33,12 +32,25 @@ PERSON_CLUE_PATTERN = (
     '(?P<subj_noun>man|men|woman|women|person|people|suspect|suspects))?\.?$')
 
 
-def stringify(messages: RepeatedCompositeContainer) -> str:
+def parse_subj_phrase(number: str, adjective: Optional[str],
+                      noun: str) -> PasrsedSubjPhrase:
+    selector = SubjectSelector()
+    update_subject_selector(selector, adjective)
+    if noun[-1] == 's':
+        noun = noun[:-1]
+    update_subject_selector(selector, noun)
+    return PasrsedSubjPhrase(number=get_number_value(number), selector=selector)
+
+
+def stringify(messages: Iterable) -> str:
     return '|'.join([message.name.lower() for message in messages])
 
 
 def stringify_numbers(n: int = 9) -> str:
-    return '|'.join([str(i) + '|' + NUMBERS_NAMES[i] for i in range(n + 1)])
+    return '|'.join([
+        str(i) + '|' + NUMBERS_NAMES[i] if i in NUMBERS_NAMES else str(i)
+        for i in range(n + 1)
+    ])
 
 
 class PuzzleClueRegexEncoder(PuzzleClueEncoder):
@@ -89,14 +101,9 @@ class PuzzleClueRegexEncoder(PuzzleClueEncoder):
             numbers=stringify_numbers(n))
 
     def _parse_subj_phrase(self, match) -> PasrsedSubjPhrase:
-        number = get_number_value(match.group('subj_num'))
-        selector = SubjectSelector()
-        update_subject_selector(selector, match.group('subj_adj'))
-        subj_noun = match.group('subj_noun')
-        if subj_noun[-1] == 's':
-            subj_noun = subj_noun[:-1]
-        update_subject_selector(selector, subj_noun)
-        return PasrsedSubjPhrase(number=number, selector=selector)
+        return parse_subj_phrase(match.group('subj_num'),
+                                 match.group('subj_adj'),
+                                 match.group('subj_noun'))
 
     def _encode_exclusive_person_clue(
             self, parsed_person_clue: ParsedPersonClue) -> List[Clue]:
@@ -0,0 +1,156 @@
+from collections import namedtuple
+from functools import partial
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from puzzle_clue_regex_encoder import ParsedPersonClue, PuzzleClueRegexEncoder, parse_subj_phrase
+from puzzle_utils import FEATURE_DATA_DICT, NUMBERS_NAMES
+
+Step = namedtuple('Step', ['name', 'matcher', 'optional'])
+
+
+class PhraseTrie:
+
+    def __init__(self, phrases: Iterable[str] = ()) -> None:
+        self._root = {}
+        self._size = 0
+        for phrase in phrases:
+            self.add(phrase)
+
+    def add(self, phrase: str) -> None:
+        phrase = phrase.lower()
+        node = self._root
+        for word in phrase.split(' '):
+            node = node.setdefault(word, {})
+        if None not in node:
+            node[None] = (self._size, phrase)
+            self._size += 1
+
+    def matches(self, tokens: List[str], start: int) -> List[Tuple[int, str]]:
+        matches = []
+        node = self._root
+        for end in range(start, len(tokens)):
+            node = node.get(tokens[end])
+            if node is None:
+                break
+            if None in node:
+                matches.append((node[None], end + 1))
+        return [(end, phrase) for (_, phrase), end in sorted(matches)]
+
+
+VERBS = PhraseTrie(['is', 'was'])
+EXCLUSIVES = PhraseTrie(
+    ['the only person in the house', 'the only person', 'alone'])
+THAT_WAS = PhraseTrie(['that was'])
+POSTURES = PhraseTrie(['standing', 'sitting'])
+PREPOSITIONS = PhraseTrie([
+    'on', 'beside', 'next to', 'in the same row as', 'in the same column as',
+    'in the same room as', 'in the corner of', 'in'
+])
+ARTICLES = PhraseTrie(['a', 'the'])
+WITH = PhraseTrie(['with'])
+OTHER = PhraseTrie(['other'])
+SUBJ_ADJECTIVES = PhraseTrie(['suspect'])
+SUBJ_NOUNS = PhraseTrie(
+    ['man', 'men', 'woman', 'women', 'person', 'people', 'suspect', 'suspects'])
+
+
+def tokenize(raw_clue: str) -> List[str]:
+    text = raw_clue.lower()
+    if text.endswith('.'):
+        text = text[:-1]
+    return text.split(' ')
+
+
+def match_steps(steps: List[Step], tokens: List[str], start: int,
+                groups: Dict[str, object]) -> Optional[Dict[str, object]]:
+    if not steps:
+        return groups if start == len(tokens) else None
+    step = steps[0]
+    candidates = step.matcher(tokens, start)
+    if step.optional:
+        candidates = chain(candidates, [(start, None)])
+    for end, value in candidates:
+        match = match_steps(steps[1:], tokens, end, {
+            **groups, step.name: value
+        })
+        if match is not None:
+            return match
+    return None
+
+
+def _match_subj_phrase(steps: List[Step], tokens: List[str],
+                       start: int) -> Iterator[Tuple[int, Dict[str, object]]]:
+    groups = match_steps(steps, tokens, start, {})
+    if groups is not None:
+        yield len(tokens), groups
+
+
+def get_number_trie(n: int) -> PhraseTrie:
+    numbers = PhraseTrie(['a', 'an', 'another'])
+    for i in range(n + 1):
+        numbers.add(str(i))
+        if i in NUMBERS_NAMES:
+            numbers.add(NUMBERS_NAMES[i])
+    return numbers
+
+
+def get_object_trie(room_ids: Dict[str, int]) -> PhraseTrie:
+    objects = PhraseTrie(
+        [feature_data.name for feature_data in FEATURE_DATA_DICT.values()])
+    objects.add('window')
+    for room_name in room_ids:
+        objects.add(room_name)
+    objects.add('room')
+    return objects
+
+
+class PuzzleClueTrieEncoder(PuzzleClueRegexEncoder):
+
+    def __init__(self) -> None:
+        self._roster = None
+        self._steps = None
+
+    def _parse_person_clue(self, raw_clue: str) -> ParsedPersonClue:
+        groups = match_steps(self._get_steps(), tokenize(raw_clue), 0, {})
+        if groups is None:
+            raise ValueError(f'Unable to parse clue: {raw_clue}')
+        subj_phrase = groups['subj_phrase']
+        return ParsedPersonClue(
+            subject=groups['subject'],
+            exclusive=groups['exclusive'] is not None,
+            preposition=groups['preposition'],
+            object=groups['object'],
+            subj_phrase=None if subj_phrase is None else parse_subj_phrase(
+                subj_phrase['subj_num'], subj_phrase['subj_adj'],
+                subj_phrase['subj_noun']))
+
+    def _get_steps(self) -> List[Step]:
+        roster = (self._people_ids, self._room_ids)
+        if self._roster != roster:
+            self._roster = (dict(self._people_ids), dict(self._room_ids))
+            self._steps = self._create_steps()
+        return self._steps
+
+    def _create_steps(self) -> List[Step]:
+        subj_steps = [
+            Step('with', WITH.matches, False),
+            Step('subj_num',
+                 get_number_trie(len(self._people_ids)).matches, False),
+            Step('other', OTHER.matches, True),
+            Step('subj_adj', SUBJ_ADJECTIVES.matches, True),
+            Step('subj_noun', SUBJ_NOUNS.matches, False),
+        ]
+        return [
+            Step('subject',
+                 PhraseTrie(self._people_ids.keys()).matches, False),
+            Step('verb', VERBS.matches, True),
+            Step('exclusive', EXCLUSIVES.matches, True),
+            Step('that_was', THAT_WAS.matches, True),
+            Step('posture', POSTURES.matches, True),
+            Step('preposition', PREPOSITIONS.matches, False),
+            Step('article', ARTICLES.matches, True),
+            Step('object',
+                 get_object_trie(self._room_ids).matches, False),
+            Step('subj_phrase', partial(_match_subj_phrase, subj_steps), True),
+        ]
@@ -0,0 +1,115 @@
+import hashlib
+
+from collections import deque
+from concurrent.futures import Executor
+
+from puzzle_pb2 import Puzzle
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional
+
+CORPUS_SUFFIX = '.puzzles'
+
+
+def _write_varint(stream: BinaryIO, value: int) -> None:
+    while value > 0x7F:
+        stream.write(bytes((value & 0x7F | 0x80,)))
+        value >>= 7
+    stream.write(bytes((value,)))
+
+
+def _read_varint(stream: BinaryIO) -> Optional[int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            if shift:
+                raise EOFError('Truncated puzzle corpus')
+            return None
+        value |= (byte[0] & 0x7F) << shift
+        if not byte[0] & 0x80:
+            return value
+        shift += 7
+
+
+def get_fingerprint(puzzle: Puzzle) -> str:
+    return hashlib.sha256(
+        puzzle.SerializeToString(deterministic=True)).hexdigest()
+
+
+def iter_serialized_puzzles(path: str) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        if not path.endswith(CORPUS_SUFFIX):
+            yield f.read()
+            return
+        while True:
+            size = _read_varint(f)
+            if size is None:
+                return
+            data = f.read(size)
+            if len(data) != size:
+                raise EOFError('Truncated puzzle corpus')
+            yield data
+
+
+def read_puzzles(path: str) -> Iterator[Puzzle]:
+    for data in iter_serialized_puzzles(path):
+        puzzle = Puzzle()
+        puzzle.ParseFromString(data)
+        yield puzzle
+
+
+class PuzzleCorpusWriter:
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, 'wb')
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def write(self, puzzle: Puzzle) -> None:
+        self.write_serialized(puzzle.SerializeToString())
+
+    def write_serialized(self, data: bytes) -> None:
+        _write_varint(self._file, len(data))
+        self._file.write(data)
+        self._count += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'PuzzleCorpusWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _apply_to_chunk(function: Callable, chunk: List) -> List:
+    return [function(item) for item in chunk]
+
+
+def _iter_chunks(items: Iterable, chunksize: int) -> Iterator[List]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def map_bounded(executor: Executor,
+                function: Callable,
+                items: Iterable,
+                window: int = 64,
+                chunksize: int = 1) -> Iterator:
+    pending = deque()
+    for chunk in _iter_chunks(items, chunksize):
+        pending.append(executor.submit(_apply_to_chunk, function, chunk))
+        if len(pending) >= window:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
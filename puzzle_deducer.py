@@ -0,0 +1,248 @@
+import copy
+
+from collections import namedtuple
+
+from puzzle_board import PuzzleBoard
+from puzzle_pb2 import Puzzle
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+CLUE_LAYER = 'clue'
+EXCLUSIVITY_LAYER = 'exclusivity'
+COUNTING_LAYER = 'counting'
+TRIAL_LAYER = 'trial'
+LAYERS = (CLUE_LAYER, EXCLUSIVITY_LAYER, COUNTING_LAYER, TRIAL_LAYER)
+
+CompiledClue = namedtuple(
+    'CompiledClue', ['index', 'subject_indexes', 'cells', 'count', 'exact'])
+
+Deduction = namedtuple('Deduction',
+                       ['person_id', 'row', 'column', 'clue_indexes', 'layer'])
+
+
+class Contradiction(ValueError):
+    pass
+
+
+def iter_cells(mask: int) -> Iterable[int]:
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+
+class PuzzleDeducer:
+
+    def __init__(self,
+                 puzzle: Puzzle,
+                 board: Optional[PuzzleBoard] = None) -> None:
+        self._puzzle = puzzle
+        self._board = PuzzleBoard(puzzle) if board is None else board
+        self._n = self._board.n
+        self._columns = self._board.columns
+        self._compile_board()
+        self._compile_clues()
+        self._domains = [self._free_cells for _ in range(self._n)]
+        self._reasons = [set() for _ in range(self._n)]
+        self._last_layers = [None for _ in range(self._n)]
+        self._reported = set()
+        self._explained = set()
+        self._single_clues_applied = False
+        self._layer_counts = {layer: 0 for layer in LAYERS}
+
+    @property
+    def layer_counts(self) -> Dict[str, int]:
+        return self._layer_counts
+
+    def get_domain(self, person_id: int) -> List[Tuple[int, int]]:
+        return [
+            divmod(cell, self._columns)
+            for cell in iter_cells(self._domains[person_id - 1])
+        ]
+
+    def get_unresolved_candidates(self) -> List[Tuple[int, int, int]]:
+        return [(person_index + 1, *divmod(cell, self._columns))
+                for person_index, domain in enumerate(self._domains)
+                if domain & (domain - 1) for cell in iter_cells(domain)]
+
+    def is_solved(self) -> bool:
+        return all(domain & (domain - 1) == 0 for domain in self._domains)
+
+    def copy(self) -> 'PuzzleDeducer':
+        deducer = copy.copy(self)
+        deducer._domains = list(self._domains)
+        deducer._reasons = [set(reasons) for reasons in self._reasons]
+        deducer._last_layers = list(self._last_layers)
+        deducer._reported = set(self._reported)
+        deducer._explained = set(self._explained)
+        deducer._layer_counts = dict(self._layer_counts)
+        return deducer
+
+    def assume(self, person_id: int, row: int, column: int) -> None:
+        self._restrict(person_id - 1, 1 << (row * self._columns + column),
+                       set(), TRIAL_LAYER)
+
+    def eliminate(self, person_id: int, row: int, column: int) -> None:
+        self._restrict(person_id - 1, ~(1 << (row * self._columns + column)),
+                       set(), TRIAL_LAYER)
+
+    def next_placement(self) -> Optional[Deduction]:
+        while True:
+            deduction = self._next_unreported_placement()
+            if deduction is not None:
+                return deduction
+            if not self._step():
+                return None
+
+    def propagate(self) -> None:
+        while self._step():
+            pass
+
+    def _compile_board(self) -> None:
+        rows = self._board.rows
+        self._all_cells = (1 << (rows * self._columns)) - 1
+        self._free_cells = self._all_cells
+        for row, column in self._board.blocked_coordinates:
+            self._free_cells &= ~(1 << (row * self._columns + column))
+        row_masks = [(self._get_mask(self._board.row_indexes(line)),
+                      rows == self._n) for line in range(rows)]
+        column_masks = [(self._get_mask(self._board.col_indexes(line)),
+                         self._columns == self._n)
+                        for line in range(self._columns)]
+        self._line_masks = row_masks + column_masks
+
+    def _compile_clues(self) -> None:
+        self._clues = []
+        for clue_index, clue in enumerate(self._puzzle.clues):
+            people_ids = self._board.get_subject_ids(clue)
+            space_indexes = self._board.get_space_indexes(clue)
+            if not (people_ids and space_indexes):
+                continue
+            exact = clue.HasField('exact_count')
+            self._clues.append(
+                CompiledClue(
+                    index=clue_index,
+                    subject_indexes=tuple(
+                        person_id - 1 for person_id in people_ids),
+                    cells=self._get_mask(space_indexes),
+                    count=clue.exact_count if exact else clue.min_count,
+                    exact=exact))
+
+    def _get_mask(self, space_indexes: List[Tuple[int, int]]) -> int:
+        mask = 0
+        for row, column in space_indexes:
+            mask |= 1 << (row * self._columns + column)
+        return mask
+
+    def _next_unreported_placement(self) -> Optional[Deduction]:
+        for person_index, domain in enumerate(self._domains):
+            if person_index in self._reported or domain & (domain - 1):
+                continue
+            self._reported.add(person_index)
+            clue_indexes = sorted(self._reasons[person_index] - self._explained)
+            self._explained |= self._reasons[person_index]
+            row, column = divmod(domain.bit_length() - 1, self._columns)
+            return Deduction(person_id=person_index + 1,
+                             row=row,
+                             column=column,
+                             clue_indexes=clue_indexes,
+                             layer=self._last_layers[person_index])
+        return None
+
+    def _step(self) -> bool:
+        return (self._apply_single_clues() or self._apply_exclusivity() or
+                self._apply_counting())
+
+    def _restrict(self, person_index: int, mask: int, reasons: Set[int],
+                  layer: str) -> bool:
+        domain = self._domains[person_index]
+        restricted = domain & mask
+        if restricted == domain:
+            return False
+        if not restricted:
+            raise Contradiction(f'No space left for person {person_index + 1}')
+        self._domains[person_index] = restricted
+        self._reasons[person_index] |= reasons
+        self._last_layers[person_index] = layer
+        self._layer_counts[layer] += 1
+        return True
+
+    def _apply_single_clues(self) -> bool:
+        if self._single_clues_applied:
+            return False
+        self._single_clues_applied = True
+        changed = False
+        for clue in self._clues:
+            if clue.exact and clue.count == 0:
+                for person_index in clue.subject_indexes:
+                    changed |= self._restrict(person_index,
+                                              self._all_cells & ~clue.cells,
+                                              {clue.index}, CLUE_LAYER)
+            elif len(clue.subject_indexes) == 1 and clue.count >= 1:
+                changed |= self._restrict(clue.subject_indexes[0], clue.cells,
+                                          {clue.index}, CLUE_LAYER)
+        return changed
+
+    def _apply_exclusivity(self) -> bool:
+        for line_mask, filled in self._line_masks:
+            inside = [
+                person_index
+                for person_index, domain in enumerate(self._domains)
+                if domain & line_mask
+            ]
+            if not inside:
+                if filled:
+                    raise Contradiction('No person left for a row or column')
+                continue
+            confined = [
+                person_index for person_index in inside
+                if not self._domains[person_index] & ~line_mask
+            ]
+            if len(confined) > 1:
+                raise Contradiction('Two people confined to a row or column')
+            changed = False
+            if confined:
+                reasons = self._reasons[confined[0]]
+                for person_index in inside:
+                    if person_index != confined[0]:
+                        changed |= self._restrict(person_index, ~line_mask,
+                                                  reasons, EXCLUSIVITY_LAYER)
+            elif len(inside) == 1 and filled:
+                reasons = set().union(*[
+                    self._reasons[person_index]
+                    for person_index in range(self._n)
+                    if person_index != inside[0]
+                ])
+                changed |= self._restrict(inside[0], line_mask, reasons,
+                                          EXCLUSIVITY_LAYER)
+            if changed:
+                return True
+        return False
+
+    def _apply_counting(self) -> bool:
+        for clue in self._clues:
+            must = [
+                person_index for person_index in clue.subject_indexes
+                if not self._domains[person_index] & ~clue.cells
+            ]
+            may = [
+                person_index for person_index in clue.subject_indexes
+                if self._domains[person_index] & clue.cells
+            ]
+            if len(may) < clue.count or (clue.exact and len(must) > clue.count):
+                raise Contradiction(f'Clue {clue.index} cannot be satisfied')
+            reasons = {clue.index}
+            for person_index in may:
+                reasons |= self._reasons[person_index]
+            changed = False
+            if clue.exact and len(must) == clue.count:
+                for person_index in may:
+                    if person_index not in must:
+                        changed |= self._restrict(person_index, ~clue.cells,
+                                                  reasons, COUNTING_LAYER)
+            if len(may) == clue.count:
+                for person_index in may:
+                    changed |= self._restrict(person_index, clue.cells, reasons,
+                                              COUNTING_LAYER)
+            if changed:
+                return True
+        return False
@@ -0,0 +1,184 @@
+import argparse
+import logging
+import yaml
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from puzzle_clue_encoder import PuzzleClueEncoder
+from puzzle_clue_regex_encoder import PuzzleClueRegexEncoder
+from puzzle_clue_trie_encoder import PuzzleClueTrieEncoder
+from puzzle_corpus import PuzzleCorpusWriter, map_bounded
+from puzzle_encoder import PuzzleEncoder
+from puzzle_pb2 import CrimeSceneFeatureType, Gender, PositionType, Puzzle, Role
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+DOCUMENT_SEPARATOR = '---'
+
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+WINDOW_ADDERS = {
+    'vertical': PuzzleEncoder.add_vertical_window,
+    'horizontal': PuzzleEncoder.add_horizontal_window,
+}
+
+WINDOW_ORIENTATIONS = {
+    PositionType.VERTICAL_BOUNDARY: 'vertical',
+    PositionType.HORIZONTAL_BOUNDARY: 'horizontal',
+}
+
+CLUE_ENCODERS = {
+    'regex': PuzzleClueRegexEncoder,
+    'trie': PuzzleClueTrieEncoder,
+}
+
+
+def iter_definition_records(lines: Iterable[str]) -> Iterator[str]:
+    record = []
+    for line in lines:
+        if line.startswith(DOCUMENT_SEPARATOR):
+            if ''.join(record).strip():
+                yield ''.join(record)
+            record = []
+        else:
+            record.append(line)
+    if ''.join(record).strip():
+        yield ''.join(record)
+
+
+def encode_definition(
+        definition: dict,
+        clue_encoder: PuzzleClueEncoder = PuzzleClueRegexEncoder) -> Puzzle:
+    encoder = PuzzleEncoder(definition.get('name', ''), clue_encoder)
+    encoder.set_rooms(definition['rooms'])
+    encoder.set_floor_plan(definition['floor_plan'])
+    for orientation, row, column in definition.get('windows', []):
+        WINDOW_ADDERS[orientation](encoder, row, column)
+    for feature in definition.get('features', []):
+        encoder.add_feature(feature['type'],
+                            [tuple(coordinate) for coordinate in feature['at']])
+    encoder.set_people(
+        suspects=[tuple(suspect) for suspect in definition['suspects']],
+        victim=tuple(definition['victim']))
+    for clue in definition.get('clues', []):
+        encoder.add_clue(clue)
+    return encoder.puzzle
+
+
+def parse_definition(
+        record: str,
+        clue_encoder: PuzzleClueEncoder = PuzzleClueRegexEncoder) -> Puzzle:
+    definition = yaml.load(record, Loader=YAML_LOADER)
+    if not isinstance(definition, dict):
+        raise ValueError('Puzzle definition must be a mapping')
+    return encode_definition(definition, clue_encoder)
+
+
+def load_puzzles(
+    path: str,
+    clue_encoder: PuzzleClueEncoder = PuzzleClueRegexEncoder
+) -> Iterator[Puzzle]:
+    with open(path, encoding='utf-8') as f:
+        for record in iter_definition_records(f):
+            yield parse_definition(record, clue_encoder)
+
+
+def get_definition(puzzle: Puzzle) -> dict:
+    crime_scene = puzzle.crime_scene
+    definition = {
+        'name': puzzle.name,
+        'rooms': [room.name for room in crime_scene.rooms],
+        'floor_plan': [list(row.values) for row in crime_scene.floor_plan],
+        'windows': [],
+        'features': [],
+    }
+    for feature in crime_scene.features:
+        coordinates = [[coordinate.row, coordinate.column]
+                       for coordinate in feature.coordinates]
+        if feature.position_type in WINDOW_ORIENTATIONS:
+            orientation = WINDOW_ORIENTATIONS[feature.position_type]
+            definition['windows'].extend(
+                [orientation, *coordinate] for coordinate in coordinates)
+        else:
+            definition['features'].append({
+                'type': CrimeSceneFeatureType.Name(feature.type).lower(),
+                'at': coordinates
+            })
+    people = sorted(puzzle.people, key=lambda person: person.id)
+    definition['suspects'] = [[person.name,
+                               Gender.Name(person.gender).lower()]
+                              for person in people
+                              if person.role != Role.VICTIM]
+    definition['victim'] = next(
+        [person.name, Gender.Name(person.gender).lower()]
+        for person in people
+        if person.role == Role.VICTIM)
+    definition['clues'] = list(
+        dict.fromkeys(clue.text for clue in puzzle.clues if clue.text))
+    return definition
+
+
+def dump_definitions(puzzles: Iterable[Puzzle], f: TextIO) -> None:
+    for puzzle in puzzles:
+        f.write(DOCUMENT_SEPARATOR + '\n')
+        yaml.dump(get_definition(puzzle),
+                  f,
+                  Dumper=YAML_DUMPER,
+                  default_flow_style=None,
+                  sort_keys=False,
+                  allow_unicode=True)
+
+
+def _encode_record(clue_encoder_name: str,
+                   item: Tuple[int, str]) -> Tuple[int, Union[bytes, str]]:
+    index, record = item
+    try:
+        puzzle = parse_definition(record, CLUE_ENCODERS[clue_encoder_name])
+    except Exception as error:
+        return index, f'{type(error).__name__}: {error}'
+    return index, puzzle.SerializeToString()
+
+
+def _iter_records(paths: List[str]) -> Iterator[str]:
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            yield from iter_definition_records(f)
+
+
+def convert_definitions(paths: List[str],
+                        output_path: str,
+                        clue_encoder_name: str = 'regex',
+                        max_workers: Optional[int] = None,
+                        chunksize: int = 64,
+                        window: int = 16) -> Tuple[int, int]:
+    failed = 0
+    encode = partial(_encode_record, clue_encoder_name)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor, \
+            PuzzleCorpusWriter(output_path) as writer:
+        for index, result in map_bounded(executor, encode,
+                                         enumerate(_iter_records(paths)),
+                                         window, chunksize):
+            if isinstance(result, bytes):
+                writer.write_serialized(result)
+            else:
+                logging.warning(f'Skipping puzzle definition {index}: {result}')
+                failed += 1
+        return writer.count, failed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Encode puzzle definition files into a puzzle corpus.')
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--output', required=True)
+    parser.add_argument('--clue-encoder',
+                        choices=list(CLUE_ENCODERS.keys()),
+                        default='regex')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=64)
+    args = parser.parse_args()
+    written, failed = convert_definitions(args.paths, args.output,
+                                          args.clue_encoder, args.workers,
+                                          args.chunksize)
+    print(f'Wrote {written} puzzles to {args.output} ({failed} failed)')
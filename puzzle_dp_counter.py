@@ -0,0 +1,206 @@
+import argparse
+import math
+import time
+
+from collections import defaultdict
+
+from puzzle_board import PuzzleBoard
+from puzzle_clue_canonicalizer import PuzzleClueCanonicalizer
+from puzzle_deducer import Contradiction, PuzzleDeducer
+from puzzle_pb2 import Puzzle
+from typing import Dict, List, Optional, Tuple
+
+MAX_PEOPLE = 16
+
+State = Tuple[int, Tuple[int, ...], Tuple[int, ...]]
+
+
+class PuzzleDpCounter:
+
+    def __init__(self,
+                 puzzle: Puzzle,
+                 board: Optional[PuzzleBoard] = None) -> None:
+        self._puzzle = puzzle
+        self._board = PuzzleBoard(puzzle) if board is None else board
+        self._n = self._board.n
+        if self._n > MAX_PEOPLE:
+            raise ValueError(
+                f'Dynamic programming counts support at most {MAX_PEOPLE} '
+                f'people, got {self._n}')
+        self._rows = self._board.rows
+        self._columns = self._board.columns
+        self._clues = PuzzleClueCanonicalizer(puzzle, self._board).clues
+        self._init_classes()
+        self._init_transitions()
+
+    @property
+    def classes(self) -> List[List[int]]:
+        return self._classes
+
+    @property
+    def multiplicity(self) -> int:
+        multiplicity = 1
+        for person_ids in self._classes:
+            multiplicity *= math.factorial(len(person_ids))
+        return multiplicity
+
+    def count(self) -> int:
+        states = {(0, (0,) * len(self._classes), (0,) * len(self._clues)): 1}
+        for row in range(self._rows):
+            states = self._expand_row(row, states)
+            states = self._retire_clues(row, states)
+            states = {
+                state: count
+                for state, count in states.items()
+                if self._can_complete(row, state[1])
+            }
+        sizes = tuple(len(person_ids) for person_ids in self._classes)
+        return self.multiplicity * sum(count for (
+            _, placed, _), count in states.items() if placed == sizes)
+
+    def _get_domains(self) -> Dict[int, int]:
+        deducer = PuzzleDeducer(self._puzzle, self._board)
+        try:
+            deducer.propagate()
+        except Contradiction:
+            deducer = PuzzleDeducer(self._puzzle, self._board)
+        return {
+            person_id: sum(1 << (row * self._columns + col)
+                           for row, col in deducer.get_domain(person_id))
+            for person_id in range(1, self._n + 1)
+        }
+
+    def _init_classes(self) -> None:
+        domains = self._get_domains()
+        signatures = {}
+        for person_id in range(1, self._n + 1):
+            memberships = tuple(
+                clue_index for clue_index, clue in enumerate(self._clues)
+                if clue.subjects & (1 << (person_id - 1)))
+            signature = (domains[person_id], memberships)
+            signatures.setdefault(signature, []).append(person_id)
+        self._classes = list(signatures.values())
+        self._class_domains = [
+            domains[person_ids[0]] for person_ids in self._classes
+        ]
+
+    def _init_transitions(self) -> None:
+        self._cell_clues = {}
+        for class_index, person_ids in enumerate(self._classes):
+            subject = 1 << (person_ids[0] - 1)
+            for cell in range(self._rows * self._columns):
+                if self._class_domains[class_index] & (1 << cell):
+                    self._cell_clues[cell, class_index] = [
+                        clue_index
+                        for clue_index, clue in enumerate(self._clues)
+                        if clue.subjects & subject and clue.cells & (1 << cell)
+                    ]
+        self._last_rows = [
+            max(clue.cells.bit_length() - 1, 0) // self._columns
+            for clue in self._clues
+        ]
+        self._row_required = self._rows == self._n
+        row_mask = (1 << self._columns) - 1
+        self._rows_left = [[
+            sum(1
+                for next_row in range(row + 1, self._rows)
+                if domain >> (next_row * self._columns) & row_mask)
+            for row in range(self._rows)
+        ]
+                           for domain in self._class_domains]
+
+    def _can_complete(self, row: int, placed: Tuple[int, ...]) -> bool:
+        if self._n - sum(placed) > self._rows - row - 1:
+            return False
+        return all(
+            len(person_ids) -
+            placed[class_index] <= self._rows_left[class_index][row]
+            for class_index, person_ids in enumerate(self._classes))
+
+    def _expand_row(self, row: int, states: Dict[State,
+                                                 int]) -> Dict[State, int]:
+        expanded = defaultdict(int)
+        for (columns, placed, counters), count in states.items():
+            if not self._row_required:
+                expanded[columns, placed, counters] += count
+            for col in range(self._columns):
+                if columns & (1 << col):
+                    continue
+                cell = row * self._columns + col
+                for class_index, person_ids in enumerate(self._classes):
+                    if (placed[class_index] == len(person_ids) or
+                        (cell, class_index) not in self._cell_clues):
+                        continue
+                    next_counters = self._increment(
+                        counters, self._cell_clues[cell, class_index])
+                    if next_counters is None:
+                        continue
+                    next_placed = placed[:class_index] + (
+                        placed[class_index] + 1,) + placed[class_index + 1:]
+                    expanded[columns | (1 << col), next_placed,
+                             next_counters] += count
+        return expanded
+
+    def _increment(self, counters: Tuple[int, ...],
+                   clue_indexes: List[int]) -> Optional[Tuple[int, ...]]:
+        if not clue_indexes:
+            return counters
+        counters = list(counters)
+        for clue_index in clue_indexes:
+            clue = self._clues[clue_index]
+            if counters[clue_index] < clue.count:
+                counters[clue_index] += 1
+            elif clue.exact:
+                return None
+        return tuple(counters)
+
+    def _retire_clues(self, row: int, states: Dict[State,
+                                                   int]) -> Dict[State, int]:
+        clue_indexes = [
+            clue_index for clue_index, last_row in enumerate(self._last_rows)
+            if last_row == row
+        ]
+        if not clue_indexes:
+            return states
+        retired = defaultdict(int)
+        for (columns, placed, counters), count in states.items():
+            if all(counters[clue_index] == self._clues[clue_index].count
+                   for clue_index in clue_indexes):
+                counters = tuple(0 if clue_index in clue_indexes else counter
+                                 for clue_index, counter in enumerate(counters))
+                retired[columns, placed, counters] += count
+        return retired
+
+
+def compare_counts(puzzle: Puzzle) -> Dict[str, float]:
+    from puzzle_solver import PuzzleSolver
+    start = time.perf_counter()
+    dp_count = PuzzleDpCounter(puzzle).count()
+    dp_time = time.perf_counter() - start
+    start = time.perf_counter()
+    _, cp_sat_count = PuzzleSolver(puzzle, break_symmetries=False).solve()
+    cp_sat_time = time.perf_counter() - start
+    return {
+        'dp_count': dp_count,
+        'dp_time': dp_time,
+        'cp_sat_count': cp_sat_count,
+        'cp_sat_time': cp_sat_time,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Cross-validate dynamic programming solution counts '
+        'against CP-SAT enumeration.')
+    parser.add_argument('paths', nargs='+')
+    args = parser.parse_args()
+    for path in args.paths:
+        puzzle = Puzzle()
+        with open(path, 'rb') as f:
+            puzzle.ParseFromString(f.read())
+        result = compare_counts(puzzle)
+        match = 'ok' if result['dp_count'] == result[
+            'cp_sat_count'] else 'MISMATCH'
+        print(f'{path}: dp {result["dp_count"]} ({result["dp_time"]:.3f}s) '
+              f'cp-sat {result["cp_sat_count"]} '
+              f'({result["cp_sat_time"]:.3f}s) {match}')
@@ -83,4 +83,6 @@ class PuzzleEncoder:
             self._room_ids,
             self._people_ids,
         )
+        for clue in clues:
+            clue.text = raw_clue
         self._puzzle.clues.extend(clues)
@@ -0,0 +1,112 @@
+import numpy as np
+import os
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from ortools.sat.python.cp_model import CpModel, CpSolver, FEASIBLE, OPTIMAL
+
+from puzzle_clue_analyzer import set_assumptions
+from puzzle_modeler import PuzzleModeler
+from puzzle_pb2 import Puzzle
+from puzzle_shared_state import SharedModelerState, create_shared_state, get_response_placements, get_variable_indexes
+from typing import Iterable, List, Optional, Tuple
+
+_worker_probe = None
+
+Placements = Tuple[Tuple[int, int], ...]
+
+
+def probe_placements(model: CpModel, occupancy_keys: np.ndarray,
+                     occupancy_indexes: np.ndarray,
+                     assumptions: Iterable[int]) -> Optional[Placements]:
+    set_assumptions(model, assumptions)
+    solver = CpSolver()
+    solver.parameters.num_search_workers = 1
+    if solver.Solve(model) not in (OPTIMAL, FEASIBLE):
+        return None
+    return get_response_placements(occupancy_keys, occupancy_indexes, solver)
+
+
+def _init_worker(state: SharedModelerState) -> None:
+    global _worker_probe
+    _worker_probe = (state.model, state.occupancy_keys, state.occupancy_indexes)
+
+
+def _probe_in_worker(literal_index: int) -> Optional[Placements]:
+    return probe_placements(*_worker_probe, [literal_index])
+
+
+class PuzzleFeasibilityMapper:
+
+    def __init__(self,
+                 puzzle: Puzzle,
+                 max_workers: Optional[int] = None,
+                 window: Optional[int] = None) -> None:
+        self._puzzle = puzzle
+        self._max_workers = max_workers
+        self._window = window
+        self._modeler = PuzzleModeler(puzzle)
+        variable_indexes = get_variable_indexes(self._modeler)
+        self._occupancy_keys = variable_indexes['occupancy_keys']
+        self._occupancy_indexes = variable_indexes['occupancy_indexes']
+        self._probe_count = 0
+
+    @property
+    def probe_count(self) -> int:
+        return self._probe_count
+
+    def map(self) -> np.ndarray:
+        board = self._modeler.board
+        self._feasible = np.zeros(
+            (len(self._puzzle.people), board.rows, board.columns),
+            dtype=np.bool_)
+        self._probe_count = 0
+        if self._probe([]):
+            if self._max_workers == 1:
+                self._map_serially()
+            else:
+                self._map_in_parallel()
+        return self._feasible
+
+    def _probe(self, assumptions: List[int]) -> bool:
+        placements = probe_placements(self._modeler.model, self._occupancy_keys,
+                                      self._occupancy_indexes, assumptions)
+        self._record(placements)
+        return placements is not None
+
+    def _record(self, placements: Optional[Placements]) -> None:
+        self._probe_count += 1
+        if placements is None:
+            return
+        for person_index, (row, col) in enumerate(placements):
+            self._feasible[person_index, row, col] = True
+
+    def _iter_uncovered(self) -> Iterable[int]:
+        for (person_id, row,
+             col), literal_index in zip(self._occupancy_keys.tolist(),
+                                        self._occupancy_indexes.tolist()):
+            if not self._feasible[person_id - 1, row, col]:
+                yield literal_index
+
+    def _map_serially(self) -> None:
+        for literal_index in self._iter_uncovered():
+            self._probe([literal_index])
+
+    def _map_in_parallel(self) -> None:
+        max_workers = self._max_workers or os.cpu_count() or 1
+        window = self._window or 2 * max_workers
+        uncovered = self._iter_uncovered()
+        running = set()
+        with create_shared_state(self._modeler) as state:
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     initializer=_init_worker,
+                                     initargs=(state,)) as executor:
+                for literal_index in uncovered:
+                    running.add(executor.submit(_probe_in_worker,
+                                                literal_index))
+                    if len(running) < window:
+                        continue
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._record(future.result())
+                for future in running:
+                    self._record(future.result())
@@ -1,363 +1,382 @@
 import logging
+import math
 
-from dataclasses import dataclass, field
-from itertools import product, repeat
-from ortools.sat.python.cp_model import CpModel, IntVar
+from collections import Counter
+from itertools import product
 
-from puzzle_pb2 import Clue, Coordinate, CrimeSceneFeature, CrimeSceneFeatureType, Gender, PositionSelector, PositionType, Preposition, Puzzle, Role, SubjectSelector
-from typing import Callable, List, Optional, Set, Tuple
+from puzzle_board import PuzzleBoard
+from puzzle_clue_canonicalizer import PuzzleClueCanonicalizer
+from puzzle_deducer import Contradiction, PuzzleDeducer
+from puzzle_pb2 import Clue, Coordinate, Gender, Puzzle, Role, SubjectSelector
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    from ortools.sat.python.cp_model import Constraint, CpModel, IntVar, LinearExpr
 
 EXACT_COUNT = lambda count: lambda total_occupancy: total_occupancy == count
 MIN_COUNT = lambda count: lambda total_occupancy: total_occupancy >= count
+MAX_COUNT = lambda count: lambda total_occupancy: total_occupancy <= count
 
+SUBJECT_CLASSES = {
+    'all': SubjectSelector(),
+    'suspects': SubjectSelector(role=Role.SUSPECT),
+    'men': SubjectSelector(gender=Gender.MALE),
+    'women': SubjectSelector(gender=Gender.FEMALE),
+    'suspect men': SubjectSelector(role=Role.SUSPECT, gender=Gender.MALE),
+    'suspect women': SubjectSelector(role=Role.SUSPECT, gender=Gender.FEMALE),
+}
 
-@dataclass
-class Space:
-
-    room_id: int
-    on: Optional[int] = None
-    beside: Set[int] = field(default_factory=set)
-
-    def __repr__(self) -> str:
-        on = CrimeSceneFeatureType.Name(
-            self.on).capitalize() if self.on is not None else 'None'
-        beside = '[' + ', '.join([
-            CrimeSceneFeatureType.Name(feature).capitalize()
-            for feature in self.beside
-        ]) + ']'
-        return f'{{room_id: {self.room_id}, on: {on}, beside: {beside}}}'
+OccupancyKey = Tuple[int, int, int]
+CountKey = Tuple[str, str, int]
+ConstraintSpec = Tuple[Callable[[int], bool], List[int], List[Tuple[int, int]]]
 
 
 class PuzzleModeler:
 
-    def __init__(self, puzzle: Puzzle, debug: bool = False) -> None:
+    def __init__(self,
+                 puzzle: Puzzle,
+                 debug: bool = False,
+                 guard_clues: bool = False,
+                 prune_clues: bool = True,
+                 aggregate_counts: bool = True,
+                 break_symmetries: bool = False,
+                 model: Optional['CpModel'] = None,
+                 board: Optional[PuzzleBoard] = None) -> None:
         self._puzzle = puzzle
         self._debug = debug
+        self._guard_clues = guard_clues
+        self._prune_clues = prune_clues and not guard_clues
+        self._aggregate_counts = aggregate_counts
+        self._break_symmetries = break_symmetries
         self._n = len(self._puzzle.people)
-        self._init_board()
-        self._create_model()
+        self._board = PuzzleBoard(puzzle, debug) if board is None else board
+        self._create_model(model)
+
+    @property
+    def puzzle(self) -> Puzzle:
+        return self._puzzle
 
     @property
-    def model(self) -> CpModel:
+    def model(self) -> 'CpModel':
         return self._model
 
     @property
-    def occupancies(self) -> List[List[List[IntVar]]]:
+    def occupancies(self) -> Dict[OccupancyKey, 'IntVar']:
         return self._occupancies
 
-    def get_room_of_coordinate(self, coordinate: Coordinate) -> int:
-        return self._spaces[coordinate.row][coordinate.column].room_id
+    @property
+    def counts(self) -> Dict[CountKey, 'IntVar']:
+        return self._counts
 
-    def _init_board(self):
-        self._get_room_coordinates()
-        self._init_spaces()
-        self._add_walls_and_corners()
-        self._add_features()
-        if self._debug:
-            self._log_board_debug()
+    @property
+    def symmetry_classes(self) -> List[List[int]]:
+        return self._symmetry_classes
 
-    def _get_room_coordinates(self) -> None:
-        self._room_coordinates = [
-            [] for _ in range(len(self._puzzle.crime_scene.rooms) + 1)
-        ]
-        for r, row in enumerate(self._puzzle.crime_scene.floor_plan):
-            for c, room_id in enumerate(row.values):
-                self._room_coordinates[room_id].append((r, c))
-
-    def _init_spaces(self) -> None:
-        self._spaces = [[
-            Space(self._get_room_id(row, column)) for column in range(self._n)
-        ] for row in range(self._n)]
-        self._roomwise_features = [
-            set() for _ in range(len(self._puzzle.crime_scene.rooms) + 1)
-        ]
-        self._rowwise_features = [set() for _ in range(self._n)]
-        self._columwise_features = [set() for _ in range(self._n)]
-
-    def _get_room_id(self, row: int, column: int) -> int:
-        return self._puzzle.crime_scene.floor_plan[row].values[column]
-
-    def _add_walls_and_corners(self) -> None:
-        for r, row in enumerate(self._spaces):
-            for c, space in enumerate(row):
-                is_different_room = lambda room_id: room_id != space.room_id
-                neighbor_room_ids = self._get_neighbor_room_ids(r, c)
-                N, S, W, E = tuple(map(is_different_room, neighbor_room_ids))
-                if N or S or E or W:
-                    space.beside.add(CrimeSceneFeatureType.WALL)
-                    if (N or S) and (E or W):
-                        space.beside.add(CrimeSceneFeatureType.CORNER)
-
-    def _get_neighbor_room_ids(self, r, c):
-        north_room_id = self._spaces[r - 1][c].room_id if r > 0 else -1
-        south_room_id = self._spaces[r +
-                                     1][c].room_id if r < self._n - 1 else -1
-        west_room_id = self._spaces[r][c - 1].room_id if c > 0 else -1
-        east_room_id = self._spaces[r][c + 1].room_id if c < self._n - 1 else -1
-        return (north_room_id, south_room_id, west_room_id, east_room_id)
-
-    def _add_features(self) -> None:
-        self._blocked_coordinates = []
-        for feature in self._puzzle.crime_scene.features:
-            if feature.position_type == PositionType.OCCUPIABLE_SPACE:
-                self._add_space_feature(feature)
-            elif feature.position_type == PositionType.BLOCKED_SPACE:
-                self._add_space_feature(feature)
-                self._blocked_coordinates.extend([
-                    (coordinate.row, coordinate.column)
-                    for coordinate in feature.coordinates
-                ])
-            elif feature.position_type == PositionType.VERTICAL_BOUNDARY:
-                self._add_vertical_feature(feature)
-            elif feature.position_type == PositionType.HORIZONTAL_BOUNDARY:
-                self._add_horizontal_feature(feature)
-
-    def _add_space_feature(self, feature: CrimeSceneFeature) -> None:
-        coordinates = [(coordinate.row, coordinate.column)
-                       for coordinate in feature.coordinates]
-        for row, column in coordinates:
-            self._spaces[row][column].on = feature.type
-            self._rowwise_features[row].add(feature.type)
-            self._columwise_features[column].add(feature.type)
-            room_id = self._get_room_id(row, column)
-            self._roomwise_features[room_id].add(feature.type)
-            for n_row, n_col in self._get_neighbor_coordinates(row, column):
-                if (n_row, n_col) not in coordinates:
-                    self._spaces[n_row][n_col].beside.add(feature.type)
-
-    def _get_neighbor_coordinates(self, row: int,
-                                  column: int) -> List[Tuple[int, int]]:
-        room_id = self._get_room_id(row, column)
-        neighbor_coordinates = []
-        if row > 0 and self._get_room_id(row - 1, column) == room_id:
-            neighbor_coordinates.append((row - 1, column))
-        if column > 0 and self._get_room_id(row, column - 1) == room_id:
-            neighbor_coordinates.append((row, column - 1))
-        if row < self._n - 1 and self._get_room_id(row + 1, column) == room_id:
-            neighbor_coordinates.append((row + 1, column))
-        if column < self._n - 1 and self._get_room_id(row,
-                                                      column + 1) == room_id:
-            neighbor_coordinates.append((row, column + 1))
-        return neighbor_coordinates
-
-    def _add_vertical_feature(self, feature: CrimeSceneFeature) -> None:
-        for coordinate in feature.coordinates:
-            row = coordinate.row
-            self._rowwise_features[row].add(feature.type)
-            if coordinate.column > 0:
-                column = coordinate.column - 1
-                room_id = self._get_room_id(row, column)
-                self._roomwise_features[room_id].add(feature.type)
-                self._spaces[row][column].beside.add(feature.type)
-            if coordinate.column < self._n:
-                column = coordinate.column
-                room_id = self._get_room_id(row, column)
-                self._roomwise_features[room_id].add(feature.type)
-                self._spaces[row][column].beside.add(feature.type)
-
-    def _add_horizontal_feature(self, feature: CrimeSceneFeature) -> None:
-        for coordinate in feature.coordinates:
-            column = coordinate.column
-            self._columwise_features[column].add(feature.type)
-            if coordinate.row > 0:
-                row = coordinate.row - 1
-                room_id = self._get_room_id(row, column)
-                self._roomwise_features[room_id].add(feature.type)
-                self._spaces[row][column].beside.add(feature.type)
-            if coordinate.row < self._n:
-                row = coordinate.row
-                room_id = self._get_room_id(row, column)
-                self._roomwise_features[room_id].add(feature.type)
-                self._spaces[row][column].beside.add(feature.type)
-
-    def _log_board_debug(self) -> None:
-        logging.debug('spaces: {\n' + '\n'.join([
-            '\n'.join([
-                f'\t({r}, {c}): ' + repr(space) + ','
-                for c, space in enumerate(row)
-            ])
-            for r, row in enumerate(self._spaces)
-        ]) + '\n}')
-        logging.debug('Roomwise features: ' + self._feature_sets_repr(
-            self._roomwise_features, ['Unspecified'] +
-            [room.name for room in self._puzzle.crime_scene.rooms]))
-        logging.debug('Rowwise features: ' +
-                      self._feature_sets_repr(self._rowwise_features))
-        logging.debug('Columnwise features: ' +
-                      self._feature_sets_repr(self._columwise_features))
-
-    def _feature_sets_repr(self,
-                           features_sets: List[Set[int]],
-                           labels: Optional[List[str]] = None) -> str:
-        if labels is None:
-            labels = range(len(features_sets))
-        return '{\n' + '\n'.join([
-            f'\t{label}: [' + ', '.join([
-                CrimeSceneFeatureType.Name(feature).capitalize()
-                for feature in features
-            ]) + '],'
-            for label, features in zip(labels, features_sets)
-        ]) + '\n}'
-
-    def _create_model(self) -> None:
-        self._model = CpModel()
-        unavailable = set(self._blocked_coordinates)
-        self._occupancies = [[[
-            self._model.NewConstant(0) if (row, col) in unavailable else
+    @property
+    def solution_multiplicity(self) -> int:
+        multiplicity = 1
+        for person_ids in self._symmetry_classes:
+            multiplicity *= math.factorial(len(person_ids))
+        return multiplicity
+
+    @property
+    def board(self) -> PuzzleBoard:
+        return self._board
+
+    @property
+    def clue_literals(self) -> List[Optional['IntVar']]:
+        return self._clue_literals
+
+    @property
+    def canonicalizer(self) -> Optional[PuzzleClueCanonicalizer]:
+        return self._canonicalizer
+
+    def get_room_of_coordinate(self, coordinate: Coordinate) -> int:
+        return self._board.get_room_of_coordinate(coordinate)
+
+    def get_occupancy(self, person_id: int, row: int,
+                      col: int) -> Optional['IntVar']:
+        return self._occupancies.get((person_id, row, col))
+
+    def _create_model(self, model: Optional['CpModel']) -> None:
+        if model is None:
+            from ortools.sat.python.cp_model import CpModel
+            model = CpModel()
+        self._model = model
+        self._zero = None
+        self._occupancies = {
+            (person_id, row, col):
             self._model.NewBoolVar(f'({person_id}, {row}, {col})')
-            for col in range(self._n)
+            for person_id, row, col in self._get_candidates()
+        }
+        uniqueness_specs = self._get_uniqueness_specs()
+        clue_specs = self._get_clue_specs()
+        self._init_counts(uniqueness_specs + [spec for _, spec in clue_specs])
+        for spec in uniqueness_specs:
+            self._add_constraint(*spec)
+        self._set_clues(clue_specs)
+        self._symmetry_classes = []
+        if self._break_symmetries:
+            self._symmetry_classes = self._get_symmetry_classes(
+                [spec for _, spec in clue_specs])
+            self._set_symmetry_breaking_constraints()
+
+    def _get_candidates(self) -> List[OccupancyKey]:
+        deducer = PuzzleDeducer(self._puzzle, self._board)
+        if self._prune_clues:
+            try:
+                deducer.propagate()
+            except Contradiction:
+                deducer = PuzzleDeducer(self._puzzle, self._board)
+        return [(person_id, row, col)
+                for person_id in range(1, self._n + 1)
+                for row, col in deducer.get_domain(person_id)]
+
+    def _init_counts(self, specs: List[ConstraintSpec]) -> None:
+        self._counts = {}
+        self._subject_classes = {
+            class_name:
+            frozenset(self._board.get_selected_subject_ids(subject_selector))
+            for class_name, subject_selector in SUBJECT_CLASSES.items()
+        }
+        room_count = len(self._puzzle.crime_scene.rooms) + 1
+        self._regions = {
+            'room': [
+                frozenset(self._board.get_coordinates_of_room(room_id))
+                for room_id in range(room_count)
+            ],
+            'row': [
+                frozenset(self._board.row_indexes(row))
+                for row in range(self._board.rows)
+            ],
+            'column': [
+                frozenset(self._board.col_indexes(col))
+                for col in range(self._board.columns)
+            ],
+        }
+        self._count_references = Counter()
+        if self._aggregate_counts:
+            for _, people_ids, space_indexes in specs:
+                self._count_references.update(
+                    self._get_count_keys(people_ids, space_indexes))
+
+    def _get_occupancies(
+            self, people_ids: List[int],
+            space_indexes: List[Tuple[int, int]]) -> List['IntVar']:
+        return [
+            self._occupancies[person_id, row, col]
+            for person_id in people_ids
+            for row, col in space_indexes
+            if (person_id, row, col) in self._occupancies
         ]
-                              for row in range(self._n)]
-                             for person_id in range(1, self._n + 1)]
-        self._row_indexes = lambda row: list(
-            zip(repeat(row, self._n), range(self._n)))
-        self._col_indexes = lambda col: list(
-            zip(range(self._n), repeat(col, self._n)))
-        self._set_uniqueness_constraints()
-        self._set_clues()
-
-    def _get_coordinates_of_room(self, room_id: int) -> List[Tuple[int, int]]:
-        return self._room_coordinates[room_id]
+
+    def _match_subject_class(self, people_ids: List[int]) -> Optional[str]:
+        if len(people_ids) < 2:
+            return None
+        people_ids = frozenset(people_ids)
+        differences = {
+            class_name: len(people_ids.symmetric_difference(class_ids))
+            for class_name, class_ids in self._subject_classes.items()
+            if class_ids
+        }
+        class_name = min(differences, key=differences.get)
+        if differences[class_name] >= len(people_ids):
+            return None
+        return class_name
+
+    def _match_regions(
+        self,
+        space_indexes: List[Tuple[int,
+                                  int]]) -> Optional[Tuple[str, List[int]]]:
+        cells = frozenset(space_indexes)
+        matches = []
+        for region_type, regions in self._regions.items():
+            region_indexes = [
+                region_index for region_index, region in enumerate(regions)
+                if region and region <= cells
+            ]
+            if sum(
+                    len(regions[region_index])
+                    for region_index in region_indexes) == len(cells):
+                matches.append((region_type, region_indexes))
+        if not cells or not matches:
+            return None
+        return min(matches, key=lambda match: len(match[1]))
+
+    def _get_count_keys(self, people_ids: List[int],
+                        space_indexes: List[Tuple[int, int]]) -> List[CountKey]:
+        class_name = self._match_subject_class(people_ids)
+        if class_name is None:
+            return []
+        regions = self._match_regions(space_indexes)
+        if regions is None:
+            return []
+        region_type, region_indexes = regions
+        return [(class_name, region_type, region_index)
+                for region_index in region_indexes]
+
+    def _get_count(self, key: CountKey) -> 'IntVar':
+        if key not in self._counts:
+            class_name, region_type, region_index = key
+            occupancies = self._get_occupancies(
+                sorted(self._subject_classes[class_name]),
+                sorted(self._regions[region_type][region_index]))
+            count = self._model.NewIntVar(
+                0, min(len(occupancies),
+                       len(self._subject_classes[class_name])),
+                f'{class_name} in {region_type} {region_index}')
+            if occupancies:
+                self._model.Add(count == sum(occupancies))
+            self._counts[key] = count
+        return self._counts[key]
+
+    def _get_region_total(self, key: CountKey) -> 'LinearExpr':
+        if self._count_references[key] > 1:
+            return self._get_count(key)
+        class_name, region_type, region_index = key
+        return sum(
+            self._get_occupancies(
+                sorted(self._subject_classes[class_name]),
+                sorted(self._regions[region_type][region_index])))
+
+    def _get_total(self, people_ids: List[int],
+                   space_indexes: List[Tuple[int, int]]) -> 'LinearExpr':
+        keys = self._get_count_keys(people_ids, space_indexes)
+        if any(self._count_references[key] > 1 for key in keys):
+            class_ids = self._subject_classes[keys[0][0]]
+            added = [
+                person_id for person_id in people_ids
+                if person_id not in class_ids
+            ]
+            removed = sorted(class_ids.difference(people_ids))
+            return sum(self._get_region_total(key) for key in keys) + sum(
+                self._get_occupancies(added, space_indexes)) - sum(
+                    self._get_occupancies(removed, space_indexes))
+        occupancies = self._get_occupancies(people_ids, space_indexes)
+        if not occupancies:
+            if self._zero is None:
+                self._zero = self._model.NewConstant(0)
+            occupancies.append(self._zero)
+        return sum(occupancies)
 
     def _add_constraint(self, constraint_function: Callable[[int], bool],
                         people_ids: List[int],
-                        space_indexes: List[Tuple[int, int]]) -> None:
+                        space_indexes: List[Tuple[int, int]]) -> 'Constraint':
         if self._debug:
             logging.debug('Constraint:\n' + self._constraint_repr(
                 constraint_function, people_ids, space_indexes))
-        self._model.Add(
-            constraint_function(
-                sum([
-                    self._occupancies[person_id - 1][row][col]
-                    for person_id in people_ids
-                    for row, col in space_indexes
-                ])))
+        return self._model.Add(
+            constraint_function(self._get_total(people_ids, space_indexes)))
 
     def _constraint_repr(self, constraint_function: Callable[[int], bool],
                          people_ids: List[int],
                          space_indexes: List[Tuple[int, int]]) -> str:
-        for i in range(self._n + 1):
-            if constraint_function(i):
-                if constraint_function(i + 1):
-                    constraint_repr = f'MIN_COUNT({i})'
-                else:
-                    constraint_repr = f'EXACT_COUNT({i})'
-                break
+        counts = [i for i in range(self._n + 2) if constraint_function(i)]
+        if len(counts) == 1:
+            constraint_repr = f'EXACT_COUNT({counts[0]})'
+        elif counts[-1] == self._n + 1:
+            constraint_repr = f'MIN_COUNT({counts[0]})'
+        else:
+            constraint_repr = f'MAX_COUNT({counts[-1]})'
         people_repr = '[' + ', '.join(
             [str(person_id) for person_id in people_ids]) + ']'
         spaces_repr = '[' + ', '.join([f'({r}, {c})' for r, c in space_indexes
                                       ]) + ']'
         return f'constraint: {constraint_repr}\npeople: {people_repr}\nspaces: {spaces_repr}'
 
-    def _set_uniqueness_constraints(self) -> None:
+    def _get_uniqueness_specs(self) -> List[ConstraintSpec]:
+        rows, columns = self._board.rows, self._board.columns
+        specs = []
         for person_id in range(1, self._n + 1):
             people_ids = [person_id]
-            space_indexes = list(product(range(self._n), repeat=2))
-            self._add_constraint(EXACT_COUNT(1), people_ids, space_indexes)
-        for row in range(self._n):
+            space_indexes = list(product(range(rows), range(columns)))
+            specs.append((EXACT_COUNT(1), people_ids, space_indexes))
+        row_count = EXACT_COUNT(1) if rows == self._n else MAX_COUNT(1)
+        for row in range(rows):
             people_ids = list(range(1, self._n + 1))
-            space_indexes = self._row_indexes(row)
-            self._add_constraint(EXACT_COUNT(1), people_ids, space_indexes)
-        for col in range(self._n):
+            space_indexes = self._board.row_indexes(row)
+            specs.append((row_count, people_ids, space_indexes))
+        col_count = EXACT_COUNT(1) if columns == self._n else MAX_COUNT(1)
+        for col in range(columns):
             people_ids = list(range(1, self._n + 1))
-            space_indexes = self._col_indexes(col)
-            self._add_constraint(EXACT_COUNT(1), people_ids, space_indexes)
-
-    def _set_clues(self) -> None:
-        for clue in self._puzzle.clues:
-            self._set_clue(clue)
+            space_indexes = self._board.col_indexes(col)
+            specs.append((col_count, people_ids, space_indexes))
+        return specs
+
+    def _get_clue_specs(self) -> List[Tuple[int, ConstraintSpec]]:
+        self._canonicalizer = None
+        if self._guard_clues:
+            clue_specs = []
+            for clue_index, clue in enumerate(self._puzzle.clues):
+                clue_spec = self._get_clue_spec(clue)
+                if clue_spec is not None:
+                    clue_specs.append((clue_index, clue_spec))
+            return clue_specs
+        self._canonicalizer = PuzzleClueCanonicalizer(self._puzzle, self._board)
+        return [
+            (clue.clue_indexes[0],
+             (EXACT_COUNT(clue.count) if clue.exact else MIN_COUNT(clue.count),
+              self._canonicalizer.get_people_ids(clue),
+              self._canonicalizer.get_space_indexes(clue)))
+            for clue in self._canonicalizer.clues
+        ]
 
-    def _set_clue(self, clue: Clue) -> None:
+    def _get_clue_spec(self, clue: Clue) -> Optional[ConstraintSpec]:
         constraint_function = self._get_constraint_function(clue)
-        people_ids = self._get_subject_ids(clue)
-        space_indexes = self._get_space_indexes(clue)
+        people_ids = self._board.get_subject_ids(clue)
+        space_indexes = self._board.get_space_indexes(clue)
         if people_ids and space_indexes:
-            self._add_constraint(constraint_function, people_ids, space_indexes)
+            return constraint_function, people_ids, space_indexes
+        return None
+
+    def _set_clues(self, clue_specs: List[Tuple[int, ConstraintSpec]]) -> None:
+        self._clue_literals = [None] * len(self._puzzle.clues)
+        if self._debug and self._canonicalizer is not None:
+            for line in self._canonicalizer.report():
+                logging.debug(f'Canonicalization: {line}')
+        for clue_index, spec in clue_specs:
+            constraint = self._add_constraint(*spec)
+            if self._guard_clues:
+                literal = self._model.NewBoolVar(f'clue {clue_index}')
+                constraint.OnlyEnforceIf(literal)
+                self._clue_literals[clue_index] = literal
+
+    def _get_symmetry_classes(
+            self, clue_specs: List[ConstraintSpec]) -> List[List[int]]:
+        memberships = {person.id: [] for person in self._puzzle.people}
+        for spec_index, (_, people_ids, _) in enumerate(clue_specs):
+            for person_id in people_ids:
+                memberships[person_id].append(spec_index)
+        domains = {person.id: [] for person in self._puzzle.people}
+        for person_id, row, col in self._occupancies:
+            domains[person_id].append((row, col))
+        signatures = {}
+        for person in sorted(self._puzzle.people, key=lambda person: person.id):
+            signature = (person.gender, person.role,
+                         tuple(memberships[person.id]),
+                         tuple(sorted(domains[person.id])))
+            signatures.setdefault(signature, []).append(person.id)
+        return [
+            person_ids for person_ids in signatures.values()
+            if len(person_ids) > 1
+        ]
+
+    def _get_position(self, person_id: int) -> 'LinearExpr':
+        columns = self._board.columns
+        return sum((row * columns + col) * occupancy
+                   for (occupancy_person_id, row,
+                        col), occupancy in self._occupancies.items()
+                   if occupancy_person_id == person_id)
+
+    def _set_symmetry_breaking_constraints(self) -> None:
+        for person_ids in self._symmetry_classes:
+            positions = [
+                self._get_position(person_id) for person_id in person_ids
+            ]
+            for position, next_position in zip(positions, positions[1:]):
+                self._model.Add(position + 1 <= next_position)
 
     def _get_constraint_function(self, clue: Clue) -> Callable[[int], bool]:
         if clue.HasField('exact_count'):
             return EXACT_COUNT(clue.exact_count)
         return MIN_COUNT(clue.min_count)
-
-    def _get_subject_ids(self, clue: Clue) -> List[int]:
-        subject_ids = set()
-        for subject_selector in clue.subject_selectors:
-            selected_subject_ids = self._get_selected_subject_ids(
-                subject_selector)
-            subject_ids.update(selected_subject_ids)
-        return sorted(list(subject_ids))
-
-    def _get_space_indexes(self, clue: Clue) -> List[Tuple[int, int]]:
-        space_indexes = set()
-        for position_selector in clue.position_selectors:
-            if position_selector.preposition == Preposition.IN_SAME_ROW_AS:
-                for row, furnuture in enumerate(self._rowwise_features):
-                    if (position_selector.feature
-                            in furnuture) != position_selector.negate:
-                        space_indexes.update(self._row_indexes(row))
-            elif position_selector.preposition == Preposition.IN_SAME_COLUMN_AS:
-                for column, furnuture in enumerate(self._columnwise_features):
-                    if (position_selector.feature
-                            in furnuture) != position_selector.negate:
-                        space_indexes.update(self._col_indexes(column))
-            elif position_selector.preposition == Preposition.IN_SAME_ROOM_AS:
-                for room_id, furnuture in enumerate(self._roomwise_features):
-                    if (position_selector.feature
-                            in furnuture) != position_selector.negate:
-                        space_indexes.update(self._room_coordinates[room_id])
-            else:
-                space_indexes.update(
-                    self._get_person_clue_coordinates(position_selector))
-        return sorted(list(space_indexes))
-
-    def _get_selected_subject_ids(
-            self, subject_selector: SubjectSelector) -> List[int]:
-        if subject_selector.person_id == 0:
-            person_id_filter = lambda person: True
-        else:
-            person_id_filter = lambda person: person.id == subject_selector.person_id
-        if subject_selector.role == Role.UNSPECIFIED_ROLE:
-            role_filter = lambda person: True
-        else:
-            role_filter = lambda person: person.role == subject_selector.role
-        if subject_selector.gender == Gender.UNSPECIFIED_GENDER:
-            gender_filter = lambda person: True
-        else:
-            gender_filter = lambda person: person.gender == subject_selector.gender
-        passes_filters = lambda person: person_id_filter(
-            person) and role_filter(person) and gender_filter(person)
-        return [
-            person.id
-            for person in self._puzzle.people
-            if passes_filters(person) != subject_selector.negate
-        ]
-
-    def _get_person_clue_coordinates(
-            self, position_selector: PositionSelector) -> List[Tuple[int, int]]:
-        if position_selector.preposition == Preposition.IN:
-            if position_selector.negate:
-                coordinates = []
-                for room_id, room_coordinates in enumerate(
-                        self._room_coordinates):
-                    if position_selector.room_id != room_id:
-                        coordinates.extend(room_coordinates)
-                return sorted(coordinates)
-            else:
-                return self._get_coordinates_of_room(position_selector.room_id)
-        else:
-            coordinates = []
-            for row, row_spaces in enumerate(self._spaces):
-                for column, space in enumerate(row_spaces):
-                    if self._evaluate_space_for_clue(space, position_selector):
-                        coordinates.append((row, column))
-            return coordinates
-
-    def _evaluate_space_for_clue(self, space: Space,
-                                 position_selector: PositionSelector) -> bool:
-        if position_selector.preposition == Preposition.BESIDE:
-            return (position_selector.feature
-                    in space.beside) != position_selector.negate
-        elif position_selector.preposition == Preposition.ON:
-            return (position_selector.feature
-                    == space.on) != position_selector.negate
-        raise AttributeError
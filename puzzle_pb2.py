@@ -20,7 +20,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\x0cpuzzle.proto\x12\x07\x66rances\"\x1a\n\x08IntArray\x12\x0e\n\x06values\x18\x01 \x03(\x05\")\n\nCoordinate\x12\x0b\n\x03row\x18\x01 \x01(\x05\x12\x0e\n\x06\x63olumn\x18\x02 \x01(\x05\" \n\x04Room\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\"\x99\x01\n\x11\x43rimeSceneFeature\x12,\n\x04type\x18\x01 \x01(\x0e\x32\x1e.frances.CrimeSceneFeatureType\x12,\n\rposition_type\x18\x02 \x01(\x0e\x32\x15.frances.PositionType\x12(\n\x0b\x63oordinates\x18\x03 \x03(\x0b\x32\x13.frances.Coordinate\"\x7f\n\nCrimeScene\x12\x1c\n\x05rooms\x18\x01 \x03(\x0b\x32\r.frances.Room\x12%\n\nfloor_plan\x18\x02 \x03(\x0b\x32\x11.frances.IntArray\x12,\n\x08\x66\x65\x61tures\x18\x03 \x03(\x0b\x32\x1a.frances.CrimeSceneFeature\"\x89\x01\n\x06Person\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x1f\n\x06gender\x18\x03 \x01(\x0e\x32\x0f.frances.Gender\x12\x1b\n\x04role\x18\x04 \x01(\x0e\x32\r.frances.Role\x12\'\n\ncoordinate\x18\x05 \x01(\x0b\x32\x13.frances.Coordinate\"r\n\x0fSubjectSelector\x12\x11\n\tperson_id\x18\x01 \x01(\x05\x12\x1b\n\x04role\x18\x02 \x01(\x0e\x32\r.frances.Role\x12\x1f\n\x06gender\x18\x03 \x01(\x0e\x32\x0f.frances.Gender\x12\x0e\n\x06negate\x18\x04 \x01(\x08\"\x9d\x01\n\x10PositionSelector\x12)\n\x0bpreposition\x18\x01 \x01(\x0e\x32\x14.frances.Preposition\x12\x11\n\x07room_id\x18\x02 \x01(\x05H\x00\x12\x31\n\x07\x66\x65\x61ture\x18\x03 \x01(\x0e\x32\x1e.frances.CrimeSceneFeatureTypeH\x00\x12\x0e\n\x06negate\x18\x04 \x01(\x08\x42\x08\n\x06object\"\xa7\x01\n\x04\x43lue\x12\x33\n\x11subject_selectors\x18\x01 \x03(\x0b\x32\x18.frances.SubjectSelector\x12\x35\n\x12position_selectors\x18\x02 \x03(\x0b\x32\x19.frances.PositionSelector\x12\x15\n\x0b\x65xact_count\x18\x03 \x01(\x05H\x00\x12\x13\n\tmin_count\x18\x04 \x01(\x05H\x00\x42\x07\n\x05\x63ount\"\x7f\n\x06Puzzle\x12\x0c\n\x04name\x18\x01 \x01(\t\x12(\n\x0b\x63rime_scene\x18\x02 \x01(\x0b\x32\x13.frances.CrimeScene\x12\x1f\n\x06people\x18\x03 \x03(\x0b\x32\x0f.frances.Person\x12\x1c\n\x05\x63lues\x18\x04 \x03(\x0b\x32\r.frances.Clue*w\n\x15\x43rimeSceneFeatureType\x12\x08\n\x04WALL\x10\x00\x12\n\n\x06\x43ORNER\x10\x01\x12\n\n\x06WINDOW\x10\x02\x12\t\n\x05\x43HAIR\x10\x03\x12\x07\n\x03\x42\x45\x44\x10\x04\x12\n\n\x06\x43\x41RPET\x10\x05\x12\t\n\x05PLANT\x10\x06\x12\x06\n\x02TV\x10\x07\x12\t\n\x05TABLE\x10\x08*g\n\x0cPositionType\x12\x14\n\x10OCCUPIABLE_SPACE\x10\x00\x12\x11\n\rBLOCKED_SPACE\x10\x01\x12\x15\n\x11VERTICAL_BOUNDARY\x10\x02\x12\x17\n\x13HORIZONTAL_BOUNDARY\x10\x03*6\n\x06Gender\x12\x16\n\x12UNSPECIFIED_GENDER\x10\x00\x12\n\n\x06\x46\x45MALE\x10\x01\x12\x08\n\x04MALE\x10\x02*C\n\x04Role\x12\x14\n\x10UNSPECIFIED_ROLE\x10\x00\x12\x0b\n\x07SUSPECT\x10\x01\x12\n\n\x06VICTIM\x10\x02\x12\x0c\n\x08MURDERER\x10\x03*i\n\x0bPreposition\x12\x06\n\x02IN\x10\x00\x12\x06\n\x02ON\x10\x01\x12\n\n\x06\x42\x45SIDE\x10\x02\x12\x13\n\x0fIN_SAME_ROOM_AS\x10\x03\x12\x12\n\x0eIN_SAME_ROW_AS\x10\x04\x12\x15\n\x11IN_SAME_COLUMN_AS\x10\x05\x62\x06proto3'
+  serialized_pb=b'\n\x0cpuzzle.proto\x12\x07\x66rances\"\x1a\n\x08IntArray\x12\x0e\n\x06values\x18\x01 \x03(\x05\")\n\nCoordinate\x12\x0b\n\x03row\x18\x01 \x01(\x05\x12\x0e\n\x06\x63olumn\x18\x02 \x01(\x05\" \n\x04Room\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\"\x99\x01\n\x11\x43rimeSceneFeature\x12,\n\x04type\x18\x01 \x01(\x0e\x32\x1e.frances.CrimeSceneFeatureType\x12,\n\rposition_type\x18\x02 \x01(\x0e\x32\x15.frances.PositionType\x12(\n\x0b\x63oordinates\x18\x03 \x03(\x0b\x32\x13.frances.Coordinate\"\x7f\n\nCrimeScene\x12\x1c\n\x05rooms\x18\x01 \x03(\x0b\x32\r.frances.Room\x12%\n\nfloor_plan\x18\x02 \x03(\x0b\x32\x11.frances.IntArray\x12,\n\x08\x66\x65\x61tures\x18\x03 \x03(\x0b\x32\x1a.frances.CrimeSceneFeature\"\x89\x01\n\x06Person\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x1f\n\x06gender\x18\x03 \x01(\x0e\x32\x0f.frances.Gender\x12\x1b\n\x04role\x18\x04 \x01(\x0e\x32\r.frances.Role\x12\'\n\ncoordinate\x18\x05 \x01(\x0b\x32\x13.frances.Coordinate\"r\n\x0fSubjectSelector\x12\x11\n\tperson_id\x18\x01 \x01(\x05\x12\x1b\n\x04role\x18\x02 \x01(\x0e\x32\r.frances.Role\x12\x1f\n\x06gender\x18\x03 \x01(\x0e\x32\x0f.frances.Gender\x12\x0e\n\x06negate\x18\x04 \x01(\x08\"\x9d\x01\n\x10PositionSelector\x12)\n\x0bpreposition\x18\x01 \x01(\x0e\x32\x14.frances.Preposition\x12\x11\n\x07room_id\x18\x02 \x01(\x05H\x00\x12\x31\n\x07\x66\x65\x61ture\x18\x03 \x01(\x0e\x32\x1e.frances.CrimeSceneFeatureTypeH\x00\x12\x0e\n\x06negate\x18\x04 \x01(\x08\x42\x08\n\x06object\"\xb5\x01\n\x04\x43lue\x12\x33\n\x11subject_selectors\x18\x01 \x03(\x0b\x32\x18.frances.SubjectSelector\x12\x35\n\x12position_selectors\x18\x02 \x03(\x0b\x32\x19.frances.PositionSelector\x12\x15\n\x0b\x65xact_count\x18\x03 \x01(\x05H\x00\x12\x13\n\tmin_count\x18\x04 \x01(\x05H\x00\x12\x0c\n\x04text\x18\x05 \x01(\tB\x07\n\x05\x63ount\"\x7f\n\x06Puzzle\x12\x0c\n\x04name\x18\x01 \x01(\t\x12(\n\x0b\x63rime_scene\x18\x02 \x01(\x0b\x32\x13.frances.CrimeScene\x12\x1f\n\x06people\x18\x03 \x03(\x0b\x32\x0f.frances.Person\x12\x1c\n\x05\x63lues\x18\x04 \x03(\x0b\x32\r.frances.Clue\"/\n\x0cSolveRequest\x12\x1f\n\x06puzzle\x18\x01 \x01(\x0b\x32\x0f.frances.Puzzle\"\x90\x01\n\rSolveResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x16\n\x0esolution_count\x18\x02 \x01(\x05\x12!\n\x08solution\x18\x03 \x01(\x0b\x32\x0f.frances.Puzzle\x12\x0f\n\x07verdict\x18\x04 \x01(\t\x12\x13\n\x0b\x66ingerprint\x18\x05 \x01(\t\x12\x0e\n\x06\x63\x61\x63hed\x18\x06 \x01(\x08\"q\n\x12UniquenessResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0e\n\x06unique\x18\x02 \x01(\x08\x12\x16\n\x0esolution_count\x18\x03 \x01(\x05\x12\x13\n\x0b\x66ingerprint\x18\x04 \x01(\t\x12\x0e\n\x06\x63\x61\x63hed\x18\x05 \x01(\x08\"m\n\rVerifyRequest\x12\x1f\n\x06puzzle\x18\x01 \x01(\x0b\x32\x0f.frances.Puzzle\x12&\n\tplacement\x18\x02 \x03(\x0b\x32\x13.frances.Coordinate\x12\x13\n\x0bmurderer_id\x18\x03 \x01(\x05\"\x1f\n\x0eVerifyResponse\x12\r\n\x05valid\x18\x01 \x01(\x08*w\n\x15\x43rimeSceneFeatureType\x12\x08\n\x04WALL\x10\x00\x12\n\n\x06\x43ORNER\x10\x01\x12\n\n\x06WINDOW\x10\x02\x12\t\n\x05\x43HAIR\x10\x03\x12\x07\n\x03\x42\x45\x44\x10\x04\x12\n\n\x06\x43\x41RPET\x10\x05\x12\t\n\x05PLANT\x10\x06\x12\x06\n\x02TV\x10\x07\x12\t\n\x05TABLE\x10\x08*g\n\x0cPositionType\x12\x14\n\x10OCCUPIABLE_SPACE\x10\x00\x12\x11\n\rBLOCKED_SPACE\x10\x01\x12\x15\n\x11VERTICAL_BOUNDARY\x10\x02\x12\x17\n\x13HORIZONTAL_BOUNDARY\x10\x03*6\n\x06Gender\x12\x16\n\x12UNSPECIFIED_GENDER\x10\x00\x12\n\n\x06\x46\x45MALE\x10\x01\x12\x08\n\x04MALE\x10\x02*C\n\x04Role\x12\x14\n\x10UNSPECIFIED_ROLE\x10\x00\x12\x0b\n\x07SUSPECT\x10\x01\x12\n\n\x06VICTIM\x10\x02\x12\x0c\n\x08MURDERER\x10\x03*i\n\x0bPreposition\x12\x06\n\x02IN\x10\x00\x12\x06\n\x02ON\x10\x01\x12\n\n\x06\x42\x45SIDE\x10\x02\x12\x13\n\x0fIN_SAME_ROOM_AS\x10\x03\x12\x12\n\x0eIN_SAME_ROW_AS\x10\x04\x12\x15\n\x11IN_SAME_COLUMN_AS\x10\x05\x32\x8a\x02\n\rPuzzleService\x12\x36\n\x05Solve\x12\x15.frances.SolveRequest\x1a\x16.frances.SolveResponse\x12\x45\n\x0f\x43heckUniqueness\x12\x15.frances.SolveRequest\x1a\x1b.frances.UniquenessResponse\x12\x39\n\x06Verify\x12\x16.frances.VerifyRequest\x1a\x17.frances.VerifyResponse\x12?\n\nSolveBatch\x12\x15.frances.SolveRequest\x1a\x16.frances.SolveResponse(\x01\x30\x01\x62\x06proto3'
 )
 
 _CRIMESCENEFEATURETYPE = _descriptor.EnumDescriptor(
@@ -78,8 +78,8 @@ _CRIMESCENEFEATURETYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=1130,
-  serialized_end=1249,
+  serialized_start=1599,
+  serialized_end=1718,
 )
 _sym_db.RegisterEnumDescriptor(_CRIMESCENEFEATURETYPE)
 
@@ -114,8 +114,8 @@ _POSITIONTYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=1251,
-  serialized_end=1354,
+  serialized_start=1720,
+  serialized_end=1823,
 )
 _sym_db.RegisterEnumDescriptor(_POSITIONTYPE)
 
@@ -145,8 +145,8 @@ _GENDER = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=1356,
-  serialized_end=1410,
+  serialized_start=1825,
+  serialized_end=1879,
 )
 _sym_db.RegisterEnumDescriptor(_GENDER)
 
@@ -181,8 +181,8 @@ _ROLE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=1412,
-  serialized_end=1479,
+  serialized_start=1881,
+  serialized_end=1948,
 )
 _sym_db.RegisterEnumDescriptor(_ROLE)
 
@@ -227,8 +227,8 @@ _PREPOSITION = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=1481,
-  serialized_end=1586,
+  serialized_start=1950,
+  serialized_end=2055,
 )
 _sym_db.RegisterEnumDescriptor(_PREPOSITION)
 
@@ -671,6 +671,13 @@ _CLUE = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='text', full_name='frances.Clue.text', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -689,7 +696,7 @@ _CLUE = _descriptor.Descriptor(
     fields=[]),
   ],
   serialized_start=832,
-  serialized_end=999,
+  serialized_end=1013,
 )
 
 
@@ -741,8 +748,245 @@ _PUZZLE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1001,
-  serialized_end=1128,
+  serialized_start=1015,
+  serialized_end=1142,
+)
+
+
+_SOLVEREQUEST = _descriptor.Descriptor(
+  name='SolveRequest',
+  full_name='frances.SolveRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='puzzle', full_name='frances.SolveRequest.puzzle', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1144,
+  serialized_end=1191,
+)
+
+
+_SOLVERESPONSE = _descriptor.Descriptor(
+  name='SolveResponse',
+  full_name='frances.SolveResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='status', full_name='frances.SolveResponse.status', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='solution_count', full_name='frances.SolveResponse.solution_count', index=1,
+      number=2, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='solution', full_name='frances.SolveResponse.solution', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='verdict', full_name='frances.SolveResponse.verdict', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='fingerprint', full_name='frances.SolveResponse.fingerprint', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='cached', full_name='frances.SolveResponse.cached', index=5,
+      number=6, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1194,
+  serialized_end=1338,
+)
+
+
+_UNIQUENESSRESPONSE = _descriptor.Descriptor(
+  name='UniquenessResponse',
+  full_name='frances.UniquenessResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='status', full_name='frances.UniquenessResponse.status', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='unique', full_name='frances.UniquenessResponse.unique', index=1,
+      number=2, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='solution_count', full_name='frances.UniquenessResponse.solution_count', index=2,
+      number=3, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='fingerprint', full_name='frances.UniquenessResponse.fingerprint', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='cached', full_name='frances.UniquenessResponse.cached', index=4,
+      number=5, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1340,
+  serialized_end=1453,
+)
+
+
+_VERIFYREQUEST = _descriptor.Descriptor(
+  name='VerifyRequest',
+  full_name='frances.VerifyRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='puzzle', full_name='frances.VerifyRequest.puzzle', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='placement', full_name='frances.VerifyRequest.placement', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='murderer_id', full_name='frances.VerifyRequest.murderer_id', index=2,
+      number=3, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1455,
+  serialized_end=1564,
+)
+
+
+_VERIFYRESPONSE = _descriptor.Descriptor(
+  name='VerifyResponse',
+  full_name='frances.VerifyResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='valid', full_name='frances.VerifyResponse.valid', index=0,
+      number=1, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1566,
+  serialized_end=1597,
 )
 
 _CRIMESCENEFEATURE.fields_by_name['type'].enum_type = _CRIMESCENEFEATURETYPE
@@ -775,6 +1019,10 @@ _CLUE.fields_by_name['min_count'].containing_oneof = _CLUE.oneofs_by_name['count
 _PUZZLE.fields_by_name['crime_scene'].message_type = _CRIMESCENE
 _PUZZLE.fields_by_name['people'].message_type = _PERSON
 _PUZZLE.fields_by_name['clues'].message_type = _CLUE
+_SOLVEREQUEST.fields_by_name['puzzle'].message_type = _PUZZLE
+_SOLVERESPONSE.fields_by_name['solution'].message_type = _PUZZLE
+_VERIFYREQUEST.fields_by_name['puzzle'].message_type = _PUZZLE
+_VERIFYREQUEST.fields_by_name['placement'].message_type = _COORDINATE
 DESCRIPTOR.message_types_by_name['IntArray'] = _INTARRAY
 DESCRIPTOR.message_types_by_name['Coordinate'] = _COORDINATE
 DESCRIPTOR.message_types_by_name['Room'] = _ROOM
@@ -785,6 +1033,11 @@ DESCRIPTOR.message_types_by_name['SubjectSelector'] = _SUBJECTSELECTOR
 DESCRIPTOR.message_types_by_name['PositionSelector'] = _POSITIONSELECTOR
 DESCRIPTOR.message_types_by_name['Clue'] = _CLUE
 DESCRIPTOR.message_types_by_name['Puzzle'] = _PUZZLE
+DESCRIPTOR.message_types_by_name['SolveRequest'] = _SOLVEREQUEST
+DESCRIPTOR.message_types_by_name['SolveResponse'] = _SOLVERESPONSE
+DESCRIPTOR.message_types_by_name['UniquenessResponse'] = _UNIQUENESSRESPONSE
+DESCRIPTOR.message_types_by_name['VerifyRequest'] = _VERIFYREQUEST
+DESCRIPTOR.message_types_by_name['VerifyResponse'] = _VERIFYRESPONSE
 DESCRIPTOR.enum_types_by_name['CrimeSceneFeatureType'] = _CRIMESCENEFEATURETYPE
 DESCRIPTOR.enum_types_by_name['PositionType'] = _POSITIONTYPE
 DESCRIPTOR.enum_types_by_name['Gender'] = _GENDER
@@ -862,5 +1115,96 @@ Puzzle = _reflection.GeneratedProtocolMessageType('Puzzle', (_message.Message,),
   })
 _sym_db.RegisterMessage(Puzzle)
 
+SolveRequest = _reflection.GeneratedProtocolMessageType('SolveRequest', (_message.Message,), {
+  'DESCRIPTOR' : _SOLVEREQUEST,
+  '__module__' : 'puzzle_pb2'
+  # @@protoc_insertion_point(class_scope:frances.SolveRequest)
+  })
+_sym_db.RegisterMessage(SolveRequest)
+
+SolveResponse = _reflection.GeneratedProtocolMessageType('SolveResponse', (_message.Message,), {
+  'DESCRIPTOR' : _SOLVERESPONSE,
+  '__module__' : 'puzzle_pb2'
+  # @@protoc_insertion_point(class_scope:frances.SolveResponse)
+  })
+_sym_db.RegisterMessage(SolveResponse)
+
+UniquenessResponse = _reflection.GeneratedProtocolMessageType('UniquenessResponse', (_message.Message,), {
+  'DESCRIPTOR' : _UNIQUENESSRESPONSE,
+  '__module__' : 'puzzle_pb2'
+  # @@protoc_insertion_point(class_scope:frances.UniquenessResponse)
+  })
+_sym_db.RegisterMessage(UniquenessResponse)
+
+VerifyRequest = _reflection.GeneratedProtocolMessageType('VerifyRequest', (_message.Message,), {
+  'DESCRIPTOR' : _VERIFYREQUEST,
+  '__module__' : 'puzzle_pb2'
+  # @@protoc_insertion_point(class_scope:frances.VerifyRequest)
+  })
+_sym_db.RegisterMessage(VerifyRequest)
+
+VerifyResponse = _reflection.GeneratedProtocolMessageType('VerifyResponse', (_message.Message,), {
+  'DESCRIPTOR' : _VERIFYRESPONSE,
+  '__module__' : 'puzzle_pb2'
+  # @@protoc_insertion_point(class_scope:frances.VerifyResponse)
+  })
+_sym_db.RegisterMessage(VerifyResponse)
+
+
+
+_PUZZLESERVICE = _descriptor.ServiceDescriptor(
+  name='PuzzleService',
+  full_name='frances.PuzzleService',
+  file=DESCRIPTOR,
+  index=0,
+  serialized_options=None,
+  create_key=_descriptor._internal_create_key,
+  serialized_start=2058,
+  serialized_end=2324,
+  methods=[
+  _descriptor.MethodDescriptor(
+    name='Solve',
+    full_name='frances.PuzzleService.Solve',
+    index=0,
+    containing_service=None,
+    input_type=_SOLVEREQUEST,
+    output_type=_SOLVERESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='CheckUniqueness',
+    full_name='frances.PuzzleService.CheckUniqueness',
+    index=1,
+    containing_service=None,
+    input_type=_SOLVEREQUEST,
+    output_type=_UNIQUENESSRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='Verify',
+    full_name='frances.PuzzleService.Verify',
+    index=2,
+    containing_service=None,
+    input_type=_VERIFYREQUEST,
+    output_type=_VERIFYRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='SolveBatch',
+    full_name='frances.PuzzleService.SolveBatch',
+    index=3,
+    containing_service=None,
+    input_type=_SOLVEREQUEST,
+    output_type=_SOLVERESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+])
+_sym_db.RegisterServiceDescriptor(_PUZZLESERVICE)
+
+DESCRIPTOR.services_by_name['PuzzleService'] = _PUZZLESERVICE
 
 # @@protoc_insertion_point(module_scope)
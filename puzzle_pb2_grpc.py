@@ -0,0 +1,165 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+import puzzle_pb2 as puzzle__pb2
+
+
+class PuzzleServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Solve = channel.unary_unary(
+                '/frances.PuzzleService/Solve',
+                request_serializer=puzzle__pb2.SolveRequest.SerializeToString,
+                response_deserializer=puzzle__pb2.SolveResponse.FromString,
+                )
+        self.CheckUniqueness = channel.unary_unary(
+                '/frances.PuzzleService/CheckUniqueness',
+                request_serializer=puzzle__pb2.SolveRequest.SerializeToString,
+                response_deserializer=puzzle__pb2.UniquenessResponse.FromString,
+                )
+        self.Verify = channel.unary_unary(
+                '/frances.PuzzleService/Verify',
+                request_serializer=puzzle__pb2.VerifyRequest.SerializeToString,
+                response_deserializer=puzzle__pb2.VerifyResponse.FromString,
+                )
+        self.SolveBatch = channel.stream_stream(
+                '/frances.PuzzleService/SolveBatch',
+                request_serializer=puzzle__pb2.SolveRequest.SerializeToString,
+                response_deserializer=puzzle__pb2.SolveResponse.FromString,
+                )
+
+
+class PuzzleServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def Solve(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CheckUniqueness(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Verify(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SolveBatch(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_PuzzleServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Solve': grpc.unary_unary_rpc_method_handler(
+                    servicer.Solve,
+                    request_deserializer=puzzle__pb2.SolveRequest.FromString,
+                    response_serializer=puzzle__pb2.SolveResponse.SerializeToString,
+            ),
+            'CheckUniqueness': grpc.unary_unary_rpc_method_handler(
+                    servicer.CheckUniqueness,
+                    request_deserializer=puzzle__pb2.SolveRequest.FromString,
+                    response_serializer=puzzle__pb2.UniquenessResponse.SerializeToString,
+            ),
+            'Verify': grpc.unary_unary_rpc_method_handler(
+                    servicer.Verify,
+                    request_deserializer=puzzle__pb2.VerifyRequest.FromString,
+                    response_serializer=puzzle__pb2.VerifyResponse.SerializeToString,
+            ),
+            'SolveBatch': grpc.stream_stream_rpc_method_handler(
+                    servicer.SolveBatch,
+                    request_deserializer=puzzle__pb2.SolveRequest.FromString,
+                    response_serializer=puzzle__pb2.SolveResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'frances.PuzzleService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class PuzzleService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def Solve(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/frances.PuzzleService/Solve',
+            puzzle__pb2.SolveRequest.SerializeToString,
+            puzzle__pb2.SolveResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def CheckUniqueness(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/frances.PuzzleService/CheckUniqueness',
+            puzzle__pb2.SolveRequest.SerializeToString,
+            puzzle__pb2.UniquenessResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Verify(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/frances.PuzzleService/Verify',
+            puzzle__pb2.VerifyRequest.SerializeToString,
+            puzzle__pb2.VerifyResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SolveBatch(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/frances.PuzzleService/SolveBatch',
+            puzzle__pb2.SolveRequest.SerializeToString,
+            puzzle__pb2.SolveResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -0,0 +1,226 @@
+import argparse
+import importlib
+import json
+import logging
+import multiprocessing
+import time
+
+from collections import Counter, namedtuple
+from queue import Empty
+
+from puzzle_corpus import get_fingerprint
+from puzzle_pb2 import Puzzle
+from typing import Dict, Optional, Sequence, Tuple
+
+PROPAGATION_BACKEND = 'propagation'
+DP_BACKEND = 'dp'
+CP_SAT_BACKEND = 'cp_sat'
+
+DEFINITIVE_STATUSES = ('OPTIMAL', 'INFEASIBLE')
+
+BACKEND_MODULES = (
+    'puzzle_batch_solver',
+    'puzzle_dp_counter',
+    'puzzle_solution_counter',
+    'puzzle_solver',
+)
+
+PortfolioConfiguration = namedtuple('PortfolioConfiguration',
+                                    ['name', 'backend', 'options'])
+
+PortfolioResult = namedtuple(
+    'PortfolioResult',
+    ['configuration', 'status', 'solution_count', 'verdict', 'elapsed'])
+
+DEFAULT_CONFIGURATIONS = (
+    PortfolioConfiguration('propagation', PROPAGATION_BACKEND, {}),
+    PortfolioConfiguration('dp', DP_BACKEND, {}),
+    PortfolioConfiguration('cp_sat', CP_SAT_BACKEND, {}),
+    PortfolioConfiguration('cp_sat_plain', CP_SAT_BACKEND, {
+        'prune_clues': False,
+        'aggregate_counts': False,
+        'break_symmetries': False,
+    }),
+    PortfolioConfiguration('cp_sat_no_linearization', CP_SAT_BACKEND,
+                           {'solver_parameters': {
+                               'linearization_level': 0
+                           }}),
+)
+
+Answer = Tuple[str, int, Optional[str]]
+
+
+def _solve_by_propagation(puzzle: Puzzle, options: Dict) -> Answer:
+    from puzzle_batch_solver import deduce_placements
+    from puzzle_board import PuzzleBoard
+    from puzzle_solver import format_verdict, get_murder
+    board = PuzzleBoard(puzzle)
+    status, placements = deduce_placements(puzzle, board)
+    if placements is None:
+        return status, 0, None
+    victim_id, murderer_id, murder_room_id = get_murder(puzzle, board,
+                                                        placements)
+    return status, 1, format_verdict(puzzle, murderer_id, victim_id,
+                                     murder_room_id)
+
+
+def _count_by_dp(puzzle: Puzzle, options: Dict) -> Answer:
+    from puzzle_batch_solver import PuzzleBatchSolver
+    from puzzle_dp_counter import MAX_PEOPLE, PuzzleDpCounter
+    from puzzle_solver import format_verdict
+    if len(puzzle.people) > MAX_PEOPLE:
+        return 'UNKNOWN', 0, None
+    solution_count = PuzzleDpCounter(puzzle).count()
+    if not solution_count:
+        return 'INFEASIBLE', 0, None
+    result = PuzzleBatchSolver([puzzle]).solve()[0]
+    if result.placements is None:
+        return 'UNKNOWN', solution_count, None
+    return 'OPTIMAL', solution_count, format_verdict(puzzle, result.murderer_id,
+                                                     result.victim_id,
+                                                     result.murder_room_id)
+
+
+def _solve_with_cp_sat(puzzle: Puzzle, options: Dict) -> Answer:
+    from puzzle_solver import PuzzleSolver
+    solver = PuzzleSolver(puzzle, **options)
+    status, solution_count = solver.solve()
+    verdict = None
+    if status == 'OPTIMAL' and solution_count > 0:
+        verdict = solver.verdict()
+    return status, solution_count, verdict
+
+
+BACKENDS = {
+    PROPAGATION_BACKEND: _solve_by_propagation,
+    DP_BACKEND: _count_by_dp,
+    CP_SAT_BACKEND: _solve_with_cp_sat,
+}
+
+
+def _run_configuration(configuration: PortfolioConfiguration, data: bytes,
+                       results: multiprocessing.Queue) -> None:
+    puzzle = Puzzle()
+    puzzle.ParseFromString(data)
+    start = time.perf_counter()
+    try:
+        status, solution_count, verdict = BACKENDS[configuration.backend](
+            puzzle, configuration.options)
+    except Exception as error:
+        results.put((configuration.name, None, f'{type(error).__name__}: '
+                     f'{error}', time.perf_counter() - start))
+        return
+    results.put((configuration.name, (status, solution_count, verdict), None,
+                 time.perf_counter() - start))
+
+
+class PuzzlePortfolioSolver:
+
+    def __init__(self,
+                 configurations: Sequence[
+                     PortfolioConfiguration] = DEFAULT_CONFIGURATIONS,
+                 timeout: Optional[float] = None,
+                 record_path: Optional[str] = None) -> None:
+        self._configurations = list(configurations)
+        self._timeout = timeout
+        self._record_path = record_path
+        self._context = multiprocessing.get_context()
+        for module in BACKEND_MODULES:
+            importlib.import_module(module)
+
+    def solve(self, puzzle: Puzzle) -> PortfolioResult:
+        start = time.perf_counter()
+        data = puzzle.SerializeToString()
+        results = self._context.Queue()
+        processes = [
+            self._context.Process(target=_run_configuration,
+                                  args=(configuration, data, results),
+                                  daemon=True)
+            for configuration in self._configurations
+        ]
+        for process in processes:
+            process.start()
+        try:
+            result = self._wait(results, len(processes), start)
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join()
+            results.close()
+        if self._record_path is not None:
+            self._record(puzzle, result, time.perf_counter() - start)
+        return result
+
+    def _wait(self, results: multiprocessing.Queue, pending: int,
+              start: float) -> PortfolioResult:
+        fallback = PortfolioResult(configuration=None,
+                                   status='UNKNOWN',
+                                   solution_count=0,
+                                   verdict=None,
+                                   elapsed=None)
+        while pending:
+            timeout = None
+            if self._timeout is not None:
+                timeout = max(0, self._timeout - (time.perf_counter() - start))
+            try:
+                name, answer, error, elapsed = results.get(timeout=timeout)
+            except Empty:
+                break
+            pending -= 1
+            if answer is None:
+                logging.warning(f'Portfolio configuration {name} failed: '
+                                f'{error}')
+                continue
+            status, solution_count, verdict = answer
+            logging.debug(f'Portfolio configuration {name} answered {status} '
+                          f'in {elapsed:.3f}s')
+            if status in DEFINITIVE_STATUSES:
+                return PortfolioResult(configuration=name,
+                                       status=status,
+                                       solution_count=solution_count,
+                                       verdict=verdict,
+                                       elapsed=elapsed)
+        return fallback
+
+    def _record(self, puzzle: Puzzle, result: PortfolioResult,
+                wall_time: float) -> None:
+        record = {
+            'fingerprint': get_fingerprint(puzzle),
+            'name': puzzle.name,
+            'people': len(puzzle.people),
+            'clues': len(puzzle.clues),
+            'winner': result.configuration,
+            'status': result.status,
+            'solution_count': result.solution_count,
+            'elapsed': result.elapsed,
+            'wall_time': wall_time,
+        }
+        with open(self._record_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+def summarize_records(path: str) -> Dict[str, int]:
+    with open(path, encoding='utf-8') as f:
+        return dict(Counter(json.loads(line)['winner'] for line in f))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Solve puzzles by racing several solver configurations.')
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--timeout', type=float, default=None)
+    parser.add_argument('--record', default=None)
+    args = parser.parse_args()
+    portfolio_solver = PuzzlePortfolioSolver(timeout=args.timeout,
+                                             record_path=args.record)
+    for path in args.paths:
+        puzzle = Puzzle()
+        with open(path, 'rb') as f:
+            puzzle.ParseFromString(f.read())
+        result = portfolio_solver.solve(puzzle)
+        print(f'{path}: {result.status} {result.solution_count} '
+              f'by {result.configuration} {result.verdict or ""}')
+    if args.record is not None:
+        print(summarize_records(args.record))
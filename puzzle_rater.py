@@ -0,0 +1,150 @@
+import argparse
+import json
+import math
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from puzzle_corpus import iter_serialized_puzzles, map_bounded
+from puzzle_deducer import CLUE_LAYER, COUNTING_LAYER, Contradiction, EXCLUSIVITY_LAYER, PuzzleDeducer, TRIAL_LAYER
+from puzzle_modeler import PuzzleModeler
+from puzzle_pb2 import Puzzle
+from typing import Dict, Iterator, List, Optional
+
+LAYER_WEIGHTS = {
+    CLUE_LAYER: 1.0,
+    EXCLUSIVITY_LAYER: 2.0,
+    COUNTING_LAYER: 4.0,
+    TRIAL_LAYER: 10.0,
+}
+
+TRIAL_DEPTH_WEIGHT = 25.0
+UNSOLVED_WEIGHT = 100.0
+BRANCHES_WEIGHT = 1.0
+CONFLICTS_WEIGHT = 2.0
+
+
+@dataclass
+class DifficultyRating:
+
+    rating: float
+    breakdown: Dict[str, float]
+
+
+class PuzzleRater:
+
+    def __init__(self,
+                 puzzle: Puzzle,
+                 max_trial_depth: int = 2,
+                 max_trials: int = 1000,
+                 use_search_stats: bool = True) -> None:
+        self._puzzle = puzzle
+        self._max_trial_depth = max_trial_depth
+        self._max_trials = max_trials
+        self._use_search_stats = use_search_stats
+
+    def rate(self) -> DifficultyRating:
+        breakdown = {}
+        deducer = PuzzleDeducer(self._puzzle)
+        deducer.propagate()
+        trial_depth = 0
+        self._trials = 0
+        while not deducer.is_solved() and trial_depth < self._max_trial_depth:
+            trial_depth += 1
+            self._apply_trials(deducer, trial_depth)
+        for layer, count in deducer.layer_counts.items():
+            breakdown[f'{layer}_deductions'] = count
+        breakdown['trials'] = self._trials
+        breakdown['trial_depth'] = trial_depth if self._trials else 0
+        breakdown['solved_by_deduction'] = int(deducer.is_solved())
+        if self._use_search_stats:
+            breakdown.update(self._get_search_stats())
+        return DifficultyRating(rating=self._get_rating(breakdown),
+                                breakdown=breakdown)
+
+    def _apply_trials(self, deducer: PuzzleDeducer, depth: int) -> None:
+        progress = True
+        while progress and not deducer.is_solved():
+            progress = False
+            for person_id, row, column in deducer.get_unresolved_candidates():
+                if self._trials >= self._max_trials:
+                    return
+                self._trials += 1
+                if self._refutes(deducer, person_id, row, column, depth):
+                    deducer.eliminate(person_id, row, column)
+                    deducer.propagate()
+                    progress = True
+                    break
+
+    def _refutes(self, deducer: PuzzleDeducer, person_id: int, row: int,
+                 column: int, depth: int) -> bool:
+        trial = deducer.copy()
+        try:
+            trial.assume(person_id, row, column)
+            trial.propagate()
+            if depth > 1:
+                self._apply_trials(trial, depth - 1)
+        except Contradiction:
+            return True
+        return False
+
+    def _get_search_stats(self) -> Dict[str, float]:
+        from ortools.sat.python.cp_model import CpSolver
+        modeler = PuzzleModeler(self._puzzle, prune_clues=False)
+        solver = CpSolver()
+        solver.parameters.num_search_workers = 1
+        solver.Solve(modeler.model)
+        return {
+            'branches': solver.NumBranches(),
+            'conflicts': solver.NumConflicts(),
+            'wall_time': solver.WallTime(),
+        }
+
+    def _get_rating(self, breakdown: Dict[str, float]) -> float:
+        rating = sum(weight * breakdown[f'{layer}_deductions']
+                     for layer, weight in LAYER_WEIGHTS.items())
+        rating += TRIAL_DEPTH_WEIGHT * breakdown['trial_depth']
+        if not breakdown['solved_by_deduction']:
+            rating += UNSOLVED_WEIGHT
+        if self._use_search_stats:
+            rating += BRANCHES_WEIGHT * math.log2(1 + breakdown['branches'])
+            rating += CONFLICTS_WEIGHT * math.log2(1 + breakdown['conflicts'])
+        return rating
+
+
+def _rate_serialized(data: bytes) -> dict:
+    puzzle = Puzzle()
+    puzzle.ParseFromString(data)
+    try:
+        difficulty = PuzzleRater(puzzle).rate()
+    except Contradiction as error:
+        return {'name': puzzle.name, 'error': str(error)}
+    return {
+        'name': puzzle.name,
+        'rating': difficulty.rating,
+        'breakdown': difficulty.breakdown,
+    }
+
+
+def rate_corpus(paths: List[str],
+                max_workers: Optional[int] = None,
+                chunksize: int = 16) -> Iterator[dict]:
+    serialized_puzzles = (
+        data for path in paths for data in iter_serialized_puzzles(path))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from map_bounded(executor,
+                               _rate_serialized,
+                               serialized_puzzles,
+                               chunksize=chunksize)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Rate the difficulty of serialized puzzles.')
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=16)
+    args = parser.parse_args()
+    for result in rate_corpus(args.paths, args.workers, args.chunksize):
+        sys.stdout.write(json.dumps(result) + '\n')
@@ -0,0 +1,226 @@
+import argparse
+import numpy as np
+import os
+import re
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from html import escape
+
+from puzzle_corpus import iter_serialized_puzzles, map_bounded
+from puzzle_pb2 import CrimeSceneFeatureType, PositionType, Puzzle
+from puzzle_visualizer import FURNITURE_COLORS, PuzzleVisualizer, get_wall_boundaries
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+
+FORMAT_SUFFIXES = {
+    'ansi': '.ansi',
+    'text': '.txt',
+    'svg': '.svg',
+}
+
+ANSI_ESCAPE_PATTERN = re.compile('\x1b\\[[0-9;]*m')
+
+SVG_COLORS = {
+    'black': '#000000',
+    'red': '#cd3131',
+    'green': '#0dbc79',
+    'yellow': '#e5e510',
+    'blue': '#2472c8',
+    'magenta': '#bc3fbc',
+    'cyan': '#11a8cd',
+    'grey': '#a0a0a0',
+}
+
+SVG_WINDOW_COLOR = '#4aa3df'
+
+
+def strip_ansi(text: str) -> str:
+    return ANSI_ESCAPE_PATTERN.sub('', text)
+
+
+def get_placements(puzzle: Puzzle) -> List[Tuple[str, int, int]]:
+    return [(person.name, person.coordinate.row, person.coordinate.column)
+            for person in puzzle.people
+            if person.HasField('coordinate')]
+
+
+class PuzzleSvgWriter:
+
+    def __init__(self, puzzle: Puzzle, cell_size: int = 40) -> None:
+        self._puzzle = puzzle
+        self._crime_scene = puzzle.crime_scene
+        self._cell_size = cell_size
+        self._rows = len(self._crime_scene.floor_plan)
+        self._columns = len(self._crime_scene.floor_plan[0].values)
+        self._margin = cell_size // 2
+
+    def write(self, f: TextIO) -> None:
+        width = self._columns * self._cell_size + 2 * self._margin
+        height = self._rows * self._cell_size + 2 * self._margin
+        legend_height = self._cell_size
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" '
+                f'width="{width}" height="{height + legend_height}" '
+                f'font-family="monospace" '
+                f'font-size="{self._cell_size // 2}">\n')
+        f.write(f'<rect width="{width}" height="{height + legend_height}" '
+                'fill="white"/>\n')
+        self._write_furniture(f)
+        self._write_walls(f)
+        self._write_windows(f)
+        self._write_people(f)
+        self._write_legend(f, height)
+        f.write('</svg>\n')
+
+    def _x(self, column: float) -> float:
+        return self._margin + column * self._cell_size
+
+    def _y(self, row: float) -> float:
+        return self._margin + row * self._cell_size
+
+    def _write_line(self, f: TextIO, x1: float, y1: float, x2: float, y2: float,
+                    color: str, width: int) -> None:
+        f.write(f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" '
+                f'stroke="{color}" stroke-width="{width}" '
+                'stroke-linecap="square"/>\n')
+
+    def _write_rect(self, f: TextIO, x: float, y: float, width: float,
+                    height: float, color: str) -> None:
+        f.write(f'<rect x="{x}" y="{y}" width="{width}" height="{height}" '
+                f'fill="{color}"/>\n')
+
+    def _write_furniture(self, f: TextIO) -> None:
+        inset = self._cell_size // 8
+        inner = self._cell_size - 2 * inset
+        for feature in self._crime_scene.features:
+            if feature.type not in FURNITURE_COLORS:
+                continue
+            color = SVG_COLORS[FURNITURE_COLORS[feature.type]]
+            for coordinate in feature.coordinates:
+                self._write_rect(f,
+                                 self._x(coordinate.column) + inset,
+                                 self._y(coordinate.row) + inset, inner, inner,
+                                 color)
+            for coordinate_1, coordinate_2 in zip(feature.coordinates[:-1],
+                                                  feature.coordinates[1:]):
+                top = min(coordinate_1.row, coordinate_2.row)
+                left = min(coordinate_1.column, coordinate_2.column)
+                bottom = max(coordinate_1.row, coordinate_2.row)
+                right = max(coordinate_1.column, coordinate_2.column)
+                if bottom - top + right - left != 1:
+                    continue
+                self._write_rect(
+                    f,
+                    self._x(left) + inset,
+                    self._y(top) + inset,
+                    (right - left + 1) * self._cell_size - 2 * inset,
+                    (bottom - top + 1) * self._cell_size - 2 * inset, color)
+
+    def _write_walls(self, f: TextIO) -> None:
+        width = max(2, self._cell_size // 10)
+        vertical_walls, horizontal_walls = get_wall_boundaries(
+            self._crime_scene)
+        for r, c in zip(*np.nonzero(vertical_walls)):
+            self._write_line(f, self._x(c), self._y(r), self._x(c),
+                             self._y(r + 1), 'black', width)
+        for r, c in zip(*np.nonzero(horizontal_walls)):
+            self._write_line(f, self._x(c), self._y(r), self._x(c + 1),
+                             self._y(r), 'black', width)
+
+    def _write_windows(self, f: TextIO) -> None:
+        width = max(4, self._cell_size // 6)
+        for feature in self._crime_scene.features:
+            if feature.type != CrimeSceneFeatureType.WINDOW:
+                continue
+            for coordinate in feature.coordinates:
+                if feature.position_type == PositionType.VERTICAL_BOUNDARY:
+                    x = self._x(coordinate.column)
+                    self._write_line(f, x, self._y(coordinate.row), x,
+                                     self._y(coordinate.row + 1),
+                                     SVG_WINDOW_COLOR, width)
+                elif feature.position_type == PositionType.HORIZONTAL_BOUNDARY:
+                    y = self._y(coordinate.row)
+                    self._write_line(f, self._x(coordinate.column), y,
+                                     self._x(coordinate.column + 1), y,
+                                     SVG_WINDOW_COLOR, width)
+
+    def _write_people(self, f: TextIO) -> None:
+        for name, row, column in get_placements(self._puzzle):
+            f.write(f'<text x="{self._x(column + 0.5)}" '
+                    f'y="{self._y(row + 0.5)}" text-anchor="middle" '
+                    f'dominant-baseline="central">{escape(name[0])}</text>\n')
+
+    def _write_legend(self, f: TextIO, height: int) -> None:
+        x = self._margin
+        y = height
+        box = self._cell_size // 2
+        for feature_type, color in FURNITURE_COLORS.items():
+            label = CrimeSceneFeatureType.Name(feature_type).capitalize()
+            self._write_rect(f, x, y, box, box, SVG_COLORS[color])
+            f.write(f'<text x="{x + box + 4}" y="{y + box / 2}" '
+                    f'dominant-baseline="central">{label}</text>\n')
+            x += box + 4 + (len(label) + 1) * self._cell_size // 4
+
+
+def _get_output_stem(index: int, puzzle: Puzzle) -> str:
+    slug = re.sub('[^a-z0-9]+', '_', puzzle.name.lower()).strip('_')
+    return f'{index:06d}_{slug}' if slug else f'{index:06d}'
+
+
+def render_puzzle(puzzle: Puzzle, output_dir: str, stem: str,
+                  formats: Iterable[str]) -> List[str]:
+    paths = []
+    visualization = None
+    for output_format in formats:
+        path = os.path.join(output_dir, stem + FORMAT_SUFFIXES[output_format])
+        with open(path, 'w', encoding='utf-8') as f:
+            if output_format == 'svg':
+                PuzzleSvgWriter(puzzle).write(f)
+            else:
+                if visualization is None:
+                    visualization = PuzzleVisualizer(puzzle).visualization
+                f.write(visualization if output_format ==
+                        'ansi' else strip_ansi(visualization))
+                f.write('\n')
+        paths.append(path)
+    return paths
+
+
+def _render_serialized(output_dir: str, formats: Tuple[str],
+                       item: Tuple[int, bytes]) -> List[str]:
+    index, data = item
+    puzzle = Puzzle()
+    puzzle.ParseFromString(data)
+    return render_puzzle(puzzle, output_dir, _get_output_stem(index, puzzle),
+                         formats)
+
+
+def render_corpus(paths: List[str],
+                  output_dir: str,
+                  formats: Iterable[str] = tuple(FORMAT_SUFFIXES.keys()),
+                  max_workers: Optional[int] = None,
+                  chunksize: int = 16) -> Iterator[List[str]]:
+    os.makedirs(output_dir, exist_ok=True)
+    items = enumerate(
+        data for path in paths for data in iter_serialized_puzzles(path))
+    render = partial(_render_serialized, output_dir, tuple(formats))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from map_bounded(executor, render, items, chunksize=chunksize)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Render serialized puzzles to files.')
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--output-dir', required=True)
+    parser.add_argument('--formats',
+                        nargs='+',
+                        choices=list(FORMAT_SUFFIXES.keys()),
+                        default=list(FORMAT_SUFFIXES.keys()))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=16)
+    args = parser.parse_args()
+    count = 0
+    for _ in render_corpus(args.paths, args.output_dir, args.formats,
+                           args.workers, args.chunksize):
+        count += 1
+    print(f'Rendered {count} puzzles to {args.output_dir}')
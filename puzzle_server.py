@@ -0,0 +1,324 @@
+import argparse
+import grpc
+import importlib
+import os
+import threading
+import time
+
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from queue import Empty, Queue
+
+from puzzle_corpus import get_fingerprint
+from puzzle_pb2 import Puzzle, Role, SolveRequest, SolveResponse, UniquenessResponse, VerifyRequest, VerifyResponse
+from puzzle_pb2_grpc import PuzzleServiceServicer, PuzzleServiceStub, add_PuzzleServiceServicer_to_server
+from puzzle_verifier import PuzzleVerifier, get_placement
+from typing import Iterator, List, Optional, Tuple, Union
+
+DEFAULT_ADDRESS = '127.0.0.1:50051'
+LOOPBACK_HOST = '127.0.0.1'
+
+SOLVE_TASK = 'solve'
+UNIQUENESS_TASK = 'uniqueness'
+
+WARM_MODULES = (
+    'ortools.sat.python.cp_model',
+    'puzzle_solution_counter',
+    'puzzle_solver',
+)
+
+Submission = namedtuple('Submission', ['future', 'fingerprint', 'cached'])
+
+
+def _warm_worker() -> None:
+    for module in WARM_MODULES:
+        importlib.import_module(module)
+
+
+def _get_pid() -> int:
+    return os.getpid()
+
+
+def _solve(puzzle: Puzzle) -> bytes:
+    from puzzle_solver import PuzzleSolver
+    solver = PuzzleSolver(puzzle)
+    status, solution_count = solver.solve()
+    response = SolveResponse(status=status, solution_count=solution_count)
+    if status == 'OPTIMAL' and solution_count > 0:
+        response.solution.CopyFrom(puzzle)
+        response.verdict = solver.verdict()
+    return response.SerializeToString()
+
+
+def _check_uniqueness(puzzle: Puzzle) -> bytes:
+    from puzzle_solver import PuzzleSolver
+    status, solution_count = PuzzleSolver(puzzle).check_uniqueness()
+    return UniquenessResponse(
+        status=status,
+        unique=solution_count == 1,
+        solution_count=solution_count).SerializeToString()
+
+
+TASK_FUNCTIONS = {
+    SOLVE_TASK: _solve,
+    UNIQUENESS_TASK: _check_uniqueness,
+}
+
+
+def _run_tasks(tasks: List[Tuple[str, bytes]]) -> List[Union[bytes, Exception]]:
+    results = []
+    for task, data in tasks:
+        puzzle = Puzzle()
+        try:
+            puzzle.ParseFromString(data)
+            results.append(TASK_FUNCTIONS[task](puzzle))
+        except Exception as error:
+            results.append(error)
+    return results
+
+
+class RequestBatcher:
+
+    def __init__(self,
+                 executor: Executor,
+                 worker_count: int,
+                 max_batch_size: int = 16,
+                 max_delay: float = 0.005,
+                 cache_size: int = 1024) -> None:
+        self._executor = executor
+        self._worker_count = worker_count
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._queue = Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, task: str, puzzle: Puzzle) -> Submission:
+        fingerprint = get_fingerprint(puzzle)
+        key = (task, fingerprint)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                future = Future()
+                future.set_result(self._cache[key])
+                return Submission(future, fingerprint, True)
+            if key in self._pending:
+                return Submission(self._pending[key], fingerprint, False)
+            future = Future()
+            self._pending[key] = future
+        self._queue.put((key, puzzle.SerializeToString(), future))
+        return Submission(future, fingerprint, False)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self._max_delay
+            while len(batch) < self._max_batch_size:
+                try:
+                    item = self._queue.get(
+                        timeout=max(0, deadline - time.monotonic()))
+                except Empty:
+                    break
+                if item is None:
+                    self._dispatch(batch)
+                    return
+                batch.append(item)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple]) -> None:
+        chunksize = -(-len(batch) // self._worker_count)
+        for start in range(0, len(batch), chunksize):
+            chunk = batch[start:start + chunksize]
+            chunk_future = self._executor.submit(
+                _run_tasks, [(key[0], data) for key, data, _ in chunk])
+            chunk_future.add_done_callback(partial(self._complete, chunk))
+
+    def _complete(self, chunk: List[Tuple], chunk_future: Future) -> None:
+        try:
+            results = chunk_future.result()
+        except Exception as error:
+            results = [error] * len(chunk)
+        with self._lock:
+            for (key, _, _), result in zip(chunk, results):
+                del self._pending[key]
+                if not isinstance(result, Exception):
+                    self._cache[key] = result
+                    self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        for (_, _, future), result in zip(chunk, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class PuzzleServicer(PuzzleServiceServicer):
+
+    def __init__(self, batcher: RequestBatcher, window: int = 64) -> None:
+        self._batcher = batcher
+        self._window = window
+
+    def Solve(self, request: SolveRequest,
+              context: grpc.ServicerContext) -> SolveResponse:
+        return self._get_response(
+            self._batcher.submit(SOLVE_TASK, request.puzzle), SolveResponse,
+            context)
+
+    def CheckUniqueness(self, request: SolveRequest,
+                        context: grpc.ServicerContext) -> UniquenessResponse:
+        return self._get_response(
+            self._batcher.submit(UNIQUENESS_TASK, request.puzzle),
+            UniquenessResponse, context)
+
+    def Verify(self, request: VerifyRequest,
+               context: grpc.ServicerContext) -> VerifyResponse:
+        puzzle = request.puzzle
+        if request.placement:
+            placement = [(coordinate.row, coordinate.column)
+                         for coordinate in request.placement]
+            murderer_id = request.murderer_id
+        else:
+            placement = get_placement(puzzle)
+            murderer_id = next((person.id
+                                for person in puzzle.people
+                                if person.role == Role.MURDERER), 0)
+        try:
+            valid = PuzzleVerifier(puzzle).verify(placement, murderer_id)
+        except Exception as error:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(error))
+        return VerifyResponse(valid=valid)
+
+    def SolveBatch(self, request_iterator: Iterator[SolveRequest],
+                   context: grpc.ServicerContext) -> Iterator[SolveResponse]:
+        pending = deque()
+        for request in request_iterator:
+            pending.append(self._batcher.submit(SOLVE_TASK, request.puzzle))
+            if len(pending) >= self._window:
+                yield self._get_response(pending.popleft(), SolveResponse,
+                                         context)
+        while pending:
+            yield self._get_response(pending.popleft(), SolveResponse, context)
+
+    def _get_response(
+        self, submission: Submission, response_type: type,
+        context: grpc.ServicerContext
+    ) -> Union[SolveResponse, UniquenessResponse]:
+        try:
+            data = submission.future.result()
+        except Exception as error:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(error))
+        response = response_type.FromString(data)
+        response.fingerprint = submission.fingerprint
+        response.cached = submission.cached
+        return response
+
+
+class PuzzleServer:
+
+    def __init__(self,
+                 address: str = DEFAULT_ADDRESS,
+                 max_workers: Optional[int] = None,
+                 max_batch_size: int = 16,
+                 max_delay: float = 0.005,
+                 cache_size: int = 1024,
+                 rpc_threads: int = 32) -> None:
+        self._worker_count = max_workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self._worker_count,
+                                             initializer=_warm_worker)
+        self._batcher = RequestBatcher(self._executor, self._worker_count,
+                                       max_batch_size, max_delay, cache_size)
+        self._server = grpc.server(ThreadPoolExecutor(max_workers=rpc_threads))
+        add_PuzzleServiceServicer_to_server(PuzzleServicer(self._batcher),
+                                            self._server)
+        self._port = self._server.add_insecure_port(address)
+
+    @property
+    def port(self) -> int:
+        return self._port
+
+    def start(self) -> None:
+        wait([
+            self._executor.submit(_get_pid) for _ in range(self._worker_count)
+        ])
+        self._server.start()
+
+    def wait_for_termination(self) -> None:
+        self._server.wait_for_termination()
+
+    def stop(self, grace: Optional[float] = None) -> None:
+        self._server.stop(grace).wait()
+        self._batcher.close()
+        self._executor.shutdown()
+
+    def __enter__(self) -> 'PuzzleServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def check_round_trip(puzzle: Puzzle, max_workers: int = 1) -> List[str]:
+    problems = []
+    with PuzzleServer(f'{LOOPBACK_HOST}:0', max_workers) as server:
+        with grpc.insecure_channel(f'{LOOPBACK_HOST}:{server.port}') as channel:
+            stub = PuzzleServiceStub(channel)
+            request = SolveRequest(puzzle=puzzle)
+            solved = stub.Solve(request)
+            if solved.status != 'OPTIMAL' or not solved.verdict:
+                problems.append(f'Solve returned {solved.status} with '
+                                f'{solved.solution_count} solutions')
+            if not stub.Solve(request).cached:
+                problems.append('Repeated Solve was not served from the cache')
+            uniqueness = stub.CheckUniqueness(request)
+            if uniqueness.unique != (solved.solution_count == 1):
+                problems.append(f'CheckUniqueness returned unique='
+                                f'{uniqueness.unique} for '
+                                f'{solved.solution_count} solutions')
+            if solved.HasField('solution') and not stub.Verify(
+                    VerifyRequest(puzzle=solved.solution)).valid:
+                problems.append('Verify rejected the solved puzzle')
+            batch = list(stub.SolveBatch(iter([request, request])))
+            if [response.fingerprint for response in batch
+               ] != [solved.fingerprint] * 2:
+                problems.append('SolveBatch did not answer every request')
+    return problems
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Serve puzzle solving over gRPC.')
+    parser.add_argument('--address', default=DEFAULT_ADDRESS)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--batch-delay', type=float, default=0.005)
+    parser.add_argument('--cache-size', type=int, default=1024)
+    parser.add_argument('--check', metavar='PUZZLE', default=None)
+    args = parser.parse_args()
+    if args.check is not None:
+        puzzle = Puzzle()
+        with open(args.check, 'rb') as f:
+            puzzle.ParseFromString(f.read())
+        problems = check_round_trip(puzzle)
+        for problem in problems:
+            print(problem)
+        print('Round trip failed' if problems else 'Round trip passed')
+        raise SystemExit(1 if problems else 0)
+    server = PuzzleServer(args.address, args.workers, args.batch_size,
+                          args.batch_delay, args.cache_size)
+    server.start()
+    print(f'Serving puzzles on port {server.port}')
+    server.wait_for_termination()
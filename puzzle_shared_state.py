@@ -0,0 +1,171 @@
+import numpy as np
+
+from collections import namedtuple
+from multiprocessing.shared_memory import SharedMemory
+
+from puzzle_board import PuzzleBoard
+from puzzle_modeler import PuzzleModeler
+from puzzle_pb2 import Puzzle
+from typing import Dict, TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    from ortools.sat.python.cp_model import CpModel, CpSolver
+
+ArraySpec = namedtuple('ArraySpec', ['offset', 'shape', 'dtype'])
+
+ALIGNMENT = 8
+
+BOARD_INDEX_DTYPES = {
+    'room_ids': np.int32,
+    'on': np.int32,
+    'beside': np.uint32,
+    'blocked': np.bool_,
+    'rowwise_features': np.uint32,
+    'columnwise_features': np.uint32,
+    'roomwise_features': np.uint32,
+}
+
+_attached_states = {}
+
+
+def get_board_arrays(board: PuzzleBoard) -> Dict[str, np.ndarray]:
+    return {
+        name: np.array(values, dtype=BOARD_INDEX_DTYPES[name])
+        for name, values in board.index.items()
+    }
+
+
+def get_variable_indexes(modeler: PuzzleModeler) -> Dict[str, np.ndarray]:
+    return {
+        'occupancy_keys':
+            np.array(list(modeler.occupancies.keys()),
+                     dtype=np.int32).reshape(-1, 3),
+        'occupancy_indexes':
+            np.array([
+                occupancy.Index() for occupancy in modeler.occupancies.values()
+            ],
+                     dtype=np.int32),
+        'clue_literal_indexes':
+            np.array([
+                -1 if literal is None else literal.Index()
+                for literal in modeler.clue_literals
+            ],
+                     dtype=np.int32),
+    }
+
+
+def get_response_placements(occupancy_keys: np.ndarray,
+                            occupancy_indexes: np.ndarray,
+                            solver: 'CpSolver') -> Tuple[Tuple[int, int], ...]:
+    solution = np.array(solver.ResponseProto().solution, dtype=np.int64)
+    occupied = occupancy_keys[np.flatnonzero(solution[occupancy_indexes])]
+    placements = [None] * int(occupancy_keys[:, 0].max(initial=0))
+    for person_id, row, column in occupied.tolist():
+        placements[person_id - 1] = (row, column)
+    return tuple(placements)
+
+
+def _get_view(shared_memory: SharedMemory, spec: ArraySpec) -> np.ndarray:
+    return np.ndarray(spec.shape,
+                      dtype=spec.dtype,
+                      buffer=shared_memory.buf,
+                      offset=spec.offset)
+
+
+def _attach(name: str, specs: Dict[str, ArraySpec]) -> 'SharedModelerState':
+    if name not in _attached_states:
+        _attached_states[name] = SharedModelerState(SharedMemory(name=name),
+                                                    specs,
+                                                    owner=False)
+    return _attached_states[name]
+
+
+class SharedModelerState:
+
+    def __init__(self,
+                 shared_memory: SharedMemory,
+                 specs: Dict[str, ArraySpec],
+                 owner: bool = False) -> None:
+        self._shared_memory = shared_memory
+        self._specs = specs
+        self._owner = owner
+        self._puzzle = None
+        self._model = None
+        self._board = None
+
+    @property
+    def name(self) -> str:
+        return self._shared_memory.name
+
+    @property
+    def puzzle(self) -> Puzzle:
+        if self._puzzle is None:
+            self._puzzle = Puzzle()
+            self._puzzle.ParseFromString(self.get_array('puzzle').tobytes())
+        return self._puzzle
+
+    @property
+    def model(self) -> 'CpModel':
+        if self._model is None:
+            from ortools.sat.python.cp_model import CpModel
+            self._model = CpModel()
+            self._model.Proto().ParseFromString(
+                self.get_array('model').tobytes())
+        return self._model
+
+    @property
+    def board(self) -> PuzzleBoard:
+        if self._board is None:
+            self._board = PuzzleBoard(self.puzzle,
+                                      index={
+                                          name: self.get_array(name).tolist()
+                                          for name in BOARD_INDEX_DTYPES
+                                      })
+        return self._board
+
+    @property
+    def occupancy_keys(self) -> np.ndarray:
+        return self.get_array('occupancy_keys')
+
+    @property
+    def occupancy_indexes(self) -> np.ndarray:
+        return self.get_array('occupancy_indexes')
+
+    @property
+    def clue_literal_indexes(self) -> np.ndarray:
+        return self.get_array('clue_literal_indexes')
+
+    def get_array(self, name: str) -> np.ndarray:
+        return _get_view(self._shared_memory, self._specs[name])
+
+    def close(self) -> None:
+        self._shared_memory.close()
+        if self._owner:
+            self._shared_memory.unlink()
+
+    def __reduce__(self) -> Tuple:
+        return _attach, (self.name, self._specs)
+
+    def __enter__(self) -> 'SharedModelerState':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def create_shared_state(modeler: PuzzleModeler) -> SharedModelerState:
+    arrays = get_board_arrays(modeler.board)
+    arrays.update(get_variable_indexes(modeler))
+    arrays['puzzle'] = np.frombuffer(modeler.puzzle.SerializeToString(),
+                                     dtype=np.uint8)
+    arrays['model'] = np.frombuffer(modeler.model.Proto().SerializeToString(),
+                                    dtype=np.uint8)
+    specs = {}
+    size = 0
+    for name, array in arrays.items():
+        specs[name] = ArraySpec(size, array.shape, array.dtype.str)
+        size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    shared_memory = SharedMemory(create=True, size=max(size, ALIGNMENT))
+    for name, array in arrays.items():
+        _get_view(shared_memory, specs[name])[...] = array
+    return SharedModelerState(shared_memory, specs, owner=True)
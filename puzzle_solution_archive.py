@@ -0,0 +1,184 @@
+import numpy as np
+import os
+import struct
+
+from math import perm
+from typing import Iterator, List, Sequence, Tuple, Union
+
+ARCHIVE_MAGIC = b'FRSA'
+ARCHIVE_HEADER = struct.Struct('<4sHHH6x')
+
+RANK_DTYPES = (np.uint8, np.uint16, np.uint32, np.uint64)
+
+READ_CHUNK_SIZE = 65536
+
+Placements = Tuple[Tuple[int, int], ...]
+
+
+def rank_arrangement(values: Sequence[int], m: int) -> int:
+    remaining = list(range(m))
+    rank = 0
+    for i, value in enumerate(values):
+        index = remaining.index(value)
+        rank = rank * (m - i) + index
+        del remaining[index]
+    return rank
+
+
+def unrank_arrangement(rank: int, m: int, k: int) -> List[int]:
+    indexes = []
+    for radix in range(m - k + 1, m + 1):
+        rank, index = divmod(rank, radix)
+        indexes.append(index)
+    remaining = list(range(m))
+    return [remaining.pop(index) for index in reversed(indexes)]
+
+
+def is_rankable(m: int, k: int) -> bool:
+    return perm(m, k) - 1 <= np.iinfo(np.uint64).max
+
+
+def get_smallest_dtype(max_value: int) -> np.dtype:
+    return next(
+        np.dtype(dtype).newbyteorder('<')
+        for dtype in RANK_DTYPES
+        if max_value <= np.iinfo(dtype).max)
+
+
+def get_line_dtype(m: int, k: int) -> np.dtype:
+    if is_rankable(m, k):
+        return get_smallest_dtype(perm(m, k) - 1)
+    return np.dtype((get_smallest_dtype(m - 1), (k,)))
+
+
+def get_record_dtype(n: int, rows: int, columns: int) -> np.dtype:
+    return np.dtype([('rows', get_line_dtype(rows, n)),
+                     ('columns', get_line_dtype(columns, n))])
+
+
+def encode_lines(values: Sequence[int], m: int) -> Union[int, List[int]]:
+    if is_rankable(m, len(values)):
+        return rank_arrangement(values, m)
+    return list(values)
+
+
+def decode_lines(field: Union[int, List[int]], m: int, k: int) -> List[int]:
+    if is_rankable(m, k):
+        return unrank_arrangement(field, m, k)
+    return field
+
+
+def encode_placements(
+        placements: Placements, rows: int,
+        columns: int) -> Tuple[Union[int, List[int]], Union[int, List[int]]]:
+    return (encode_lines([row for row, _ in placements], rows),
+            encode_lines([column for _, column in placements], columns))
+
+
+def decode_placements(row_field: Union[int, List[int]],
+                      column_field: Union[int, List[int]], n: int, rows: int,
+                      columns: int) -> Placements:
+    return tuple(
+        zip(decode_lines(row_field, rows, n),
+            decode_lines(column_field, columns, n)))
+
+
+class SolutionArchiveWriter:
+
+    def __init__(self,
+                 path: str,
+                 n: int,
+                 rows: int,
+                 columns: int,
+                 buffer_size: int = 4096) -> None:
+        self._n = n
+        self._rows = rows
+        self._columns = columns
+        self._dtype = get_record_dtype(n, rows, columns)
+        self._buffer_size = buffer_size
+        self._buffer = []
+        self._count = 0
+        self._file = open(path, 'wb')
+        self._file.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, n, rows, columns))
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def write(self, placements: Placements) -> None:
+        self._buffer.append(
+            encode_placements(placements, self._rows, self._columns))
+        self._count += 1
+        if len(self._buffer) >= self._buffer_size:
+            self._flush()
+
+    def close(self) -> None:
+        self._flush()
+        self._file.close()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._file.write(
+                np.array(self._buffer, dtype=self._dtype).tobytes())
+            self._buffer = []
+
+    def __enter__(self) -> 'SolutionArchiveWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SolutionArchiveReader:
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as f:
+            header = f.read(ARCHIVE_HEADER.size)
+        if len(header) != ARCHIVE_HEADER.size:
+            raise EOFError('Truncated solution archive')
+        magic, self._n, self._rows, self._columns = ARCHIVE_HEADER.unpack(
+            header)
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f'{path} is not a solution archive')
+        dtype = get_record_dtype(self._n, self._rows, self._columns)
+        size = os.path.getsize(path) - ARCHIVE_HEADER.size
+        if size % dtype.itemsize:
+            raise EOFError('Truncated solution archive')
+        if size:
+            self._ranks = np.memmap(path,
+                                    dtype=dtype,
+                                    mode='r',
+                                    offset=ARCHIVE_HEADER.size)
+        else:
+            self._ranks = np.empty(0, dtype=dtype)
+
+    @property
+    def n(self) -> int:
+        return self._n
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    @property
+    def ranks(self) -> np.ndarray:
+        return self._ranks
+
+    def get_placements(self, index: int) -> Placements:
+        row_field, column_field = self._ranks[index].tolist()
+        return decode_placements(row_field, column_field, self._n, self._rows,
+                                 self._columns)
+
+    def __len__(self) -> int:
+        return len(self._ranks)
+
+    def __iter__(self) -> Iterator[Placements]:
+        for start in range(0, len(self._ranks), READ_CHUNK_SIZE):
+            chunk = self._ranks[start:start + READ_CHUNK_SIZE]
+            for row_field, column_field in chunk.tolist():
+                yield decode_placements(row_field, column_field, self._n,
+                                        self._rows, self._columns)
@@ -0,0 +1,27 @@
+from ortools.sat.python.cp_model import CpSolverSolutionCallback
+from typing import Callable, Optional
+
+
+class SolutionCounter(CpSolverSolutionCallback):
+
+    def __init__(
+        self,
+        max_solutions: Optional[int] = None,
+        on_solution: Optional[Callable[['SolutionCounter'],
+                                       None]] = None) -> None:
+        CpSolverSolutionCallback.__init__(self)
+        self._solution_count = 0
+        self._max_solutions = max_solutions
+        self._on_solution = on_solution
+
+    @property
+    def solution_count(self) -> int:
+        return self._solution_count
+
+    def on_solution_callback(self) -> None:
+        self._solution_count += 1
+        if self._on_solution is not None:
+            self._on_solution(self)
+        if (self._max_solutions is not None and
+                self._solution_count >= self._max_solutions):
+            self.StopSearch()
@@ -1,114 +1,354 @@
-from ortools.sat.python.cp_model import CpSolver, CpSolverSolutionCallback, OPTIMAL
+from collections import namedtuple
+from functools import partial
+from itertools import permutations, product
 
+from puzzle_deducer import PuzzleDeducer
+from puzzle_dp_counter import MAX_PEOPLE, PuzzleDpCounter
 from puzzle_modeler import PuzzleModeler
-from puzzle_pb2 import Puzzle, Role
-from google.protobuf.pyext._message import RepeatedCompositeContainer
-from typing import Tuple
+from puzzle_board import PuzzleBoard
+from puzzle_pb2 import Coordinate, Puzzle, Role
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TYPE_CHECKING, Tuple
 
+if TYPE_CHECKING:
+    from ortools.sat.python.cp_model import CpModel, CpSolver, IntVar
+    from puzzle_solution_counter import SolutionCounter
 
-def get_name(messages: RepeatedCompositeContainer, message_id: int) -> str:
+Placements = Dict[str, Tuple[int, int]]
+Coordinates = Tuple[Tuple[int, int], ...]
+
+ClueReference = namedtuple('ClueReference', ['index', 'text'])
+
+ConflictingClue = ClueReference
+
+Hint = namedtuple('Hint',
+                  ['person_id', 'row', 'column', 'clues', 'layer', 'text'])
+
+SolveResult = namedtuple('SolveResult', [
+    'status', 'solution_count', 'placements', 'victim_id', 'murderer_id',
+    'murder_room_id'
+])
+
+SUSPECT_ROLES = (Role.SUSPECT, Role.MURDERER)
+
+UNIQUENESS_LIMIT = 2
+
+
+def get_name(messages: Iterable, message_id: int) -> str:
     for message in messages:
         if message.id == message_id:
             return message.name
 
 
-class SolutionCounter(CpSolverSolutionCallback):
+def get_solution_placements(modeler: PuzzleModeler,
+                            values) -> Tuple[Tuple[int, int], ...]:
+    placements = [None] * len(modeler.puzzle.people)
+    for (person_id, row, col), occupancy in modeler.occupancies.items():
+        if placements[person_id - 1] is None and values.Value(occupancy):
+            placements[person_id - 1] = (row, col)
+    return tuple(placements)
 
-    def __init__(self) -> None:
-        CpSolverSolutionCallback.__init__(self)
-        self._solution_count = 0
 
-    @property
-    def solution_count(self) -> int:
-        return self._solution_count
+def iter_symmetric_placements(
+        placements: Tuple[Tuple[int, int],
+                          ...], symmetry_classes: List[List[int]]
+) -> Iterator[Tuple[Tuple[int, int], ...]]:
+    for class_permutations in product(
+            *[permutations(person_ids) for person_ids in symmetry_classes]):
+        permuted = list(placements)
+        for person_ids, permuted_ids in zip(symmetry_classes,
+                                            class_permutations):
+            for person_id, permuted_id in zip(person_ids, permuted_ids):
+                permuted[permuted_id - 1] = placements[person_id - 1]
+        yield tuple(permuted)
 
-    def on_solution_callback(self) -> None:
-        self._solution_count += 1
+
+def get_murder(puzzle: Puzzle, board: PuzzleBoard,
+               placements: Coordinates) -> Tuple[int, Optional[int], int]:
+    rooms = [
+        board.get_room_of_coordinate(Coordinate(row=row, column=column))
+        for row, column in placements
+    ]
+    victim_id = next(
+        person.id for person in puzzle.people if person.role == Role.VICTIM)
+    murder_room_id = rooms[victim_id - 1]
+    suspect_ids = [
+        person.id for person in puzzle.people if person.role in SUSPECT_ROLES
+    ]
+    murderer_id = next((person_id for person_id in suspect_ids
+                        if rooms[person_id - 1] == murder_room_id), None)
+    return victim_id, murderer_id, murder_room_id
+
+
+def format_verdict(puzzle: Puzzle, murderer_id: int, victim_id: int,
+                   murder_room_id: int) -> str:
+    return '{murderer} murdered {victim} in the {room}!'.format(
+        murderer=get_name(puzzle.people, murderer_id),
+        victim=get_name(puzzle.people, victim_id),
+        room=get_name(puzzle.crime_scene.rooms, murder_room_id))
+
+
+def get_verdict(puzzle: Puzzle, result: SolveResult) -> str:
+    return format_verdict(puzzle, result.murderer_id, result.victim_id,
+                          result.murder_room_id)
+
+
+def solve_puzzle(puzzle: Puzzle,
+                 modeler: Optional[PuzzleModeler] = None) -> SolveResult:
+    from ortools.sat.python.cp_model import CpSolver, OPTIMAL
+    from puzzle_solution_counter import SolutionCounter
+    if modeler is None:
+        modeler = PuzzleModeler(puzzle, break_symmetries=True)
+    solver = CpSolver()
+    callback = SolutionCounter()
+    status = solver.SearchForAllSolutions(modeler.model, callback)
+    placements = victim_id = murderer_id = murder_room_id = None
+    if status == OPTIMAL and callback.solution_count:
+        placements = get_solution_placements(modeler, solver)
+        victim_id, murderer_id, murder_room_id = get_murder(
+            puzzle, modeler.board, placements)
+    return SolveResult(status=solver.StatusName(status),
+                       solution_count=callback.solution_count *
+                       modeler.solution_multiplicity,
+                       placements=placements,
+                       victim_id=victim_id,
+                       murderer_id=murderer_id,
+                       murder_room_id=murder_room_id)
 
 
 class PuzzleSolver:
 
-    def __init__(self, puzzle: Puzzle, debug: bool = False) -> None:
+    def __init__(self,
+                 puzzle: Puzzle,
+                 debug: bool = False,
+                 break_symmetries: bool = True,
+                 prune_clues: bool = True,
+                 aggregate_counts: bool = True,
+                 solver_parameters: Optional[Dict[str, object]] = None) -> None:
         self._puzzle = puzzle
         self._n = len(self._puzzle.people)
-        self._modeler = PuzzleModeler(puzzle, debug)
+        self._modeler = PuzzleModeler(puzzle,
+                                      debug,
+                                      prune_clues=prune_clues,
+                                      aggregate_counts=aggregate_counts,
+                                      break_symmetries=break_symmetries)
+        self._solver_parameters = solver_parameters or {}
+        self._deducer = None
+        self._active_callback = None
+        self._archive = None
+        self._stopped = False
 
-    def solve(self) -> Tuple[str, int]:
-        self._solver = CpSolver()
-        self._callback = SolutionCounter()
-        self._status = self._solver.SearchForAllSolutions(
-            self._modeler.model, self._callback)
+    def solve(self,
+              on_solution: Optional[Callable[[Placements], None]] = None,
+              archive_path: Optional[str] = None) -> Tuple[str, int]:
+        from ortools.sat.python.cp_model import OPTIMAL
+        from puzzle_solution_counter import SolutionCounter
+        self._solver = self._create_solver()
+        self._callback = SolutionCounter(
+            on_solution=partial(self._on_solution, on_solution))
+        if archive_path is None:
+            self._status = self._search(self._solver, self._callback)
+        else:
+            from puzzle_solution_archive import SolutionArchiveWriter
+            board = self._modeler.board
+            self._archive = SolutionArchiveWriter(archive_path, self._n,
+                                                  board.rows, board.columns)
+            try:
+                self._status = self._search(self._solver, self._callback)
+            finally:
+                self._archive.close()
+                self._archive = None
         if self._status == OPTIMAL:
             self._set_solution()
             self._set_occupancy_repr()
         return (self._solver.StatusName(self._status),
-                self._callback.solution_count)
+                self._callback.solution_count *
+                self._modeler.solution_multiplicity)
+
+    def check_uniqueness(self) -> Tuple[str, int]:
+        from puzzle_solution_counter import SolutionCounter
+        solver = self._create_solver()
+        callback = SolutionCounter(max_solutions=UNIQUENESS_LIMIT,
+                                   on_solution=partial(self._on_solution, None))
+        status = self._search(solver, callback)
+        solution_count = (callback.solution_count *
+                          self._modeler.solution_multiplicity)
+        return solver.StatusName(status), min(solution_count, UNIQUENESS_LIMIT)
+
+    def count_solutions(self) -> Tuple[str, int]:
+        if self._n > MAX_PEOPLE:
+            from puzzle_solution_counter import SolutionCounter
+            solver = self._create_solver()
+            callback = SolutionCounter(
+                on_solution=partial(self._on_solution, None))
+            status = self._search(solver, callback)
+            return (solver.StatusName(status), callback.solution_count *
+                    self._modeler.solution_multiplicity)
+        solution_count = PuzzleDpCounter(self._puzzle,
+                                         self._modeler.board).count()
+        return 'OPTIMAL' if solution_count else 'INFEASIBLE', solution_count
+
+    def stop(self) -> None:
+        self._stopped = True
+        callback = self._active_callback
+        if callback is not None:
+            callback.StopSearch()
+
+    def get_placements(self, values) -> Placements:
+        return self._name_placements(
+            get_solution_placements(self._modeler, values))
 
     @property
     def occupancy_repr(self) -> Tuple[str]:
         return self._occupancy_repr
 
+    def hint(self) -> Optional[Hint]:
+        if self._deducer is None:
+            self._deducer = PuzzleDeducer(self._puzzle, self._modeler.board)
+        deduction = self._deducer.next_placement()
+        if deduction is None:
+            return None
+        clues = [
+            ClueReference(index=clue_index,
+                          text=self._puzzle.clues[clue_index].text)
+            for clue_index in deduction.clue_indexes
+        ]
+        text = '{person} must be at ({row}, {column})'.format(
+            person=get_name(self._puzzle.people, deduction.person_id),
+            row=deduction.row,
+            column=deduction.column)
+        clue_texts = list(
+            dict.fromkeys(clue.text for clue in clues if clue.text))
+        if clue_texts:
+            text += ' because: ' + ' '.join(clue_texts)
+        else:
+            text += ' because of the people already placed.'
+        return Hint(person_id=deduction.person_id,
+                    row=deduction.row,
+                    column=deduction.column,
+                    clues=clues,
+                    layer=deduction.layer,
+                    text=text)
+
+    def diagnose(self) -> List[ClueReference]:
+        modeler = PuzzleModeler(self._puzzle, guard_clues=True)
+        core = self._get_core(
+            modeler.model, {
+                clue_index: literal
+                for clue_index, literal in enumerate(modeler.clue_literals)
+                if literal is not None
+            })
+        if core is None:
+            return []
+        for clue_index in sorted(core):
+            if clue_index not in core:
+                continue
+            reduced_core = self._get_core(
+                modeler.model, {
+                    other_index: literal
+                    for other_index, literal in core.items()
+                    if other_index != clue_index
+                })
+            if reduced_core is not None:
+                core = reduced_core
+        return [
+            ClueReference(index=clue_index,
+                          text=self._puzzle.clues[clue_index].text)
+            for clue_index in sorted(core)
+        ]
+
     def verdict(self) -> str:
-        return '{murderer} murdered {victim} in the {room}!'.format(
-            murderer=get_name(self._puzzle.people, self._murderer_id),
-            victim=get_name(self._puzzle.people, self._victim_id),
-            room=get_name(self._puzzle.crime_scene.rooms, self._murder_room_id))
+        return format_verdict(self._puzzle, self._murderer_id, self._victim_id,
+                              self._murder_room_id)
 
-    def _set_solution(self) -> None:
-        self._set_victim()
-        self._set_people_coordinates()
-        self._set_murder_room()
-        self._set_murderer()
+    def _create_solver(self) -> 'CpSolver':
+        from ortools.sat.python.cp_model import CpSolver
+        solver = CpSolver()
+        for name, value in self._solver_parameters.items():
+            setattr(solver.parameters, name, value)
+        return solver
 
-    def _set_victim(self) -> int:
-        for person in self._puzzle.people:
-            if person.role == Role.VICTIM:
-                self._victim_id = person.id
-        if self._victim_id is None:
-            raise AttributeError
+    def _search(self, solver: 'CpSolver', callback: 'SolutionCounter') -> int:
+        from ortools.sat.python.cp_model import UNKNOWN
+        self._active_callback = callback
+        if self._stopped:
+            return UNKNOWN
+        try:
+            return solver.SearchForAllSolutions(self._modeler.model, callback)
+        finally:
+            self._active_callback = None
 
-    def _set_people_coordinates(self) -> None:
-        for person in self._puzzle.people:
-            row, column = self._get_person_coordinates(person.id)
-            person.coordinate.row = row
-            person.coordinate.column = column
+    def _on_solution(self, on_solution: Optional[Callable[[Placements], None]],
+                     callback: 'SolutionCounter') -> None:
+        if self._stopped:
+            callback.StopSearch()
+        elif on_solution is not None or self._archive is not None:
+            for placements in iter_symmetric_placements(
+                    get_solution_placements(self._modeler, callback),
+                    self._modeler.symmetry_classes):
+                if self._stopped:
+                    callback.StopSearch()
+                    return
+                if self._archive is not None:
+                    self._archive.write(placements)
+                if on_solution is not None:
+                    on_solution(self._name_placements(placements))
 
-    def _get_person_coordinates(self, person_id: int) -> Tuple[int, int]:
-        for row in range(self._n):
-            for col in range(self._n):
-                if self._solver.Value(self._modeler.occupancies[person_id -
-                                                                1][row][col]):
-                    return (row, col)
-        raise AttributeError
+    def _get_core(
+            self, model: 'CpModel',
+            literals: Dict[int, 'IntVar']) -> Optional[Dict[int, 'IntVar']]:
+        from ortools.sat.python.cp_model import CpSolver, INFEASIBLE
+        model.ClearAssumptions()
+        model.AddAssumptions(list(literals.values()))
+        solver = CpSolver()
+        solver.parameters.num_search_workers = 1
+        if solver.Solve(model) != INFEASIBLE:
+            return None
+        core = set(solver.SufficientAssumptionsForInfeasibility())
+        return {
+            clue_index: literal
+            for clue_index, literal in literals.items()
+            if literal.Index() in core
+        }
 
-    def _set_murder_room(self):
-        victim_coordinate = self._puzzle.people[self._victim_id - 1].coordinate
-        self._murder_room_id = self._modeler.get_room_of_coordinate(
-            victim_coordinate)
+    def _name_placements(self, placements: Coordinates) -> Placements:
+        return {
+            person.name: placements[person.id - 1]
+            for person in self._puzzle.people
+        }
 
-    def _set_murderer(self) -> None:
+    def _set_solution(self) -> None:
+        placements = get_solution_placements(self._modeler, self._solver)
+        self._victim_id, self._murderer_id, self._murder_room_id = get_murder(
+            self._puzzle, self._modeler.board, placements)
         for person in self._puzzle.people:
-            room_id = self._modeler.get_room_of_coordinate(person.coordinate)
-            if person.role == Role.SUSPECT and room_id == self._murder_room_id:
+            row, column = placements[person.id - 1]
+            person.coordinate.row = row
+            person.coordinate.column = column
+            if person.id == self._murderer_id:
                 person.role = Role.MURDERER
-                self._murderer_id = person.id
-                break
 
     def _set_occupancy_repr(self) -> None:
         self._occupancy_repr = (self._person_occupancy_repr(person_id)
                                 for person_id in range(1, self._n + 1))
 
     def _person_occupancy_repr(self, person_id: int) -> str:
-        col_labels = '   ' + ' '.join([str(col) for col in range(self._n)])
-        upper_border = '  \u250C' + '\u2500' * (self._n * 2 - 1) + '\u2510'
-        lower_border = '  \u2514' + '\u2500' * (self._n * 2 - 1) + '\u2518'
+        board = self._modeler.board
+        col_labels = '   ' + ' '.join(
+            [str(col) for col in range(board.columns)])
+        upper_border = '  \u250C' + '\u2500' * (board.columns * 2 -
+                                                1) + '\u2510'
+        lower_border = '  \u2514' + '\u2500' * (board.columns * 2 -
+                                                1) + '\u2518'
+        name = get_name(self._puzzle.people, person_id)
         rows = [
             f'{row} \u2502' + ' '.join([
-                get_name(self._puzzle.people, person_id)[0] if self._solver.
-                Value(self._modeler.occupancies[person_id -
-                                                1][row][col]) == 1 else ' '
-                for col in range(self._n)
+                name[0] if self._is_occupied(person_id, row, col) else ' '
+                for col in range(board.columns)
             ]) + '\u2502'
-            for row in range(self._n)
+            for row in range(board.rows)
         ]
         return '\n'.join([col_labels, upper_border] + rows + [lower_border])
+
+    def _is_occupied(self, person_id: int, row: int, col: int) -> bool:
+        occupancy = self._modeler.get_occupancy(person_id, row, col)
+        return occupancy is not None and self._solver.Value(occupancy) == 1
@@ -0,0 +1,72 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from typing import Dict, List
+
+STARTUP_TASKS = {
+    'interpreter':
+        'pass',
+    'protobuf':
+        'import puzzle_pb2',
+    'encode':
+        'import puzzle_encoder',
+    'verify':
+        'import puzzle_verifier',
+    'render':
+        'import puzzle_renderer',
+    'import_solver':
+        'import puzzle_solver',
+    'solve': ('from puzzle_pb2 import Puzzle\n'
+              'from puzzle_solver import PuzzleSolver\n'
+              'puzzle = Puzzle()\n'
+              'puzzle.ParseFromString(open({path!r}, "rb").read())\n'
+              'PuzzleSolver(puzzle).solve()'),
+}
+
+PROBE = ('import sys\n'
+         'import puzzle_solver\n'
+         'from google.protobuf.internal import api_implementation\n'
+         'print(api_implementation.Type())\n'
+         'print(any(name.startswith("ortools") for name in sys.modules))')
+
+
+def get_protobuf_backend() -> str:
+    from google.protobuf.internal import api_implementation
+    return api_implementation.Type()
+
+
+def _time_task(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], check=True)
+    return time.perf_counter() - start
+
+
+def benchmark_startup(path: str, repeat: int = 5) -> Dict[str, float]:
+    results = {}
+    for task, code in STARTUP_TASKS.items():
+        times = [_time_task(code.format(path=path)) for _ in range(repeat)]
+        results[task] = statistics.median(times)
+    return results
+
+
+def probe_imports() -> List[str]:
+    return subprocess.run([sys.executable, '-c', PROBE],
+                          check=True,
+                          capture_output=True,
+                          text=True).stdout.split()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Measure process startup time for common puzzle tasks.')
+    parser.add_argument('--puzzle', default='how_to_play.bin')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    backend, ortools_loaded = probe_imports()
+    print(f'protobuf backend: {backend}')
+    print(f'ortools loaded by importing puzzle_solver: {ortools_loaded}')
+    for task, elapsed in benchmark_startup(args.puzzle, args.repeat).items():
+        print(f'{task:>14}: {1000 * elapsed:8.1f} ms')
@@ -0,0 +1,169 @@
+import numpy as np
+
+from puzzle_board import PuzzleBoard
+from puzzle_pb2 import Puzzle, Role
+from typing import List
+
+
+def get_placement(puzzle: Puzzle) -> np.ndarray:
+    return np.array(
+        [[person.coordinate.row, person.coordinate.column]
+         for person in sorted(puzzle.people, key=lambda person: person.id)],
+        dtype=np.intp)
+
+
+class PuzzleVerifier:
+
+    def __init__(self, puzzle: Puzzle) -> None:
+        self._puzzle = puzzle
+        self._board = PuzzleBoard(puzzle)
+        self._n = self._board.n
+        self._rows = self._board.rows
+        self._columns = self._board.columns
+        self._compile_board()
+        self._compile_clues()
+        self._compile_roles()
+
+    @property
+    def clue_masks(self) -> np.ndarray:
+        return self._clue_masks
+
+    @property
+    def subject_masks(self) -> np.ndarray:
+        return self._subject_masks
+
+    def verify(self, placement: np.ndarray, murderer_id: int) -> bool:
+        if isinstance(placement, np.ndarray):
+            placement = placement.tolist()
+        rows = [row for row, _ in placement]
+        columns = [column for _, column in placement]
+        if len(rows) != self._n:
+            return False
+        if not (all(0 <= row < self._rows for row in rows) and
+                all(0 <= column < self._columns for column in columns)):
+            return False
+        if len(set(rows)) != len(rows) or len(set(columns)) != len(columns):
+            return False
+        cells = [
+            row * self._columns + column for row, column in zip(rows, columns)
+        ]
+        if any(self._blocked_cells[cell] for cell in cells):
+            return False
+        for clue_cells, subject_indexes, count, exact in self._compiled_clues:
+            total = sum(cells[index] in clue_cells for index in subject_indexes)
+            if total != count if exact else total < count:
+                return False
+        return self._is_murderer(cells, murderer_id)
+
+    def verify_batch(self, placements: np.ndarray,
+                     murderer_ids: np.ndarray) -> np.ndarray:
+        placements = np.asarray(placements, dtype=np.intp)
+        murderer_ids = np.asarray(murderer_ids, dtype=np.intp)
+        rows, columns = placements[..., 0], placements[..., 1]
+        valid = self._verify_bounds(rows, columns)
+        cells = np.where(valid[:, np.newaxis], rows * self._columns + columns,
+                         0)
+        valid &= ~self._blocked[cells].any(axis=1)
+        valid &= self._verify_uniqueness(rows)
+        valid &= self._verify_uniqueness(columns)
+        valid &= self._verify_clues(cells)
+        valid &= self._verify_murderer(cells, murderer_ids)
+        return valid
+
+    def _compile_board(self) -> None:
+        self._room_ids = np.array(
+            [space.room_id for row in self._board.spaces for space in row],
+            dtype=np.intp)
+        self._blocked = np.zeros(self._rows * self._columns, dtype=bool)
+        for row, column in self._board.blocked_coordinates:
+            self._blocked[row * self._columns + column] = True
+        self._room_ids_list = self._room_ids.tolist()
+        self._blocked_cells = self._blocked.tolist()
+
+    def _compile_clues(self) -> None:
+        clue_masks, subject_masks, counts, exact = [], [], [], []
+        for clue in self._puzzle.clues:
+            people_ids = self._board.get_subject_ids(clue)
+            space_indexes = self._board.get_space_indexes(clue)
+            if not (people_ids and space_indexes):
+                continue
+            clue_mask = np.zeros(self._rows * self._columns, dtype=bool)
+            clue_mask[[row * self._columns + col for row, col in space_indexes
+                      ]] = True
+            subject_mask = np.zeros(self._n, dtype=bool)
+            subject_mask[[person_id - 1 for person_id in people_ids]] = True
+            clue_masks.append(clue_mask)
+            subject_masks.append(subject_mask)
+            if clue.HasField('exact_count'):
+                counts.append(clue.exact_count)
+                exact.append(True)
+            else:
+                counts.append(clue.min_count)
+                exact.append(False)
+        self._clue_masks = np.array(clue_masks, dtype=bool).reshape(
+            -1, self._rows * self._columns)
+        self._subject_masks = np.array(subject_masks,
+                                       dtype=bool).reshape(-1, self._n)
+        self._counts = np.array(counts, dtype=np.intp)
+        self._exact = np.array(exact, dtype=bool)
+        self._compiled_clues = [
+            (frozenset(np.flatnonzero(clue_mask).tolist()),
+             np.flatnonzero(subject_mask).tolist(), count, is_exact)
+            for clue_mask, subject_mask, count, is_exact in zip(
+                clue_masks, subject_masks, counts, exact)
+        ]
+
+    def _compile_roles(self) -> None:
+        self._suspects = np.zeros(self._n, dtype=bool)
+        self._victim_index = None
+        for person in self._puzzle.people:
+            if person.role in (Role.SUSPECT, Role.MURDERER):
+                self._suspects[person.id - 1] = True
+            elif person.role == Role.VICTIM:
+                self._victim_index = person.id - 1
+        if self._victim_index is None:
+            raise AttributeError
+        self._suspect_list = self._suspects.tolist()
+
+    def _verify_bounds(self, rows: np.ndarray,
+                       columns: np.ndarray) -> np.ndarray:
+        in_bounds = (rows >= 0) & (rows < self._rows) & (columns >= 0) & (
+            columns < self._columns)
+        return in_bounds.all(axis=1)
+
+    def _verify_uniqueness(self, lines: np.ndarray) -> np.ndarray:
+        return (np.diff(np.sort(lines, axis=1), axis=1) != 0).all(axis=1)
+
+    def _verify_clues(self, cells: np.ndarray) -> np.ndarray:
+        inside = self._clue_masks[:, cells] & self._subject_masks[:, np.newaxis]
+        totals = inside.sum(axis=2)
+        counts = self._counts[:, np.newaxis]
+        satisfied = np.where(self._exact[:, np.newaxis], totals == counts,
+                             totals >= counts)
+        return satisfied.all(axis=0)
+
+    def _is_murderer(self, cells: List[int], murderer_id: int) -> bool:
+        if not (1 <= murderer_id <= self._n and
+                self._suspect_list[murderer_id - 1]):
+            return False
+        victim_room_id = self._room_ids_list[cells[self._victim_index]]
+        with_victim = [
+            index for index, cell in enumerate(cells)
+            if index != self._victim_index and self._suspect_list[index] and
+            self._room_ids_list[cell] == victim_room_id
+        ]
+        return with_victim == [murderer_id - 1]
+
+    def _verify_murderer(self, cells: np.ndarray,
+                         murderer_ids: np.ndarray) -> np.ndarray:
+        murderer_indexes = murderer_ids - 1
+        valid = (murderer_indexes >= 0) & (murderer_indexes < self._n)
+        murderer_indexes = np.where(valid, murderer_indexes, 0)
+        valid &= self._suspects[murderer_indexes]
+        rooms = self._room_ids[cells]
+        with_victim = rooms == rooms[:, [self._victim_index]]
+        with_victim[:, self._victim_index] = False
+        with_victim &= self._suspects
+        valid &= with_victim.sum(axis=1) == 1
+        valid &= with_victim[np.arange(len(cells)), murderer_indexes]
+        return valid
@@ -1,8 +1,10 @@
-import re
+import numpy as np
 
 from collections import namedtuple
+from functools import lru_cache
 
-from puzzle_pb2 import Coordinate, CrimeSceneFeatureType, PositionType, Puzzle
+from puzzle_pb2 import Coordinate, CrimeScene, CrimeSceneFeatureType, PositionType, Puzzle
+from typing import Dict, List, Optional, Tuple
 
 WallIntersection = namedtuple('WallIntersection',
                               ['up', 'down', 'left', 'right'],
@@ -28,6 +30,15 @@ WALL_INTERSECTION_VALUES = {
     WallIntersection(down=True): '\u2577',
 }
 
+WALL_INTERSECTION_LOOKUP = np.array([
+    WALL_INTERSECTION_VALUES[WallIntersection(up=bool(code & 8),
+                                              down=bool(code & 4),
+                                              left=bool(code & 2),
+                                              right=bool(code & 1))]
+    for code in range(16)
+],
+                                    dtype=object)
+
 ROW = lambda n, value: [value if c % 2 == 1 else ' ' for c in range(2 * n + 1)]
 
 BACKGROUND_COLOR_IDS = {
@@ -60,28 +71,83 @@ FURNITURE_COLORS = {
     CrimeSceneFeatureType.TABLE: 'yellow',
 }
 
+SCENE_LAYER_CACHE_SIZE = 256
+
+
+def get_wall_boundaries(
+        crime_scene: CrimeScene) -> Tuple[np.ndarray, np.ndarray]:
+    floor_plan = np.array([list(row.values) for row in crime_scene.floor_plan])
+    rows, columns = floor_plan.shape
+    vertical_walls = np.ones((rows, columns + 1), dtype=bool)
+    vertical_walls[:, 1:-1] = floor_plan[:, :-1] != floor_plan[:, 1:]
+    horizontal_walls = np.ones((rows + 1, columns), dtype=bool)
+    horizontal_walls[1:-1, :] = floor_plan[:-1, :] != floor_plan[1:, :]
+    return vertical_walls, horizontal_walls
+
+
+def get_wall_intersections(vertical_walls: np.ndarray,
+                           horizontal_walls: np.ndarray) -> np.ndarray:
+    vertical_walls = np.pad(vertical_walls, ((1, 1), (0, 0)))
+    horizontal_walls = np.pad(horizontal_walls, ((0, 0), (1, 1)))
+    codes = (8 * vertical_walls[:-1, :] + 4 * vertical_walls[1:, :] +
+             2 * horizontal_walls[:, :-1] + horizontal_walls[:, 1:])
+    return WALL_INTERSECTION_LOOKUP[codes]
+
+
 LEGEND = ' '.join([
     add_background_color(CrimeSceneFeatureType.Name(type).capitalize(), color)
     for type, color in FURNITURE_COLORS.items()
 ])
 
 
-class PuzzleVisualizer:
+class CrimeSceneLayer:
 
-    def __init__(self, puzzle: Puzzle, w: int = 3) -> None:
+    def __init__(self, crime_scene: CrimeScene, w: int = 3) -> None:
         self._board = []
-        if puzzle.HasField('crime_scene'):
-            self._crime_scene = puzzle.crime_scene
-            self._people = puzzle.people
-            self._w = w
-            self._n = len(self._crime_scene.floor_plan)
-            self._add_crime_scene()
-            self._add_people()
-        self._set_visulization()
+        self._space_colors = {}
+        self._crime_scene = crime_scene
+        self._w = w
+        self._rows = len(self._crime_scene.floor_plan)
+        self._columns = len(self._crime_scene.floor_plan[0].values)
+        self._add_crime_scene()
+        self._set_lines()
 
     @property
-    def visualization(self) -> str:
-        return self._visualization
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    def render(self, labels: Dict[Tuple[int, int], str]) -> str:
+        lines = list(self._lines)
+        labels_by_row = {}
+        for (row, column), label in labels.items():
+            labels_by_row.setdefault(row, []).append((column, label))
+        for row, row_labels in labels_by_row.items():
+            board_row = list(self._board[2 * row + 1])
+            for column, label in row_labels:
+                board_row[2 * column + 1] = self.get_space_value(
+                    row, column, label)
+            lines[2 * row + 2] = self._get_line(2 * row + 1, board_row)
+        return '\n'.join(lines)
+
+    @property
+    def line_count(self) -> int:
+        return len(self._lines)
+
+    def get_space_value(self,
+                        row: int,
+                        column: int,
+                        label: Optional[str] = None) -> str:
+        if label is None:
+            return self._board[2 * row + 1][2 * column + 1]
+        return add_background_color(self._get_padded_value(label),
+                                    self._space_colors.get((row, column)))
+
+    def get_space_position(self, row: int, column: int) -> Tuple[int, int]:
+        return 2 * row + 2, len(f'{row} ') + 1 + column * (self._w + 1)
 
     def _add_crime_scene(self):
         self._add_walls()
@@ -95,64 +161,34 @@ class PuzzleVisualizer:
             WallIntersection(left=True, right=True)]
         self._horizontal_empty_value = self._w * WALL_INTERSECTION_VALUES[
             WallIntersection()]
+        self._vertical_walls, self._horizontal_walls = get_wall_boundaries(
+            self._crime_scene)
         self._add_exterior_walls()
         self._add_interior_walls()
         self._add_wall_intersections()
 
     def _add_exterior_walls(self) -> None:
-        self._board.append(ROW(self._n, self._horizontal_wall_value))
-        for r in range(1, 2 * self._n):
-            self._board.append(ROW(self._n, self._horizontal_empty_value))
+        self._board.append(ROW(self._columns, self._horizontal_wall_value))
+        for r in range(1, 2 * self._rows):
+            self._board.append(ROW(self._columns, self._horizontal_empty_value))
             if r % 2 == 1:
                 self._board[-1][0] = self._vertical_wall_value
                 self._board[-1][-1] = self._vertical_wall_value
-        self._board.append(ROW(self._n, self._horizontal_wall_value))
+        self._board.append(ROW(self._columns, self._horizontal_wall_value))
 
     def _add_interior_walls(self) -> None:
-        self._add_vertical_interior_walls()
-        self._add_horizontal_interior_walls()
-
-    def _add_vertical_interior_walls(self) -> None:
-        for r, row in enumerate(self._crime_scene.floor_plan):
-            for c, left, right in zip(range(1, self._n), row.values[:-1],
-                                      row.values[1:]):
-                if left != right:
-                    self._set_vertical_boundary_value(r, c,
-                                                      self._vertical_wall_value)
-
-    def _add_horizontal_interior_walls(self) -> None:
-        for r, top_row, bottom_row in zip(range(1, self._n),
-                                          self._crime_scene.floor_plan[:-1],
-                                          self._crime_scene.floor_plan[1:]):
-            for c, top, bottom in zip(range(self._n), top_row.values,
-                                      bottom_row.values):
-                if top != bottom:
-                    self._set_horizontal_boundary_value(
-                        r, c, self._horizontal_wall_value)
+        for r, right in zip(*np.nonzero(self._vertical_walls[:, 1:-1])):
+            self._set_vertical_boundary_value(r, right + 1,
+                                              self._vertical_wall_value)
+        for bottom, c in zip(*np.nonzero(self._horizontal_walls[1:-1, :])):
+            self._set_horizontal_boundary_value(bottom + 1, c,
+                                                self._horizontal_wall_value)
 
     def _add_wall_intersections(self) -> None:
-        for bottom in range(self._n + 1):
-            for right in range(self._n + 1):
-                wall_intersection = self._get_wall_intersection(bottom, right)
-                value = WALL_INTERSECTION_VALUES[wall_intersection]
-                self._set_boundary_intersection_value(bottom, right, value)
-
-    def _get_wall_intersection(self, bottom: int,
-                               right: int) -> WallIntersection:
-        top = bottom - 1
-        left = right - 1
-        up_wall = False if bottom == 0 else self._get_vertical_boundary_value(
-            top, right) == self._vertical_wall_value
-        down_wall = False if bottom == self._n else self._get_vertical_boundary_value(
-            bottom, right) == self._vertical_wall_value
-        left_wall = False if right == 0 else self._get_horizontal_boundary_value(
-            bottom, left) == self._horizontal_wall_value
-        right_wall = False if right == self._n else self._get_horizontal_boundary_value(
-            bottom, right) == self._horizontal_wall_value
-        return WallIntersection(up=up_wall,
-                                down=down_wall,
-                                left=left_wall,
-                                right=right_wall)
+        wall_intersections = get_wall_intersections(self._vertical_walls,
+                                                    self._horizontal_walls)
+        for bottom, values in enumerate(wall_intersections.tolist()):
+            self._board[2 * bottom][0::2] = values
 
     def _add_windows(self) -> None:
         self._vertical_window_value = '\u2551'
@@ -184,6 +220,8 @@ class PuzzleVisualizer:
                 for coordinate in feature.coordinates:
                     self._set_space_value(coordinate.row, coordinate.column,
                                           furniture_value)
+                    self._space_colors[(coordinate.row,
+                                        coordinate.column)] = furniture_color
 
     def _add_funiture_boundaries(self) -> None:
         self._vertical_furniture_boundary_text_value = ' '
@@ -213,51 +251,73 @@ class PuzzleVisualizer:
                 self._horizontal_furniture_boundary_text_value, furniture_color)
             self._set_horizontal_boundary_value(bottom, column, value)
 
-    def _add_people(self) -> None:
-        for person in self._people:
-            person_initial = person.name[0]
-            person_value = self._get_padded_value(person_initial)
-            space_value = self._get_space_value(person.coordinate.row,
-                                                person.coordinate.column)
-            value = re.sub(f'\ {{{self._w}}}', person_value, space_value)
-            self._set_space_value(person.coordinate.row,
-                                  person.coordinate.column, value)
-
     def _get_padded_value(self, value: str) -> str:
         left_pad = ' ' * ((self._w - len(value)) // 2)
         right_pad = ' ' * (self._w - len(value) - len(left_pad))
         return left_pad + value + right_pad
 
-    def _get_space_value(self, row: int, column: int) -> str:
-        return self._board[2 * row + 1][2 * column + 1]
-
     def _set_space_value(self, row: int, column: int, value: str) -> None:
         self._board[2 * row + 1][2 * column + 1] = value
 
-    def _get_vertical_boundary_value(self, row: int, right: int) -> str:
-        return self._board[2 * row + 1][2 * right]
-
     def _set_vertical_boundary_value(self, row: int, right: int,
                                      value: str) -> None:
         self._board[2 * row + 1][2 * right] = value
 
-    def _get_horizontal_boundary_value(self, bottom: int, column: int) -> str:
-        return self._board[2 * bottom][2 * column + 1]
-
     def _set_horizontal_boundary_value(self, bottom: int, column: int,
                                        value: str) -> None:
         self._board[2 * bottom][2 * column + 1] = value
 
-    def _set_boundary_intersection_value(self, bottom: int, right: int,
-                                         value: str) -> None:
-        self._board[2 * bottom][2 * right] = value
-
-    def _set_visulization(self):
+    def _set_lines(self) -> None:
         column_labels = ' '.join(
-            [self._get_padded_value(str(c)) for c in range(self._n)])
-        board = [
-            f'{r // 2} ' + ''.join(row) if r % 2 == 1 else '  ' + ''.join(row)
-            for r, row in enumerate(self._board)
-        ]
-        self._visualization = '\n'.join(['   ' + column_labels] + board +
-                                        ['   ' + LEGEND])
+            [self._get_padded_value(str(c)) for c in range(self._columns)])
+        board = [self._get_line(r, row) for r, row in enumerate(self._board)]
+        self._lines = ['   ' + column_labels] + board + ['   ' + LEGEND]
+
+    def _get_line(self, r: int, row: List[str]) -> str:
+        label = f'{r // 2} ' if r % 2 == 1 else '  '
+        return label + ''.join(row)
+
+
+@lru_cache(maxsize=SCENE_LAYER_CACHE_SIZE)
+def _get_cached_scene_layer(crime_scene_bytes: bytes,
+                            w: int) -> CrimeSceneLayer:
+    crime_scene = CrimeScene()
+    crime_scene.ParseFromString(crime_scene_bytes)
+    return CrimeSceneLayer(crime_scene, w)
+
+
+def get_scene_layer(crime_scene: CrimeScene, w: int = 3) -> CrimeSceneLayer:
+    return _get_cached_scene_layer(crime_scene.SerializeToString(), w)
+
+
+def get_labels(
+        placements: Dict[str, Tuple[int, int]]) -> Dict[Tuple[int, int], str]:
+    labels = {}
+    for name, coordinate in placements.items():
+        labels.setdefault(tuple(coordinate), name[0])
+    return labels
+
+
+class PuzzleVisualizer:
+
+    def __init__(self, puzzle: Puzzle, w: int = 3) -> None:
+        self._scene_layer = None
+        if puzzle.HasField('crime_scene'):
+            self._scene_layer = get_scene_layer(puzzle.crime_scene, w)
+        self._people = puzzle.people
+        self._visualization = None
+
+    @property
+    def visualization(self) -> str:
+        if self._visualization is None:
+            self._visualization = self.render({
+                person.name: (person.coordinate.row, person.coordinate.column)
+                for person in self._people
+                if person.HasField('coordinate')
+            })
+        return self._visualization
+
+    def render(self, placements: Dict[str, Tuple[int, int]]) -> str:
+        if self._scene_layer is None:
+            return ''
+        return self._scene_layer.render(get_labels(placements))